@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+"""
+Micro-benchmark of the ORM and Core read paths of list and show, reading
+from an in-memory SQLite database.
+
+Usage: python benchmarks/core_read.py [--rows N] [--shows N] [--repeat N]
+"""
+from __future__ import absolute_import
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restful_falcon.core.db.engine import Session  # noqa: E402
+from restful_falcon.core.db.engine import create_engine  # noqa: E402
+from restful_falcon.core.db.mixin import IdAndTimeColumnsMixin  # noqa: E402
+from restful_falcon.core.db.model import READ_PATH_CORE  # noqa: E402
+from restful_falcon.core.db.model import READ_PATH_ORM  # noqa: E402
+from restful_falcon.core.db.model import Column  # noqa: E402
+from restful_falcon.core.db.model import Model  # noqa: E402
+from restful_falcon.core.db.type import Boolean  # noqa: E402
+from restful_falcon.core.db.type import Integer  # noqa: E402
+from restful_falcon.core.db.type import String  # noqa: E402
+
+
+class BenchRecord(Model, IdAndTimeColumnsMixin):
+    name = Column(String(64))
+    age = Column(Integer)
+    flag = Column(Boolean, default=False)
+
+
+def seed(rows):
+    engine = create_engine({"url": "sqlite://", "options": {}})
+    Model.metadata.create_all(engine)
+    session = Session()
+    try:
+        session.bulk_insert_mappings(
+            BenchRecord, [{"name": "name{}".format(i), "age": i % 100, "flag": i % 2 == 0} for i in range(0, rows)]
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def list_case(read_path, rows, columns=None):
+    def case():
+        session = Session()
+        try:
+            count, records = BenchRecord.perform_list(
+                session=session, columns=columns, limit=rows, read_path=read_path
+            )
+            assert len(records) == rows
+        finally:
+            session.close()
+    return case
+
+
+def show_case(read_path, shows):
+    def case():
+        session = Session()
+        try:
+            for rid in range(1, shows + 1):
+                assert BenchRecord.perform_show_by([("id", rid)], session=session, read_path=read_path)
+        finally:
+            session.close()
+    return case
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="Rows of the listed page")
+    parser.add_argument("--shows", type=int, default=200, help="Shows by id")
+    parser.add_argument("--repeat", type=int, default=7, help="Repeats, the fastest is reported")
+    args = parser.parse_args()
+    seed(args.rows)
+    cases = (
+        ("list, all columns", args.rows, lambda read_path: list_case(read_path, args.rows)),
+        ("list, 3 columns", args.rows, lambda read_path: list_case(read_path, args.rows, ["id", "name", "age"])),
+        ("shows by id", args.shows, lambda read_path: show_case(read_path, args.shows)),
+    )
+    for name, size, make_case in cases:
+        for read_path in (READ_PATH_ORM, READ_PATH_CORE):
+            seconds = min(timeit.repeat(make_case(read_path), number=1, repeat=args.repeat))
+            print("{:<20} {:<5} {:8.2f} ms/{}".format(name, read_path, seconds * 1e3, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+"""
+Micro-benchmark of extracting query parameters of list requests, which is
+the cost of building `Context` without touching the database.
+
+Usage: python benchmarks/query_params.py [--number N] [--repeat N]
+"""
+from __future__ import absolute_import
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from falcon import testing  # noqa: E402
+
+from restful_falcon.core.controller.base import Context  # noqa: E402
+from restful_falcon.core.controller.base import Resource  # noqa: E402
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin  # noqa: E402
+from restful_falcon.core.db.mixin import IdAndTimeColumnsMixin  # noqa: E402
+from restful_falcon.core.db.model import Column  # noqa: E402
+from restful_falcon.core.db.model import Model  # noqa: E402
+from restful_falcon.core.db.type import Integer  # noqa: E402
+from restful_falcon.core.db.type import String  # noqa: E402
+from restful_falcon.core.request import Request  # noqa: E402
+from restful_falcon.core.response import Response  # noqa: E402
+
+QUERY_STRINGS = (
+    "",
+    "name=foo&age=3",
+    "__limit=20&__offset=40&__order=age,asc&__fields=id,name&name=foo&__gt=age,3&__in=id,1,2,3&__count=none",
+)
+
+
+class BenchItem(Model, IdAndTimeColumnsMixin):
+    name = Column(String(64))
+    age = Column(Integer)
+
+
+class BenchItemResource(Resource, ResourceOperatesMixin):
+    resource_model = BenchItem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="Contexts built in each repeat")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats, the fastest is reported")
+    args = parser.parse_args()
+    resource = BenchItemResource()
+    for query_string in QUERY_STRINGS:
+        request = Request(testing.create_environ(query_string=query_string))
+        response = Response()
+        seconds = min(timeit.repeat(
+            lambda: Context(resource, request, response, {}), number=args.number, repeat=args.repeat
+        ))
+        print("{:<40} {:8.2f} us/request".format(
+            query_string[:37] + "..." if len(query_string) > 40 else query_string or "<none>",
+            seconds / args.number * 1e6
+        ))
+
+
+if __name__ == "__main__":
+    main()
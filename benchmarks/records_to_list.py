@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+"""
+Micro-benchmark of serializing a page of records by `records_to_list`, for
+ORM instances and column rows read from an in-memory SQLite database.
+
+Usage: python benchmarks/records_to_list.py [--rows N] [--repeat N]
+"""
+from __future__ import absolute_import
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from restful_falcon.core.db.engine import Session  # noqa: E402
+from restful_falcon.core.db.engine import create_engine  # noqa: E402
+from restful_falcon.core.db.mixin import IdAndTimeColumnsMixin  # noqa: E402
+from restful_falcon.core.db.model import Column  # noqa: E402
+from restful_falcon.core.db.model import Model  # noqa: E402
+from restful_falcon.core.db.type import Boolean  # noqa: E402
+from restful_falcon.core.db.type import Integer  # noqa: E402
+from restful_falcon.core.db.type import String  # noqa: E402
+
+
+class BenchRecord(Model, IdAndTimeColumnsMixin):
+    name = Column(String(64))
+    age = Column(Integer)
+    flag = Column(Boolean, default=False)
+
+
+def seed(rows):
+    engine = create_engine({"url": "sqlite://", "options": {}})
+    Model.metadata.create_all(engine)
+    session = Session()
+    try:
+        session.bulk_insert_mappings(
+            BenchRecord, [{"name": "name{}".format(i), "age": i % 100, "flag": i % 2 == 0} for i in range(0, rows)]
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="Rows of the page")
+    parser.add_argument("--repeat", type=int, default=7, help="Repeats, the fastest is reported")
+    args = parser.parse_args()
+    seed(args.rows)
+    columns = BenchRecord.columns()
+    session = Session()
+    try:
+        instances = session.query(BenchRecord).all()
+        rows = session.query(*[getattr(BenchRecord, column) for column in columns]).all()
+        cases = (
+            ("ORM instances", lambda: BenchRecord.records_to_list(instances)),
+            ("column rows", lambda: BenchRecord.records_to_list(rows, columns=columns)),
+            ("column rows of iterator", lambda: BenchRecord.records_to_list(iter(rows), columns=columns)),
+        )
+        for name, case in cases:
+            assert len(case()) == args.rows
+            seconds = min(timeit.repeat(case, number=1, repeat=args.repeat))
+            print("{:<24} {:8.2f} ms/{} rows".format(name, seconds * 1e3, args.rows))
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 from __future__ import absolute_import
 
 from restful_falcon.contrib.admin.api.group import AuthGroupResource
+from restful_falcon.contrib.admin.api.stats import DatabasePoolStats
 from restful_falcon.contrib.admin.api.user import AuthUserLogin
 from restful_falcon.contrib.admin.api.user import AuthUserLogout
 from restful_falcon.contrib.admin.api.user import AuthUserResource
@@ -15,7 +16,7 @@ from restful_falcon.contrib.admin.db.model.user import AuthUser
 
 __all__ = [
     "AuthGroupResource", "AuthUserLogin", "AuthUserLogout", "AuthUserResource", "BasicAuthentication",
-    "TokenAuthentication", "AuthGroup", "AuthToken", "AuthUser"
+    "DatabasePoolStats", "TokenAuthentication", "AuthGroup", "AuthToken", "AuthUser"
 ]
 
 default_app_config = "restful_falcon.contrib.admin.apps.AdminConfig"
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+from restful_falcon.contrib.admin.auth import BasicAuthentication
+from restful_falcon.contrib.admin.auth import TokenAuthentication
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.db.pool import pool_stats
+from restful_falcon.core.permission.concrete import IsAdminUser
+
+
+class DatabasePoolStats(Resource):
+    authentication_classes = (TokenAuthentication, BasicAuthentication)
+    permission_classes = (IsAdminUser,)
+
+    def on_get(self, request, response, **params):
+        """
+        Get statistics of connection pools of the primary and replicas
+
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param params: extend parameters
+        :type params: dict
+        """
+        stats = pool_stats()
+        response.media = {"count": len(stats), "data": stats}
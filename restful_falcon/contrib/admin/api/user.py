@@ -94,7 +94,7 @@ class AuthUserLogout(Resource, CreateOperateMixin):
         }, session=context.session)
         AuthToken.perform_delete_by(
             filters=[("token", user_info["token"])],
-            session=context.session
+            returning=False, session=context.session
         )
         return {
             "title": "User logout",
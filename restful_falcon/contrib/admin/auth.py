@@ -47,6 +47,9 @@ class AuthUser(User):
 
 
 class BasicAuthentication(_BasicAuthentication):
+    # Users are queried from database
+    blocking = True
+
     def has_username(self, username):
         user = AuthUserModel.perform_show_by(filters=[("username", username)])
         if user:
@@ -66,6 +69,8 @@ class BasicAuthentication(_BasicAuthentication):
 
 class TokenAuthentication(Authentication):
     token_field = "X-AUTH-TOKEN"
+    # Tokens and users are queried from database
+    blocking = True
 
     @staticmethod
     def _token_cache_interval(auth_token):
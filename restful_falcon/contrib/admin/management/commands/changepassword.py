@@ -45,6 +45,6 @@ class ChangePasswordCommand(BaseCommand):
         if count == max_reties:
             raise CommandError("Aborting password change for user '{}' after {} attempts".format(username, count))
         AuthUser.perform_update_by(
-            filters=[("username", username)], data={"password": make_password(password1)}
+            filters=[("username", username)], data={"password": make_password(password1)}, returning=False
         )
         self.stdout.write("Password changed successfully for user '{}'".format(username))
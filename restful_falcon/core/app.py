@@ -3,77 +3,92 @@
 # __date__ = "2020/8/12"
 from __future__ import absolute_import
 
+import asyncio
+from io import BytesIO
 from logging import getLogger
+from urllib.parse import quote
 
 from falcon.api import API
+from falcon.status_codes import HTTP_204
+from falcon.status_codes import HTTP_304
 
 from restful_falcon.core.exception import DatabaseError
 from restful_falcon.core.exception import db_error_handler
 from restful_falcon.core.middleware.base import Middleware
+from restful_falcon.core.middleware.default import AsyncAuthenticationMiddleware
+from restful_falcon.core.middleware.default import AsyncPermissionMiddleware
+from restful_falcon.core.middleware.default import AsyncQueryStatsMiddleware
+from restful_falcon.core.middleware.default import AsyncSessionMiddleware
 from restful_falcon.core.middleware.default import AuthenticationMiddleware
 from restful_falcon.core.middleware.default import PermissionMiddleware
+from restful_falcon.core.middleware.default import QueryStatsMiddleware
+from restful_falcon.core.middleware.default import SessionMiddleware
 from restful_falcon.core.request import Request
 from restful_falcon.core.response import Response
+from restful_falcon.util.concurrency import configure_executor
+from restful_falcon.util.concurrency import pinned_thread
+from restful_falcon.util.concurrency import run_sync
 from restful_falcon.util.module import import_attr
 from restful_falcon.util.module import import_cls
 from restful_falcon.util.module import import_obj
 from restful_falcon.util.wrapper import lazy_property
 from restful_falcon.util.wrapper import singleton
 
-__all__ = ["Application"]
+__all__ = ["Application", "AsyncApplication"]
 
 logger = getLogger(__name__)
 
 
-@singleton(ignore_params=True)
-class Application(object):
+class BaseApplication(object):
+    default_middleware = [QueryStatsMiddleware, SessionMiddleware, AuthenticationMiddleware, PermissionMiddleware]
+
     def __init__(self, config):
-        self.__config = config
+        self._config = config
         # 初始化API服务
-        self.__init_falcon_api()
+        self._init_falcon_api()
 
     @lazy_property
     def middleware(self):
-        middleware = [AuthenticationMiddleware, PermissionMiddleware]
-        if "middleware" in self.__config:
+        middleware = list(self.default_middleware)
+        if "middleware" in self._config:
             if isinstance(middleware, list):
-                middleware.extend(self.__config.middleware)
+                middleware.extend(self._config.middleware)
             else:
-                middleware.append(self.__config.middleware)
+                middleware.append(self._config.middleware)
         for i in range(0, len(middleware)):
             middleware[i] = import_obj(middleware[i], bases=(Middleware,))
         return middleware
 
-    def __init_falcon_api(self):
+    def _init_falcon_api(self):
         from falcon.media import JSONHandler
         from falcon.routing.converters import BaseConverter
         from restful_falcon.util.json import dumps
         from restful_falcon.util.json import loads
         from restful_falcon.core.router import UUIDStringConverter
 
-        self.__api = API(
+        self._api = API(
             request_type=Request, response_type=Response,
             middleware=self.middleware
         )
         extra_handlers = {
             "application/json": JSONHandler(dumps=dumps, loads=loads),
         }
-        self.__api.req_options.media_handlers.update(extra_handlers)
-        self.__api.resp_options.media_handlers.update(extra_handlers)
-        self.__api.add_error_handler(DatabaseError, handler=db_error_handler)
-        self.__api.router_options.converters["uuid_str"] = UUIDStringConverter
-        if "router_options" in self.__config:
-            for name, cls in self.__config.router_options.to_dict().items():
-                self.__api.router_options.converters[name] = import_cls(cls, bases=(BaseConverter,))
-        self.__init_routes()
-
-    def __init_routes(self):
+        self._api.req_options.media_handlers.update(extra_handlers)
+        self._api.resp_options.media_handlers.update(extra_handlers)
+        self._api.add_error_handler(DatabaseError, handler=db_error_handler)
+        self._api.router_options.converters["uuid_str"] = UUIDStringConverter
+        if "router_options" in self._config:
+            for name, cls in self._config.router_options.to_dict().items():
+                self._api.router_options.converters[name] = import_cls(cls, bases=(BaseConverter,))
+        self._init_routes()
+
+    def _init_routes(self):
         from restful_falcon.core.router import Router
 
-        if "router" in self.__config:
-            router = self.__config.router
-        elif "name" in self.__config:
-            router = "{name}.router.router".format(name=self.__config.name)
+        if "router" in self._config:
+            router = self._config.router
+        elif "name" in self._config:
+            router = "{name}.router.router".format(name=self._config.name)
         else:
             logger.warning("No route defined")
             return
@@ -81,21 +96,231 @@ class Application(object):
             router = import_attr(router)
         routes = router.routes
         for route in routes:
-            self.__api.add_route(**route)
+            self._api.add_route(**route)
         static_routes = router.static_routes
         for static_route in static_routes:
-            self.__api.add_static_route(**static_route)
+            self._api.add_static_route(**static_route)
+
 
+@singleton(ignore_params=True)
+class Application(BaseApplication):
     def run(self, host=None, port=None):
         from wsgiref.simple_server import make_server
 
-        host = host or self.__config.bind.host
-        port = port or self.__config.bind.port
-        httpd = make_server(host, port, self.__api)
+        host = host or self._config.bind.host
+        port = port or self._config.bind.port
+        httpd = make_server(host, port, self._api)
         try:
             httpd.serve_forever()
         except (KeyboardInterrupt, InterruptedError):
-            print("Application <{name}> is stopped, bye bye!".format(name=self.__config.get("name")))
+            print("Application <{name}> is stopped, bye bye!".format(name=self._config.get("name")))
 
     def __call__(self, env, start_response):
-        return self.__api(env, start_response)
+        return self._api(env, start_response)
+
+
+@singleton(ignore_params=True)
+class AsyncApplication(BaseApplication):
+    """
+    ASGI application. Responders and middleware methods defined as coroutine
+    functions are awaited, the blocking ones run in executor, so a slow
+    database call never stalls the event loop. All blocking calls of a
+    request run on the same thread, since sessions and connections, e.g. of
+    SQLite, must not move between threads. Resources use async mixins from
+    `restful_falcon.core.controller.async_mixin`.
+
+    Config:
+        async_workers: maximum number of requests running blocking calls, each on its own thread
+
+    Routing, error handling and serialization are delegated to the falcon API
+    through its private methods `_get_responder`, `_handle_exception` and
+    `_get_body`, and `Response._wsgi_headers`, since falcon 2 has no ASGI
+    support. They are only stable within a falcon release, so that falcon is
+    pinned in requirements.
+    """
+    default_middleware = [
+        AsyncQueryStatsMiddleware, AsyncSessionMiddleware, AsyncAuthenticationMiddleware, AsyncPermissionMiddleware
+    ]
+
+    def __init__(self, config):
+        super().__init__(config)
+        configure_executor(self._config.get("async_workers", None))
+
+    def run(self, host=None, port=None):
+        import uvicorn
+
+        host = host or self._config.bind.host
+        port = port or self._config.bind.port
+        uvicorn.run(self, host=host, port=port)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            raise NotImplementedError("Unsupported scope type: {}".format(scope["type"]))
+        # Each request has its own context, so does its session scope
+        await asyncio.ensure_future(self._handle(scope, receive, send))
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _make_environ(scope, body):
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": quote(scope.get("root_path", "")),
+            "PATH_INFO": scope["path"],
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": "HTTP/{}".format(scope.get("http_version", "1.1")),
+            "REMOTE_ADDR": client[0],
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": BytesIO(),
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+            "CONTENT_LENGTH": str(len(body))
+        }
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            value = value.decode("latin-1")
+            if name == "CONTENT_TYPE":
+                environ[name] = value
+                continue
+            if name == "CONTENT_LENGTH":
+                continue
+            name = "HTTP_" + name
+            environ[name] = environ[name] + "," + value if name in environ else value
+        return environ
+
+    @staticmethod
+    async def _call(func, *args, **kwargs):
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await run_sync(func, *args, **kwargs)
+
+    async def _handle(self, scope, receive, send):
+        # Blocking calls of a request run on one thread, which its session and connection are bound to
+        async with pinned_thread():
+            await self._handle_request(scope, receive, send)
+
+    @lazy_property
+    def _middleware_stacks(self):
+        """
+        Methods of middleware processing requests, resources and responses,
+        responses are processed in reverse order like falcon does with
+        independent middleware
+        """
+        stacks = ([], [], [])
+        for component in self.middleware:
+            for stack, name in zip(stacks, ("process_request", "process_resource", "process_response")):
+                # No-op methods inherited from `Middleware` would take a thread for nothing
+                if getattr(type(component), name, None) in (None, getattr(Middleware, name)):
+                    continue
+                stack.append(getattr(component, name))
+        stacks[2].reverse()
+        return stacks
+
+    async def _handle_request(self, scope, receive, send):
+        api = self._api
+        environ = self._make_environ(scope, await self._read_body(receive))
+        req = Request(environ, options=api.req_options)
+        resp = Response(options=api.resp_options)
+        resource = None
+        params = {}
+        req_succeeded = False
+        mw_req_stack, mw_rsrc_stack, mw_resp_stack = self._middleware_stacks
+        try:
+            try:
+                for process_request in mw_req_stack:
+                    await self._call(process_request, req, resp)
+                    if resp.complete:
+                        break
+                if not resp.complete:
+                    responder, params, resource, req.uri_template = api._get_responder(req)
+            except Exception as ex:
+                if not api._handle_exception(req, resp, ex, params):
+                    raise
+            else:
+                try:
+                    if resource:
+                        for process_resource in mw_rsrc_stack:
+                            await self._call(process_resource, req, resp, resource, params)
+                            if resp.complete:
+                                break
+                    if not resp.complete:
+                        await self._call(responder, req, resp, **params)
+                    req_succeeded = True
+                except Exception as ex:
+                    if not api._handle_exception(req, resp, ex, params):
+                        raise
+        finally:
+            for process_response in mw_resp_stack:
+                try:
+                    await self._call(process_response, req, resp, resource, req_succeeded)
+                except Exception as ex:
+                    if not api._handle_exception(req, resp, ex, params):
+                        raise
+                    req_succeeded = False
+        await self._send_response(send, req, resp)
+
+    async def _send_response(self, send, req, resp):
+        media_type = self._api._media_type
+        if req.method == "HEAD" or resp.status in (HTTP_204, HTTP_304):
+            body = []
+            if resp.status in (HTTP_204, HTTP_304):
+                media_type = None
+        else:
+            body, length = self._api._get_body(resp)
+            if length is not None:
+                resp._headers["content-length"] = str(length)
+        headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in resp._wsgi_headers(media_type)
+        ]
+        await send({
+            "type": "http.response.start",
+            "status": int(resp.status[:3]),
+            "headers": headers
+        })
+        if isinstance(body, list):
+            await send({"type": "http.response.body", "body": b"".join(body)})
+            return
+        # Streams may block on reading, so chunks are read in executor
+        iterator = iter(body)
+        try:
+            while True:
+                chunk = await run_sync(next, iterator, None)
+                if chunk is None:
+                    break
+                if not isinstance(chunk, bytes):
+                    chunk = chunk.encode("utf-8")
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(body, "close", None)
+            close and close()
@@ -33,6 +33,11 @@ class User(object):
 
 
 class Authentication(object):
+    # `AsyncApplication` runs authentications in executor, since they may do blocking I/O,
+    # e.g. querying database. Those doing none may unset it to run in the event loop, or
+    # define coroutine `authenticate`
+    blocking = True
+
     def authenticate(self, req):
         """
         Authenticate operate. It should return the corresponding user's info
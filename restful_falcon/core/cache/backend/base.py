@@ -19,5 +19,8 @@ class BaseBackend(object):
     def delete(self, key):
         raise NotImplementedError()
 
+    def add(self, key, value, expire=None):
+        raise NotImplementedError()
+
     def clear(self):
         raise NotImplementedError()
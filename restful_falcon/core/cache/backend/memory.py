@@ -4,6 +4,7 @@
 from __future__ import absolute_import
 
 import uuid
+from threading import Lock
 
 import cacheout
 
@@ -29,6 +30,7 @@ class MemoryBackend(BaseBackend):
                 "maxsize": maxsize, "ttl": ttl, "default": default
             }
         }, cache_class(cache_type))
+        self.lock = Lock()
 
     def __getattr__(self, item):
         return getattr(self.manager[self.name], item)
@@ -45,5 +47,12 @@ class MemoryBackend(BaseBackend):
     def delete(self, key):
         return self.manager[self.name].delete(key)
 
+    def add(self, key, value, expire=None):
+        with self.lock:
+            if self.manager[self.name].has(key):
+                return False
+            self.manager[self.name].set(key, value, ttl=expire)
+            return True
+
     def clear(self):
         return self.manager[self.name].clear()
@@ -45,5 +45,8 @@ class RedisBackend(BaseBackend):
     def delete(self, key):
         return self.client.delete(key)
 
+    def add(self, key, value, expire=None):
+        return bool(self.client.set(key, value, ex=expire, nx=True))
+
     def clear(self):
         return self.client.flushdb()
@@ -36,5 +36,14 @@ class CacheClient(object):
     def delete(self, key):
         return self.backend.delete(key)
 
+    def add(self, key, value, expire=None):
+        """
+        Set value of key if key does not exist
+
+        :return: whether value is set
+        :rtype: bool
+        """
+        return self.backend.add(key, value, expire=expire)
+
     def clear(self):
         return self.backend.clear()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import asyncio
+import time
+import traceback
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError
+from logging import getLogger
+from threading import Lock
+
+from restful_falcon.util.concurrency import run_sync
+
+__all__ = ["SingleFlight", "FLIGHT_LOCK_PREFIX"]
+
+logger = getLogger(__name__)
+
+FLIGHT_LOCK_PREFIX = "restful_falcon:flight"
+
+DEFAULT_FLIGHT_TIMEOUT = 10
+DEFAULT_LOCK_EXPIRE = 10
+DEFAULT_POLL_INTERVAL = 0.05
+
+
+class SingleFlight(object):
+    """
+    Coalesce concurrent computations of the same key, the first caller of a
+    key leads and computes the result, and the others wait for it. Results
+    are shared through futures, which threads wait for and asyncio tasks
+    await. With a cache client, leaders of worker processes take a lock of
+    the key in cache, and the other processes poll for the result until the
+    lock is released.
+    """
+    def __init__(self, cache=None, timeout=DEFAULT_FLIGHT_TIMEOUT, lock_expire=DEFAULT_LOCK_EXPIRE,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        """
+        SingleFlight constructor
+
+        :param cache: cache client holding locks across processes, such as of `RedisBackend`
+        :type cache: restful_falcon.core.cache.client.CacheClient
+        :param timeout: seconds to wait for result, after which waiters compute it themselves
+        :type timeout: float
+        :param lock_expire: seconds to expire lock, in case that its leader is gone
+        :type lock_expire: int
+        :param poll_interval: seconds between polls for result of other processes
+        :type poll_interval: float
+        """
+        self.cache = cache
+        self.timeout = timeout
+        self.lock_expire = lock_expire
+        self.poll_interval = poll_interval
+        self._flights = {}
+        self._lock = Lock()
+
+    def join(self, key):
+        """
+        Join flight of key
+
+        :param key: flight key
+        :type key: str
+        :return: whether the caller leads, and future of the result
+        :rtype: tuple
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                return False, future
+            future = self._flights[key] = Future()
+            return True, future
+
+    def land(self, key, locked=False, result=None):
+        """
+        End flight of key led by the caller
+
+        :param key: flight key
+        :type key: str
+        :param locked: whether the caller holds lock of key across processes, which is released
+        :type locked: bool
+        :param result: result shared with waiters, None makes them compute it themselves
+        """
+        with self._lock:
+            future = self._flights.pop(key, None)
+        if locked and self.cache is not None:
+            try:
+                # The lock may have expired and been taken by others, which only costs a duplicate computation
+                self.cache.delete(self.lock_key(key))
+            except Exception as e:
+                logger.warning(str(e))
+                logger.warning(traceback.format_exc())
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def wait(self, future):
+        """
+        Wait for result of flight
+
+        :param future: future of the result
+        :type future: concurrent.futures.Future
+        :return: result, or None if timed out or the leader failed
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            return None
+
+    async def wait_async(self, future):
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def lock_key(self, key):
+        return "{}:{}".format(FLIGHT_LOCK_PREFIX, key)
+
+    def acquire(self, key):
+        """
+        Acquire lock of key across processes, which always succeeds without
+        cache client, or if cache is unavailable
+
+        :param key: flight key
+        :type key: str
+        :rtype: bool
+        """
+        if self.cache is None:
+            return True
+        try:
+            return self.cache.add(self.lock_key(key), 1, expire=self.lock_expire)
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+            return True
+
+    def _locked(self, key):
+        try:
+            return self.cache.has(self.lock_key(key))
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+            return False
+
+    def poll(self, key, load):
+        """
+        Poll for result of key computed by other process, until it is loaded,
+        the lock is released, or timed out
+
+        :param key: flight key
+        :type key: str
+        :param load: function loading result, which returns None if it is not ready
+        :type load: callable
+        :return: result, or None if not computed by other process in time
+        """
+        deadline = time.time() + self.timeout
+        while True:
+            result = load()
+            if result is not None or not self._locked(key) or time.time() >= deadline:
+                return result
+            time.sleep(self.poll_interval)
+
+    async def poll_async(self, key, load):
+        """
+        Async version of `poll`, load is a coroutine function
+        """
+        deadline = time.time() + self.timeout
+        while True:
+            result = await load()
+            if result is not None or not await run_sync(self._locked, key) or time.time() >= deadline:
+                return result
+            await asyncio.sleep(self.poll_interval)
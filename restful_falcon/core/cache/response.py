@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import base64
+import hashlib
+import json
+import traceback
+import uuid
+import weakref
+from logging import getLogger
+
+from falcon import HTTP_200
+from falcon import HTTP_304
+from falcon import HTTPError
+from falcon.util import http_date_to_dt
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import object_session
+from sqlalchemy.sql.dml import UpdateBase
+
+from restful_falcon.core.controller.conditional import is_not_modified
+from restful_falcon.core.db.engine import RoutingSession
+from restful_falcon.core.db.model import Model
+
+__all__ = [
+    "ResponseCache", "response_cache_tables", "new_generation", "RESPONSE_CACHE_PREFIX", "GENERATION_PREFIX"
+]
+
+logger = getLogger(__name__)
+
+RESPONSE_CACHE_PREFIX = "restful_falcon:response"
+GENERATION_PREFIX = "restful_falcon:generation"
+
+# Keys of `Session.info` collecting tables written and connections used in the transaction
+WRITTEN_TABLES_KEY = "restful_falcon_written_tables"
+SESSION_CONNECTIONS_KEY = "restful_falcon_connections"
+
+# Response caches watching writes, and sessions of connections they began on
+_WATCHING_CACHES = weakref.WeakSet()
+_CONNECTION_SESSIONS = weakref.WeakKeyDictionary()
+
+
+def response_cache_tables(resource, expand=None):
+    """
+    Tables whose writes invalidate cached responses of resource, which are
+    the table of resource model, tables of expanded relationships, and
+    tables of models in `models` of cache policy of resource
+
+    :param resource: resource object
+    :type resource: restful_falcon.core.controller.base.Resource
+    :param expand: relationship path list
+    :type expand: list
+    :rtype: frozenset
+    """
+    policy = _cache_policy(resource) or {}
+    model = getattr(resource, "resource_model", None)
+    tables = set()
+    if model is not None:
+        tables.add(model.__table__.name)
+        for path in expand or []:
+            _model = model
+            for name in path.split("."):
+                _model = _model.__mapper__.relationships[name].mapper.class_
+                tables.add(_model.__table__.name)
+    for _model in policy.get("models") or []:
+        tables.add(_model if isinstance(_model, str) else _model.__table__.name)
+    return frozenset(tables)
+
+
+def new_generation():
+    """
+    New generation of table, generations are random tokens rather than
+    counters, so that a generation expired or evicted from cache is replaced
+    by a new one, which never matches entries tagged with the old ones
+    """
+    return uuid.uuid4().hex
+
+
+def _cache_policy(resource):
+    policy = getattr(resource, "response_cache", None)
+    if not policy:
+        return None
+    return policy if isinstance(policy, dict) else {}
+
+
+def _isolation_scope(resource, request):
+    if not getattr(resource, "resource_isolation", False):
+        return ""
+    # Isolation filters identify the scope, e.g. the user or the group, and admins have none
+    filters = resource.isolation_obj.isolation_filters(request)
+    return repr(sorted(filters, key=repr)) if filters else "admin"
+
+
+def _mark_written(session, table):
+    if session is None:
+        _bump_watching([table.name])
+        return
+    session.info.setdefault(WRITTEN_TABLES_KEY, set()).add(table.name)
+
+
+def _bump_watching(tables):
+    for cache in list(_WATCHING_CACHES):
+        cache.bump(tables)
+
+
+# noinspection PyUnusedLocal
+def _after_write(mapper, connection, target):
+    _mark_written(object_session(target), mapper.local_table)
+
+
+def _after_bulk_write(context):
+    _mark_written(context.session, context.mapper.local_table)
+
+
+# noinspection PyUnusedLocal
+def _after_begin(session, transaction, connection):
+    # Statements may run on copies of connection, which share its DBAPI connection
+    dbapi_connection = connection.connection
+    _CONNECTION_SESSIONS[dbapi_connection] = weakref.ref(session)
+    session.info.setdefault(SESSION_CONNECTIONS_KEY, []).append(dbapi_connection)
+
+
+# noinspection PyUnusedLocal
+def _after_execute(connection, clause, multiparams, params, result):
+    # Core statements, e.g. bulk creates and upserts of models, fire no ORM events
+    if not isinstance(clause, UpdateBase) or getattr(clause, "table", None) is None:
+        return
+    session_ref = _CONNECTION_SESSIONS.get(connection.connection)
+    session = session_ref() if session_ref is not None else None
+    if session is not None and session._flushing:
+        return
+    _mark_written(session, clause.table)
+
+
+def _after_commit(session):
+    # A savepoint released bumps too, which is early but harmless
+    tables = session.info.get(WRITTEN_TABLES_KEY)
+    if tables:
+        _bump_watching(tables)
+
+
+# noinspection PyUnusedLocal
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(WRITTEN_TABLES_KEY, None)
+        # Connections are released to the pool, where others may use them
+        for dbapi_connection in session.info.pop(SESSION_CONNECTIONS_KEY, []):
+            _CONNECTION_SESSIONS.pop(dbapi_connection, None)
+
+
+def _listen_writes():
+    event.listen(Model, "after_insert", _after_write, propagate=True)
+    event.listen(Model, "after_update", _after_write, propagate=True)
+    event.listen(Model, "after_delete", _after_write, propagate=True)
+    event.listen(RoutingSession, "after_bulk_update", _after_bulk_write)
+    event.listen(RoutingSession, "after_bulk_delete", _after_bulk_write)
+    event.listen(RoutingSession, "after_begin", _after_begin)
+    event.listen(RoutingSession, "after_commit", _after_commit)
+    event.listen(RoutingSession, "after_transaction_end", _after_transaction_end)
+    event.listen(Engine, "after_execute", _after_execute)
+
+
+class ResponseCache(object):
+    """
+    Cache of serialized responses of GET requests. Entries are tagged with
+    generations of the tables they are read from, and writes to a table bump
+    its generation once committed, which invalidates all entries tagged with
+    it without finding them. Entries are stored as JSON, since the cache may
+    be shared, e.g. Redis.
+    """
+    def __init__(self, cache, prefix=RESPONSE_CACHE_PREFIX):
+        """
+        ResponseCache constructor
+
+        :param cache: cache client
+        :type cache: restful_falcon.core.cache.client.CacheClient
+        :param prefix: prefix of cache keys
+        :type prefix: str
+        """
+        self.cache = cache
+        self.prefix = prefix
+
+    def watch(self):
+        """
+        Bump generations of tables written by models, the events are listened
+        once for all response caches
+        """
+        if not event.contains(Engine, "after_execute", _after_execute):
+            _listen_writes()
+        _WATCHING_CACHES.add(self)
+
+    def generation_key(self, table):
+        return "{}:{}".format(GENERATION_PREFIX, table)
+
+    def generation(self, table):
+        """
+        Current generation of table, a new one is added if it has none
+
+        :param table: table name
+        :type table: str
+        :rtype: str
+        """
+        key = self.generation_key(table)
+        value = self.cache.get(key)
+        if not value:
+            _value = new_generation()
+            # Others may have added one meanwhile
+            value = _value if self.cache.add(key, _value) else self.cache.get(key) or _value
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def generations(self, tables):
+        """
+        Current generations of tables
+
+        :param tables: table names
+        :type tables: collections.Iterable
+        :rtype: tuple
+        """
+        return tuple((table, self.generation(table)) for table in sorted(tables))
+
+    def bump(self, tables):
+        for table in tables:
+            try:
+                self.cache.set(self.generation_key(table), new_generation())
+            except Exception as e:
+                logger.warning(str(e))
+                logger.warning(traceback.format_exc())
+
+    def make_key(self, request, resource):
+        """
+        Make cache key of request, which is made of the route, the normalized
+        query spec and the isolation scope
+
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param resource: resource object
+        :type resource: restful_falcon.core.controller.base.Resource
+        :return: cache key and query spec, or None if request is not cacheable
+        :rtype: tuple
+        """
+        if request.method != "GET" or _cache_policy(resource) is None:
+            return None
+        try:
+            spec = resource.query_parser.parse(request.params)
+            resource.query_parser.policy.check(spec)
+        except HTTPError:
+            # Invalid requests are left to resource
+            return None
+        if spec.stream is not None:
+            return None
+        # Filters are ANDed, so that their order is irrelevant
+        spec = spec._replace(filters=tuple(sorted(spec.filters, key=repr)))
+        digest = hashlib.sha1("\n".join(
+            (request.path, repr(spec), _isolation_scope(resource, request))
+        ).encode("utf-8")).hexdigest()
+        return "{}:{}".format(self.prefix, digest), spec
+
+    def prepare(self, request, resource):
+        """
+        Prepare caching of request, generations are taken before the response
+        is made, so that writes committed meanwhile invalidate it
+
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param resource: resource object
+        :type resource: restful_falcon.core.controller.base.Resource
+        :return: cache key, generations and expiration, or None if request is not cacheable
+        :rtype: tuple
+        """
+        key_and_spec = self.make_key(request, resource)
+        if key_and_spec is None:
+            return None
+        key, spec = key_and_spec
+        try:
+            generations = self.generations(response_cache_tables(resource, expand=spec.expand))
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+            return None
+        return key, generations, _cache_policy(resource).get("expire")
+
+    def load(self, key, generations):
+        """
+        Load cached response of generations
+
+        :param key: cache key
+        :type key: str
+        :param generations: current generations of tables
+        :type generations: tuple
+        :return: cached response, or None if not cached or invalidated
+        :rtype: dict
+        """
+        try:
+            value = self.cache.get(key)
+            if not value:
+                return None
+            entry = json.loads(value)
+            if entry["generations"] != [list(generation) for generation in generations]:
+                return None
+            return dict(entry, generations=generations, body=base64.b64decode(entry["body"]))
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+            return None
+
+    @staticmethod
+    def make_entry(generations, response):
+        """
+        Make cache entry of serialized response of `200 OK`
+
+        :param generations: generations of tables taken before the response was made
+        :type generations: tuple
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :return: cache entry, or None if response is not cacheable
+        :rtype: dict
+        """
+        if response.status != HTTP_200 or response.stream is not None:
+            return None
+        body = response.data
+        if body is None:
+            return None
+        return {
+            "generations": generations, "content_type": response.content_type, "body": body,
+            "etag": response.etag, "last_modified": response.get_header("Last-Modified")
+        }
+
+    def store(self, key, entry, expire=None):
+        """
+        Store cache entry
+
+        :param key: cache key
+        :type key: str
+        :param entry: cache entry
+        :type entry: dict
+        :param expire: seconds to expire
+        :type expire: int
+        """
+        try:
+            value = json.dumps(
+                dict(entry, body=base64.b64encode(entry["body"]).decode("ascii")), separators=(",", ":")
+            )
+            self.cache.set(key, value, expire=expire)
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+
+    @staticmethod
+    def respond(request, response, entry):
+        """
+        Respond with cached response, or `304 Not Modified` if the client has it
+
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param entry: cached response
+        :type entry: dict
+        """
+        if entry["etag"]:
+            response.etag = entry["etag"]
+        if entry["last_modified"]:
+            response.set_header("Last-Modified", entry["last_modified"])
+        last_modified = http_date_to_dt(entry["last_modified"]) if entry["last_modified"] else None
+        if entry["etag"] and is_not_modified(request, entry["etag"], last_modified=last_modified):
+            response.status = HTTP_304
+        else:
+            response.status = HTTP_200
+            response.content_type = entry["content_type"]
+            response.data = entry["body"]
+        response.complete = True
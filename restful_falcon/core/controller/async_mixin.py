@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+from restful_falcon.core.controller.base import Context
+from restful_falcon.core.controller.conditional import is_conditional
+from restful_falcon.core.controller.conditional import not_modified
+from restful_falcon.core.controller.mixin import BulkOperateMixin
+from restful_falcon.core.controller.mixin import CreateOperateMixin
+from restful_falcon.core.controller.mixin import DeleteOperateMixin
+from restful_falcon.core.controller.mixin import ListOperateMixin
+from restful_falcon.core.controller.mixin import ShowOperateMixin
+from restful_falcon.core.controller.mixin import UpdateOperateMixin
+from restful_falcon.core.controller.mixin import UpsertOperateMixin
+from restful_falcon.core.controller.mixin import respond_item
+from restful_falcon.core.controller.mixin import upsert_errors
+from restful_falcon.core.db.model import BULK_CREATED
+from restful_falcon.core.db.model import BULK_UPSERTED
+from restful_falcon.util.concurrency import call_async
+
+__all__ = [
+    "AsyncListOperateMixin", "AsyncBulkOperateMixin", "AsyncCreateOperateMixin", "AsyncShowOperateMixin",
+    "AsyncUpdateOperateMixin", "AsyncDeleteOperateMixin", "AsyncUpsertOperateMixin",
+    "AsyncResourceQueryOperatesMixin", "AsyncResourceOperatesMixin"
+]
+
+# Responders of async mixins are coroutines sharing request parsing and response building with the
+# sync mixins. Operates such as `list` and `create` are inherited, which run in the thread of the
+# request, and resources may override them by coroutine functions, which are awaited. Exporting
+# only builds the stream, which is read in executor by `AsyncApplication`, so that async resources
+# opt in to `ExportOperateMixin` as it is.
+
+
+class AsyncListOperateMixin(ListOperateMixin):
+    async def on_get(self, request, response, **params):
+        """
+        Get method, see `ListOperateMixin.on_get`
+
+        :type self: restful_falcon.core.controller.base.Resource, AsyncListOperateMixin
+        """
+        if self.has_schema():
+            validator = self.schema.list_validator()
+            validator and validator(request)
+        async with Context(self, request, response, params) as context:
+            if context.stream is not None:
+                # Streams are read by `AsyncApplication` in executor
+                self.respond_stream(context, response)
+                return
+            if self.list_etag or is_conditional(request):
+                version = await call_async(self.list_version, context, filters=context.filters)
+                if not_modified(request, response, version, context.filters):
+                    return
+            if context.after is not None or context.before is not None:
+                data = await call_async(
+                    self.list_by_cursor, context, filters=context.filters, orders=context.orders,
+                    limit=context.limit, after=context.after, before=context.before
+                )
+                self.respond_cursor_list(response, data)
+                return
+            data = await call_async(
+                self.list, context, filters=context.filters, orders=context.orders,
+                limit=context.limit, offset=context.offset
+            )
+            self.respond_list(response, data)
+
+
+class AsyncBulkOperateMixin(BulkOperateMixin):
+    async def bulk_operate(self, request, response, params, operate, status):
+        """
+        Bulk method, see `BulkOperateMixin.bulk_operate`
+        """
+        results, indexes = self.validate_bulk(request)
+        async with Context(self, request, response, params, autocommit=True) as context:
+            request_data = context.request_data
+            data = await call_async(operate, context, [request_data[i] for i in indexes]) if indexes else []
+            self.report_bulk(response, results, indexes, data, status)
+
+
+class AsyncCreateOperateMixin(AsyncBulkOperateMixin, CreateOperateMixin):
+    async def on_post(self, request, response, **params):
+        """
+        Post method, see `CreateOperateMixin.on_post`
+
+        :type self: restful_falcon.core.controller.base.Resource, AsyncCreateOperateMixin
+        """
+        if isinstance(request.media, list):
+            return await self.on_post_bulk(request, response, **params)
+        if self.has_schema():
+            validator = self.schema.create_validator()
+            validator and validator(request)
+        async with Context(self, request, response, params, autocommit=True) as context:
+            data = await call_async(self.create, context, context.request_data)
+            if data:
+                response.media = data
+
+    async def on_post_bulk(self, request, response, **params):
+        await self.bulk_operate(request, response, params, self.bulk_create, BULK_CREATED)
+
+
+class AsyncShowOperateMixin(ShowOperateMixin):
+    async def on_get_item(self, request, response, **params):
+        """
+        Get item method, see `ShowOperateMixin.on_get_item`
+
+        :type self: restful_falcon.core.controller.base.Resource, AsyncShowOperateMixin
+        """
+        async with Context(self, request, response, params) as context:
+            conditional = is_conditional(request)
+            if conditional:
+                version = await call_async(self.version, context, params[self.resource_id], filters=context.filters)
+                if not_modified(request, response, version, context.filters):
+                    return
+            data = await call_async(self.show, context, params[self.resource_id], filters=context.filters)
+            if not conditional:
+                not_modified(request, response, self.item_version(context, data), context.filters)
+            respond_item(response, data)
+
+
+class AsyncUpdateOperateMixin(UpdateOperateMixin):
+    async def on_put_item(self, request, response, **params):
+        """
+        Put item method, see `UpdateOperateMixin.on_put_item`
+
+        :type self: restful_falcon.core.controller.base.Resource, AsyncUpdateOperateMixin
+        """
+        if self.has_schema():
+            validator = self.schema.update_validator()
+            validator and validator(request)
+        async with Context(self, request, response, params, autocommit=True) as context:
+            data = await call_async(
+                self.update, context, params[self.resource_id],
+                context.request_data, filters=context.filters
+            )
+            respond_item(response, data)
+
+
+class AsyncDeleteOperateMixin(DeleteOperateMixin):
+    async def on_delete_item(self, request, response, **params):
+        """
+        Delete item method, see `DeleteOperateMixin.on_delete_item`
+
+        :type self: restful_falcon.core.controller.base.Resource, AsyncDeleteOperateMixin
+        """
+        async with Context(self, request, response, params, autocommit=True) as context:
+            data = await call_async(self.delete, context, params[self.resource_id], filters=context.filters)
+            respond_item(response, data)
+
+
+class AsyncUpsertOperateMixin(AsyncBulkOperateMixin, UpsertOperateMixin):
+    async def on_put(self, request, response, **params):
+        """
+        Put method, see `UpsertOperateMixin.on_put`
+
+        :type self: restful_falcon.core.controller.base.Resource, AsyncUpsertOperateMixin
+        """
+        if isinstance(request.media, list):
+            return await self.on_put_bulk(request, response, **params)
+        if self.has_schema():
+            validator = self.schema.create_validator()
+            validator and validator(request)
+        async with Context(self, request, response, params, autocommit=True) as context:
+            with upsert_errors():
+                data = await call_async(self.upsert, context, context.request_data)
+            if data:
+                response.media = data
+
+    async def on_put_bulk(self, request, response, **params):
+        await self.bulk_operate(request, response, params, self.bulk_upsert, BULK_UPSERTED)
+
+
+class AsyncResourceQueryOperatesMixin(AsyncListOperateMixin, AsyncShowOperateMixin):
+    pass
+
+
+class AsyncResourceOperatesMixin(
+    AsyncListOperateMixin, AsyncCreateOperateMixin,
+    AsyncShowOperateMixin, AsyncUpdateOperateMixin, AsyncDeleteOperateMixin
+):
+    pass
@@ -11,17 +11,25 @@ import copy
 
 from restful_falcon.core.auth.base import Authentication
 from restful_falcon.core.config import CONF
-from restful_falcon.core.controller.extractor import extractor_from
-from restful_falcon.core.controller.extractor import is_composite_filter_field
-from restful_falcon.core.controller.extractor import is_filter_field
-from restful_falcon.core.controller.extractor import is_order_field
-from restful_falcon.core.controller.extractor import is_pagination_field
 from restful_falcon.core.controller.isolation import ResourceIsolation
 from restful_falcon.core.controller.isolation import ResourceIsolationByUser
+from restful_falcon.core.controller.query import EMPTY_QUERY_SPEC
+from restful_falcon.core.controller.query import QueryParser
 from restful_falcon.core.controller.validator import ResourceSchema
+from restful_falcon.core.db.count import COUNT_EXACT
+from restful_falcon.core.db.count import COUNT_NONE
+from restful_falcon.core.db.engine import RoutingSession
 from restful_falcon.core.db.engine import Session
+from restful_falcon.core.db.filter import FilterValueError
+from restful_falcon.core.db.filter import coerce_filters
+from restful_falcon.core.db.model import DEFAULT_BATCH_SIZE
+from restful_falcon.core.db.model import DEFAULT_STREAM_BATCH_SIZE
+from restful_falcon.core.db.model import READ_PATH_ORM
+from restful_falcon.core.db.session import SESSION_SCOPE
+from restful_falcon.core.db.stats import QUERY_STATS_SCOPE
 from restful_falcon.core.exception import HTTPInvalidParam
 from restful_falcon.core.permission.base import Permission
+from restful_falcon.util.concurrency import run_sync
 from restful_falcon.util.module import import_obj
 from restful_falcon.util.string import to_snake_case
 from restful_falcon.util.wrapper import lazy_property
@@ -40,14 +48,29 @@ class ResourceMeta(type):
 
 
 class Resource(object, metaclass=ResourceMeta):
+    allowed_expands = None
+    allowed_fields = None
     authentication_classes = CONF.get("authentication")
     auto_fill_fields = True
+    bulk_create_batch_size = DEFAULT_BATCH_SIZE
+    conditional_get = True
+    count_strategy = COUNT_EXACT
+    # Count strategy of pages listed by `__after` or `__before`, whose clients need no total
+    cursor_count_strategy = COUNT_NONE
+    # Whether lists carry `ETag` without conditional headers, which costs a version query of all records filtered
+    list_etag = False
     permission_classes = CONF.get("permission")
+    query_policy = None
+    read_path = READ_PATH_ORM
     resource_id = "rid"
     resource_name = None
     resource_model = None
     resource_isolation = False
     resource_isolation_class = ResourceIsolationByUser
+    # Cache policy of `ResponseCacheMiddleware`, e.g. {"expire": 60, "models": [Tag]}
+    response_cache = None
+    stream_batch_size = DEFAULT_STREAM_BATCH_SIZE
+    upsert_conflict_columns = None
     validator_schema = None
 
     def has_model(self):
@@ -56,6 +79,18 @@ class Resource(object, metaclass=ResourceMeta):
     def has_schema(self):
         return self.validator_schema is not None
 
+    @property
+    def query_parser(self):
+        """
+        Query parameter parser, which is compiled once per resource class
+        """
+        cls = self.__class__
+        parser = cls.__dict__.get("_query_parser")
+        if parser is None:
+            parser = QueryParser(cls)
+            cls._query_parser = parser
+        return parser
+
     @lazy_property
     def authentications(self):
         authentications = self.authentication_classes or []
@@ -133,69 +168,153 @@ class Context(object):
         self.__request = request
         self.__response = response
         self.params = params
-        self.session = None
         self.autocommit = autocommit
+        self.__session = None
+        self.__own_session = False
+        self.__route = None
         self._extract_query_params()
 
     def __enter__(self):
-        if hasattr(self.resource, "has_model"):
-            if self.resource.has_model():
-                self.session = Session()
         return self
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Committing and closing session are blocking
+        await run_sync(self.__exit__, exc_type, exc_val, exc_tb)
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if not self.__session:
+            return
+        try:
             if self.autocommit and not exc_val:
-                self.session.commit()
-            self.session.close()
-
-    def __init_specific_fields(self):
-        self.__limit = None
-        self.__offset = None
-        self.__orders = None
-        self.__filters = []
-
-    def __extract_pagination_filed(self, field):
-        attr_name = "_{}{}".format(self.__class__.__name__, field)
-        setattr(self, attr_name, extractor_from(field)(self.request.params))
-
-    def __extract_orders_filed(self, field):
-        attr_name = "_{}__orders".format(format(self.__class__.__name__))
-        attr_value = extractor_from(field)(self.request.params)
-        setattr(self, attr_name, attr_value if isinstance(attr_value, list) else [attr_value])
-
-    def __extract_filter_field(self, field):
-        field_value = extractor_from(field)(self.request.params)
-        if is_composite_filter_field(field):
-            if not isinstance(field_value, list):
-                raise HTTPInvalidParam("Need multiple items", field)
-            self.__filters.append((field.strip("_"), field_value))
-        else:
-            field_values = field_value
-            if not isinstance(field_values, list):
-                field_values = [field_values]
-            for field_value in field_values:
-                self.__filters.append((field.strip("_"), field_value))
-
-    def __extract_normal_field(self, field):
-        field_values = extractor_from(field)(self.request.params)
-        if not isinstance(field_values, list):
-            field_values = [field_values]
-        for field_value in field_values:
-            self.__filters.append((field, field_value))
+                self.__session.commit()
+        finally:
+            if self.__route is not None:
+                self.__session.unroute(self.__route)
+                self.__route = None
+            # The session of request scope is closed by `SessionMiddleware`
+            if self.__own_session:
+                self.__session.close()
+
+    @property
+    def session(self):
+        """
+        Session of request scope, it is created on first use, and a session
+        owned by the context is created if no request scope is active
+        """
+        if self.__session is None:
+            if not hasattr(self.resource, "has_model") or not self.resource.has_model():
+                return None
+            self.__session = SESSION_SCOPE.get()
+            if self.__session is None:
+                self.__session = Session()
+                self.__own_session = True
+            # Reads of contexts without autocommit can be routed to replicas, the session of request
+            # scope is shared by contexts, so each of them routes its reads until it exits
+            if isinstance(self.__session, RoutingSession):
+                self.__route = self.__session.route(not self.autocommit)
+        return self.__session
+
+    @property
+    def query_stats(self):
+        """
+        SQL statistics of the current request, None if `QueryStatsMiddleware`
+        is not installed
+
+        :rtype: restful_falcon.core.db.stats.QueryStats
+        """
+        return QUERY_STATS_SCOPE.current()
+
+    def __init_specific_fields(self, spec):
+        self.__limit = spec.limit
+        self.__offset = spec.offset
+        self.__after = spec.after
+        self.__before = spec.before
+        self.__count_strategy = spec.count_strategy
+        self.__fields = list(spec.fields) if spec.fields is not None else None
+        self.__stream = spec.stream
+        self.__expand = list(spec.expand) if spec.expand is not None else None
+        self.__orders = list(spec.orders) if spec.orders is not None else None
+        self.__filters = list(spec.filters)
+
+    def __check_cursor_fields(self):
+        if self.__after is not None and self.__before is not None:
+            raise HTTPInvalidParam("Cannot be used together with __after", "__before")
+        if self.__after is None and self.__before is None:
+            return
+        if not hasattr(self.resource, "has_model") or not self.resource.has_model():
+            return
+        model = self.resource.resource_model
+        orders = model.keyset_orders(self.__orders)
+        try:
+            # Keyset values of the start cursor are empty
+            if self.__after:
+                self.__after = model.keyset_values(orders, self.__after)
+            if self.__before:
+                self.__before = model.keyset_values(orders, self.__before)
+        except ValueError as e:
+            raise HTTPInvalidParam(str(e), "__after" if self.__after is not None else "__before")
+
+    def __check_stream_field(self):
+        if self.__stream is None:
+            return
+        if self.__after is not None:
+            raise HTTPInvalidParam("Cannot be used together with __after", "__stream")
+        if self.__before is not None:
+            raise HTTPInvalidParam("Cannot be used together with __before", "__stream")
+
+    def __check_expand_field(self):
+        if self.__expand is None:
+            return
+        if self.__stream is not None:
+            raise HTTPInvalidParam("Cannot be used together with __stream", "__expand")
+        allowed_expands = getattr(self.resource, "allowed_expands", None) or ()
+        for path in self.__expand:
+            if path not in allowed_expands:
+                raise HTTPInvalidParam("{} is not allowed".format(path), "__expand")
+        if hasattr(self.resource, "has_model") and self.resource.has_model():
+            try:
+                self.resource.resource_model.check_expand(self.__expand)
+            except ValueError as e:
+                raise HTTPInvalidParam(str(e), "__expand")
+
+    def __check_fields_field(self):
+        if self.__fields is None:
+            return
+        if not hasattr(self.resource, "has_model") or not self.resource.has_model():
+            return
+        columns = self.resource.resource_model.__table__.columns
+        allowed_fields = self.resource.allowed_fields
+        for field in self.__fields:
+            if field not in columns or (allowed_fields is not None and field not in allowed_fields):
+                raise HTTPInvalidParam("{} is not allowed".format(field), "__fields")
+
+    def __coerce_filters(self):
+        if not self.__filters:
+            return
+        if not hasattr(self.resource, "has_model") or not self.resource.has_model():
+            return
+        try:
+            self.__filters = coerce_filters(self.resource.resource_model, self.__filters)
+        except FilterValueError as e:
+            raise HTTPInvalidParam(str(e), e.field)
 
     def _extract_query_params(self):
-        self.__init_specific_fields()
-        for field in self.request.params:
-            _field = field.lower()
-            if is_pagination_field(_field):
-                self.__extract_pagination_filed(_field)
-            elif is_order_field(_field):
-                self.__extract_orders_filed(_field)
-            elif is_filter_field(_field):
-                self.__extract_filter_field(_field)
-            else:
-                self.__extract_normal_field(field)
+        parser = self.resource.query_parser if isinstance(self.resource, Resource) else QueryParser(None)
+        self.__spec = parser.parse(self.request.params)
+        self.__init_specific_fields(self.__spec)
+        self.__limit = parser.policy.limit(self.__spec)
+        if self.__spec is EMPTY_QUERY_SPEC:
+            # Requests without query parameters have nothing to check, only the default limit applies
+            return
+        parser.policy.check(self.__spec)
+        self.__check_cursor_fields()
+        self.__check_fields_field()
+        self.__check_stream_field()
+        self.__check_expand_field()
+        self.__coerce_filters()
 
     @property
     def request(self):
@@ -217,6 +336,16 @@ class Context(object):
         """
         return self.__response
 
+    @property
+    def query_spec(self):
+        """
+        Query parameters parsed by the query parser of resource, before
+        cursors are decoded into keyset values and isolation filters added
+
+        :rtype: restful_falcon.core.controller.query.QuerySpec
+        """
+        return self.__spec
+
     @property
     def limit(self):
         return self.__limit
@@ -225,6 +354,34 @@ class Context(object):
     def offset(self):
         return self.__offset
 
+    @property
+    def after(self):
+        return self.__after
+
+    @property
+    def before(self):
+        return self.__before
+
+    @property
+    def count_strategy(self):
+        if self.__count_strategy:
+            return self.__count_strategy
+        if self.__after is not None or self.__before is not None:
+            return getattr(self.resource, "cursor_count_strategy", COUNT_NONE)
+        return getattr(self.resource, "count_strategy", COUNT_EXACT)
+
+    @property
+    def fields(self):
+        return self.__fields
+
+    @property
+    def stream(self):
+        return self.__stream
+
+    @property
+    def expand(self):
+        return self.__expand
+
     @property
     def orders(self):
         return self.__orders
@@ -258,4 +415,27 @@ class Context(object):
                 return _data
 
         data = copy.copy(self.request.media)
+        if isinstance(data, list):
+            return [try_fill_fields(copy.copy(item)) for item in data]
         return try_fill_fields(data)
+
+    @lazy_property
+    def create_data(self):
+        """
+        Auto fill fields only filled on creation, e.g. `created_by`, which
+        upserts fill into inserted records and never take from request data
+
+        :rtype: dict
+        """
+        data = {}
+        try:
+            if self.resource.auto_fill_fields and getattr(self.resource.resource_model, "require_auto_fill", False):
+                if hasattr(self.resource.resource_model, "auto_fill_fields"):
+                    update_fields = set(field[0] for field in self.resource.resource_model.auto_fill_fields(False))
+                    for field in self.resource.resource_model.auto_fill_fields(True):
+                        if field[0] not in update_fields:
+                            data[field[0]] = getattr(self.request.user, field[1])
+        except Exception as e:
+            logger.debug(str(e))
+            logger.debug(traceback.format_exc())
+        return data
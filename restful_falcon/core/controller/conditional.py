@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import hashlib
+from datetime import datetime
+
+from falcon import HTTP_304
+
+from restful_falcon.util.time import to_utc
+
+__all__ = ["make_etag", "is_conditional", "is_not_modified", "not_modified"]
+
+
+def make_etag(*parts):
+    """
+    Make weak entity tag from parts, which are turned to str
+
+    :param parts: parts identifying the representation
+    :rtype: str
+    """
+    digest = hashlib.sha1("\n".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return 'W/"{}"'.format(digest)
+
+
+def is_conditional(request):
+    """
+    Check whether request has `If-None-Match` or `If-Modified-Since`
+
+    :param request: request object
+    :type request: restful_falcon.core.request.Request
+    :rtype: bool
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    return bool(request.if_none_match) or request.if_modified_since is not None
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """
+    Evaluate conditional headers of request, `If-None-Match` takes
+    precedence over `If-Modified-Since` as RFC 7232 specified
+
+    :param request: request object
+    :type request: restful_falcon.core.request.Request
+    :param etag: entity tag of the current representation
+    :type etag: str
+    :param last_modified: naive UTC datetime of the last modification
+    :type last_modified: datetime.datetime
+    :rtype: bool
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if_none_match = request.if_none_match
+    if if_none_match:
+        # Weak comparison, which ignores the weak indicator
+        opaque_tag = etag[2:] if etag.startswith("W/") else etag
+        return any(tag == "*" or tag == opaque_tag.strip('"') for tag in if_none_match)
+    if_modified_since = request.if_modified_since
+    if if_modified_since is None or last_modified is None:
+        return False
+    # HTTP dates are in seconds
+    return last_modified.replace(microsecond=0) <= if_modified_since
+
+
+def not_modified(request, response, version, *parts):
+    """
+    Set `ETag` and `Last-Modified` headers of response by version, and set
+    status to `304 Not Modified` if the representation of request is not
+    modified
+
+    :param request: request object
+    :type request: restful_falcon.core.request.Request
+    :param response: response object
+    :type response: restful_falcon.core.response.Response
+    :param version: version of resources, in which "version" is the update time
+    :type version: dict
+    :param parts: other parts identifying the representation, e.g. filters
+    :return: whether the response is `304 Not Modified`
+    :rtype: bool
+    """
+    if not version:
+        return False
+    last_modified = version.get("version")
+    last_modified = to_utc(last_modified) if isinstance(last_modified, datetime) else None
+    etag = make_etag(request.query_string, *([value for _, value in sorted(version.items())] + list(parts)))
+    response.etag = etag
+    if last_modified is not None:
+        response.last_modified = last_modified
+    if not is_not_modified(request, etag, last_modified=last_modified):
+        return False
+    response.status = HTTP_304
+    return True
@@ -7,6 +7,8 @@ import sys
 
 from functools import partial
 
+from restful_falcon.core.db.count import COUNT_STRATEGIES
+from restful_falcon.core.db.cursor import decode_cursor
 from restful_falcon.core.db.filter import AND_FILTER
 from restful_falcon.core.db.filter import EQ_FILTER
 from restful_falcon.core.db.filter import GE_FILTER
@@ -21,12 +23,29 @@ from restful_falcon.core.db.filter import NE_FILTER
 from restful_falcon.core.db.filter import NOT_IN_FILTER
 from restful_falcon.core.db.filter import OR_FILTER
 from restful_falcon.core.exception import HTTPInvalidParam
+from restful_falcon.util.stream import STREAM_FORMATS
 
 """
 Pagination:
 __limit=10
 __offset=0
 
+Cursor:
+__after=[cursor|start]
+__before=[cursor|start]
+
+Count:
+__count=[exact|window|estimate|none]
+
+Fields:
+__fields=key1,key2,...
+
+Stream:
+__stream=[json|ndjson|csv]
+
+Expand:
+__expand=relationship1,relationship1.relationship2,...
+
 Filter:
 key=value
 __and=key,value,[equal|not_equal|like|ilike]
@@ -59,6 +78,17 @@ LIMIT_FIELD = "__limit"
 OFFSET_FIELD = "__offset"
 PAGINATION_FIELDS = {LIMIT_FIELD, OFFSET_FIELD}
 
+AFTER_FIELD = "__after"
+BEFORE_FIELD = "__before"
+
+COUNT_FIELD = "__count"
+
+FIELDS_FIELD = "__fields"
+
+STREAM_FIELD = "__stream"
+
+EXPAND_FIELD = "__expand"
+
 
 AND_OPERATOR_FIELD = _make_operator_filed(AND_FILTER)
 OR_OPERATOR_FIELD = _make_operator_filed(OR_FILTER)
@@ -125,6 +155,27 @@ class IntConverter(Converter):
             return value
 
 
+class ChoiceConverter(Converter):
+    __slots__ = ("_choices",)
+
+    def __init__(self, choices=()):
+        self._choices = choices
+
+    def convert(self, value):
+        value = str(value).lower()
+        if value not in self._choices:
+            raise ExtractError("{} is not in {}".format(value, str(self._choices)))
+        return value
+
+
+class CursorConverter(Converter):
+    def convert(self, value):
+        try:
+            return decode_cursor(value)
+        except ValueError as e:
+            raise ExtractError(str(e))
+
+
 class TupleConverter(Converter):
     __slots__ = ("_separator", "_range", "_min_size")
 
@@ -162,6 +213,18 @@ class KeyMultiValuesReviser(Reviser):
         return _value
 
 
+class UniqueItemsReviser(Reviser):
+    def revise(self, value):
+        _value = []
+        for item in value:
+            item = item.strip()
+            if item and item not in _value:
+                _value.append(item)
+        if not _value:
+            raise ExtractError("{} has no item".format(str(value)))
+        return _value
+
+
 class KeyOperatorReviser(Reviser):
     __slots__ = ("_allowed_operators", "_default_operator")
 
@@ -345,6 +408,67 @@ class OffsetFieldExtractor(FieldExtractor):
         return value
 
 
+class CursorFieldExtractor(FieldExtractor):
+    converter = CursorConverter()
+    reviser = DefaultReviser()
+
+    @classmethod
+    def extract(cls, param):
+        # Only the last cursor is decoded
+        if isinstance(param.get(cls.field_name), list):
+            param = {cls.field_name: param[cls.field_name][-1]}
+        return super(CursorFieldExtractor, cls).extract(param)
+
+
+class AfterFieldExtractor(CursorFieldExtractor):
+    field_name = AFTER_FIELD
+
+
+class BeforeFieldExtractor(CursorFieldExtractor):
+    field_name = BEFORE_FIELD
+
+
+class ChoiceFieldExtractor(FieldExtractor):
+    reviser = DefaultReviser()
+
+    @classmethod
+    def extract(cls, param):
+        value = super(ChoiceFieldExtractor, cls).extract(param)
+        if isinstance(value, list):
+            return value[-1]
+        return value
+
+
+class CountFieldExtractor(ChoiceFieldExtractor):
+    field_name = COUNT_FIELD
+    converter = ChoiceConverter(choices=COUNT_STRATEGIES)
+
+
+class StreamFieldExtractor(ChoiceFieldExtractor):
+    field_name = STREAM_FIELD
+    converter = ChoiceConverter(choices=STREAM_FORMATS)
+
+
+class NamesFieldExtractor(FieldExtractor):
+    converter = TupleConverter(range=(1, sys.maxsize))
+    reviser = UniqueItemsReviser()
+
+    @classmethod
+    def extract(cls, param):
+        # Names given in repeated fields are joined
+        if isinstance(param.get(cls.field_name), list):
+            param = {cls.field_name: ",".join(param[cls.field_name])}
+        return super(NamesFieldExtractor, cls).extract(param)
+
+
+class FieldsFieldExtractor(NamesFieldExtractor):
+    field_name = FIELDS_FIELD
+
+
+class ExpandFieldExtractor(NamesFieldExtractor):
+    field_name = EXPAND_FIELD
+
+
 class OrderFieldExtractor(FieldExtractor):
     field_name = ORDER_FIELD
     converter = TupleConverter(range=(1, 2), min_size=2)
@@ -3,16 +3,60 @@
 # __date__ = "2020/8/25"
 from __future__ import absolute_import
 
+from contextlib import contextmanager
+
+from falcon import HTTP_207
+
 from restful_falcon.core.controller.base import Context
 from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.conditional import is_conditional
+from restful_falcon.core.controller.conditional import not_modified
+from restful_falcon.core.db.model import BULK_CREATED
+from restful_falcon.core.db.model import BULK_FAILED
+from restful_falcon.core.db.model import BULK_UPSERTED
+from restful_falcon.core.db.model import UpsertConflictError
+from restful_falcon.core.exception import HTTPBadRequest
+from restful_falcon.core.exception import HTTPConflict
 from restful_falcon.core.exception import HTTPNotFound
+from restful_falcon.util.stream import STREAM_CONTENT_TYPES
+from restful_falcon.util.stream import STREAM_CSV
+from restful_falcon.util.stream import encode_stream
 
 __all__ = [
-    "ListOperateMixin", "CreateOperateMixin", "ShowOperateMixin", "UpdateOperateMixin", "DeleteOperateMixin",
+    "respond_item", "upsert_errors", "ListOperateMixin", "BulkOperateMixin", "CreateOperateMixin",
+    "ShowOperateMixin", "UpdateOperateMixin", "DeleteOperateMixin", "UpsertOperateMixin", "ExportOperateMixin",
     "ResourceQueryOperatesMixin", "ResourceOperatesMixin"
 ]
 
 
+def respond_item(response, data):
+    """
+    Respond with a resource, or `404 Not Found` if it is not found
+
+    :param response: response object
+    :type response: restful_falcon.core.response.Response
+    :param data: resource data
+    :type data: dict
+    """
+    if data:
+        response.media = data
+    else:
+        raise HTTPNotFound()
+
+
+@contextmanager
+def upsert_errors():
+    """
+    Translate errors of upsert into HTTP errors
+    """
+    try:
+        yield
+    except UpsertConflictError as e:
+        raise HTTPConflict("Conflicting resource", description=str(e))
+    except ValueError as e:
+        raise HTTPBadRequest("Request data failed validation", description=str(e))
+
+
 class ListOperateMixin:
     def on_get(self, request, response, **params):
         """
@@ -30,11 +74,68 @@ class ListOperateMixin:
             validator = self.schema.list_validator()
             validator and validator(request)
         with Context(self, request, response, params) as context:
+            if context.stream is not None:
+                self.respond_stream(context, response)
+                return
+            if self.list_etag or is_conditional(request):
+                version = self.list_version(context, filters=context.filters)
+                if not_modified(request, response, version, context.filters):
+                    return
+            if context.after is not None or context.before is not None:
+                data = self.list_by_cursor(
+                    context, filters=context.filters, orders=context.orders,
+                    limit=context.limit, after=context.after, before=context.before
+                )
+                self.respond_cursor_list(response, data)
+                return
             data = self.list(
                 context, filters=context.filters, orders=context.orders,
                 limit=context.limit, offset=context.offset
             )
-            response.media = {"count": data[0], "data": data[1]} if data else {"count": 0, "data": []}
+            self.respond_list(response, data)
+
+    def respond_stream(self, context, response):
+        """
+        Respond with resources as a stream in format of `__stream`
+
+        :type self: restful_falcon.core.controller.base.Resource, ListOperateMixin
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        """
+        records = self.list_stream(
+            context, filters=context.filters, orders=context.orders,
+            limit=context.limit, offset=context.offset
+        )
+        response.content_type = STREAM_CONTENT_TYPES[context.stream]
+        response.stream = encode_stream(records, context.stream)
+
+    @staticmethod
+    def respond_list(response, data):
+        """
+        Respond with a page of resources listed by offset
+
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param data: number of records and records returned by `list`
+        :type data: tuple
+        """
+        response.media = {"count": data[0], "data": data[1]} if data else {"count": 0, "data": []}
+
+    @staticmethod
+    def respond_cursor_list(response, data):
+        """
+        Respond with a page of resources listed by cursor
+
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param data: number of records, records and cursors returned by `list_by_cursor`
+        :type data: tuple
+        """
+        response.media = {
+            "count": data[0], "data": data[1], "next": data[2]["next"], "prev": data[2]["prev"]
+        } if data else {"count": 0, "data": [], "next": None, "prev": None}
 
     def list(self, context, filters=None, orders=None, limit=None, offset=None):
         """
@@ -55,11 +156,162 @@ class ListOperateMixin:
         """
         if isinstance(self, Resource) and self.has_model():
             return self.resource_model.perform_list(
-                filters=filters, orders=orders, limit=limit, offset=offset, session=context.session
+                columns=context.fields, filters=filters, orders=orders, limit=limit, offset=offset,
+                count_strategy=context.count_strategy, read_path=self.read_path, expand=context.expand,
+                session=context.session
             )
 
+    def list_by_cursor(self, context, filters=None, orders=None, limit=None, after=None, before=None):
+        """
+        List resources with keyset pagination
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param filters: filter list
+        :type filters: list
+        :param orders: order list
+        :type orders: list
+        :param limit: limit number
+        :type limit: int
+        :param after: keyset values of the position to list after
+        :type after: list
+        :param before: keyset values of the position to list before
+        :type before: list
+        :rtype: tuple
+        """
+        if isinstance(self, Resource) and self.has_model():
+            return self.resource_model.perform_list_by_cursor(
+                columns=context.fields, filters=filters, orders=orders, limit=limit, after=after, before=before,
+                count_strategy=context.count_strategy, expand=context.expand, session=context.session
+            )
+
+    def list_version(self, context, filters=None):
+        """
+        Get version of resources for conditional requests, which is None if
+        the resource model is not versioned
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param filters: filter list
+        :type filters: list
+        :rtype: dict
+        """
+        if isinstance(self, Resource) and self.has_model() and self.conditional_get and not context.expand:
+            if self.resource_model.has_version():
+                return self.resource_model.perform_list_version(filters=filters, session=context.session)
+
+    def list_stream(self, context, filters=None, orders=None, limit=None, offset=None):
+        """
+        List resources as a stream, records are read batch by batch while
+        the response is sent
 
-class CreateOperateMixin:
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param filters: filter list
+        :type filters: list
+        :param orders: order list
+        :type orders: list
+        :param limit: limit number
+        :type limit: int
+        :param offset: offset number
+        :type offset: int
+        :rtype: collections.Iterator
+        """
+        if isinstance(self, Resource) and self.has_model():
+            return self.resource_model.perform_list_stream(
+                columns=context.fields, filters=filters, orders=orders, limit=limit, offset=offset,
+                batch_size=self.stream_batch_size
+            )
+        return iter(())
+
+
+class BulkOperateMixin:
+    def validate_bulk(self, request):
+        """
+        Validate each record of bulk request separately
+
+        :type self: restful_falcon.core.controller.base.Resource, BulkOperateMixin
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :return: results with failures of invalid records, and indexes of valid records
+        :rtype: tuple
+        """
+        if not isinstance(request.media, list):
+            raise HTTPBadRequest(
+                "Request data failed validation",
+                description="Request data should be an array"
+            )
+        validator = self.schema.create_data_validator() if self.has_schema() else None
+        results = [None] * len(request.media)
+        indexes = []
+        for i in range(0, len(request.media)):
+            if not isinstance(request.media[i], dict):
+                results[i] = {"status": BULK_FAILED, "error": "Record should be an object"}
+                continue
+            try:
+                validator and validator(request.media[i])
+            except HTTPBadRequest as e:
+                results[i] = {"status": BULK_FAILED, "error": e.description}
+                continue
+            indexes.append(i)
+        return results, indexes
+
+    @staticmethod
+    def report_bulk(response, results, indexes, data, status):
+        """
+        Report result of each record of bulk request, with `207 Multi-Status`
+        if any record failed
+
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param results: results with failures of invalid records
+        :type results: list
+        :param indexes: indexes of valid records
+        :type indexes: list
+        :param data: results of valid records returned by bulk operate
+        :type data: list
+        :param status: status of succeeded records, e.g. `created`, which also names their count
+        :type status: str
+        """
+        for i, result in zip(indexes, data or []):
+            results[i] = result
+        for i in range(0, len(results)):
+            results[i] = dict(results[i] or {"status": BULK_FAILED, "error": "Record not {}".format(status)}, index=i)
+        succeeded = sum(1 for result in results if result["status"] == status)
+        response.media = {
+            "count": len(results), status: succeeded,
+            "failed": len(results) - succeeded, "data": results
+        }
+        if succeeded < len(results):
+            response.status = HTTP_207
+
+    def bulk_operate(self, request, response, params, operate, status):
+        """
+        Bulk method, each record is validated and reported separately
+
+        :type self: restful_falcon.core.controller.base.Resource, BulkOperateMixin
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param params: extend parameters
+        :type params: dict
+        :param operate: bulk operate taking context and data list of valid records, e.g. `bulk_create`
+        :type operate: callable
+        :param status: status of succeeded records
+        :type status: str
+        """
+        results, indexes = self.validate_bulk(request)
+        with Context(self, request, response, params, autocommit=True) as context:
+            request_data = context.request_data
+            data = operate(context, [request_data[i] for i in indexes]) if indexes else []
+            self.report_bulk(response, results, indexes, data, status)
+
+
+class CreateOperateMixin(BulkOperateMixin):
     def on_post(self, request, response, **params):
         """
         Post method
@@ -72,6 +324,8 @@ class CreateOperateMixin:
         :param params: extend parameters
         :type params: dict
         """
+        if isinstance(request.media, list):
+            return self.on_post_bulk(request, response, **params)
         if self.has_schema():
             validator = self.schema.create_validator()
             validator and validator(request)
@@ -80,6 +334,36 @@ class CreateOperateMixin:
             if data:
                 response.media = data
 
+    def on_post_bulk(self, request, response, **params):
+        """
+        Post bulk method, each record is validated and reported separately
+
+        :type self: restful_falcon.core.controller.base.Resource, CreateOperateMixin
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param params: extend parameters
+        :type params: dict
+        """
+        self.bulk_operate(request, response, params, self.bulk_create, BULK_CREATED)
+
+    def bulk_create(self, context, data):
+        """
+        Create resources in batches
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param data: data list to be created
+        :type data: list
+        :rtype: list
+        """
+        if isinstance(self, Resource) and self.has_model():
+            return self.resource_model.perform_bulk_create(
+                data, batch_size=self.bulk_create_batch_size, session=context.session
+            )
+
     def create(self, context, data):
         """
         Create a resource
@@ -109,11 +393,15 @@ class ShowOperateMixin:
         :type params: dict
         """
         with Context(self, request, response, params) as context:
+            conditional = is_conditional(request)
+            if conditional:
+                version = self.version(context, params[self.resource_id], filters=context.filters)
+                if not_modified(request, response, version, context.filters):
+                    return
             data = self.show(context, params[self.resource_id], filters=context.filters)
-            if data:
-                response.media = data
-            else:
-                raise HTTPNotFound()
+            if not conditional:
+                not_modified(request, response, self.item_version(context, data), context.filters)
+            respond_item(response, data)
 
     def show(self, context, resource_id, filters=None):
         """
@@ -129,9 +417,44 @@ class ShowOperateMixin:
         """
         if isinstance(self, Resource) and self.has_model():
             return self.resource_model.perform_show(
-                resource_id, filters=filters, session=context.session
+                resource_id, filters=filters, columns=context.fields, read_path=self.read_path,
+                expand=context.expand, session=context.session
             )
 
+    def version(self, context, resource_id, filters=None):
+        """
+        Get version of a resource for conditional requests, which is None if
+        the resource model is not versioned or the resource is not found
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param resource_id: resource id
+        :param filters: filter list
+        :type filters: list
+        :rtype: dict
+        """
+        if isinstance(self, Resource) and self.has_model() and self.conditional_get and not context.expand:
+            if self.resource_model.has_version():
+                return self.resource_model.perform_version(resource_id, filters=filters, session=context.session)
+
+    def item_version(self, context, data):
+        """
+        Get version of a resource from its data loaded, which makes the same
+        entity tag as `version`, None if the version field is not loaded
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param data: resource data
+        :type data: dict
+        :rtype: dict
+        """
+        if isinstance(self, Resource) and self.has_model() and self.conditional_get and not context.expand:
+            model = self.resource_model
+            if data and model.has_version() and model.version_field in data:
+                return {"version": data[model.version_field]}
+
 
 class UpdateOperateMixin:
     def on_put_item(self, request, response, **params):
@@ -154,10 +477,7 @@ class UpdateOperateMixin:
                 context, params[self.resource_id],
                 context.request_data, filters=context.filters
             )
-            if data:
-                response.media = data
-            else:
-                raise HTTPNotFound()
+            respond_item(response, data)
 
     def update(self, context, resource_id, data, filters=None):
         """
@@ -194,10 +514,7 @@ class DeleteOperateMixin:
         """
         with Context(self, request, response, params, autocommit=True) as context:
             data = self.delete(context, params[self.resource_id], filters=context.filters)
-            if data:
-                response.media = data
-            else:
-                raise HTTPNotFound()
+            respond_item(response, data)
 
     def delete(self, context, resource_id, filters=None):
         """
@@ -217,6 +534,128 @@ class DeleteOperateMixin:
             )
 
 
+# Not included in `ResourceOperatesMixin`, resources accepting PUT on collection opt in to it
+class UpsertOperateMixin(BulkOperateMixin):
+    def on_put(self, request, response, **params):
+        """
+        Put method, which creates a resource, or updates the resource
+        conflicting on `upsert_conflict_columns`
+
+        :type self: restful_falcon.core.controller.base.Resource, UpsertOperateMixin
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param params: extend parameters
+        :type params: dict
+        """
+        if isinstance(request.media, list):
+            return self.on_put_bulk(request, response, **params)
+        if self.has_schema():
+            validator = self.schema.create_validator()
+            validator and validator(request)
+        with Context(self, request, response, params, autocommit=True) as context:
+            with upsert_errors():
+                data = self.upsert(context, context.request_data)
+            if data:
+                response.media = data
+
+    def on_put_bulk(self, request, response, **params):
+        """
+        Put bulk method, each record is validated and reported separately
+
+        :type self: restful_falcon.core.controller.base.Resource, UpsertOperateMixin
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param params: extend parameters
+        :type params: dict
+        """
+        self.bulk_operate(request, response, params, self.bulk_upsert, BULK_UPSERTED)
+
+    def bulk_upsert(self, context, data):
+        """
+        Upsert resources in batches
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param data: data list to be upserted
+        :type data: list
+        :rtype: list
+        """
+        if isinstance(self, Resource) and self.has_model():
+            return self.resource_model.perform_bulk_upsert(
+                data, conflict_columns=self.upsert_conflict_columns, filters=context.filters,
+                create_data=context.create_data, batch_size=self.bulk_create_batch_size, session=context.session
+            )
+
+    def upsert(self, context, data):
+        """
+        Upsert a resource
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param data: data to be upserted
+        :type data: dict
+        :rtype: dict
+        """
+        if isinstance(self, Resource) and self.has_model():
+            return self.resource_model.perform_upsert(
+                data, conflict_columns=self.upsert_conflict_columns, filters=context.filters,
+                create_data=context.create_data, session=context.session
+            )
+
+
+# Not included in `ResourceOperatesMixin`, resources allowed to be exported as a whole opt in to it
+class ExportOperateMixin:
+    def on_get_export(self, request, response, **params):
+        """
+        Get export method, routed with suffix `export`. All resources matching
+        filters are streamed in order of primary key as CSV by default, or in
+        the format of `__stream`, pagination and orders are ignored
+
+        :type self: restful_falcon.core.controller.base.Resource, ExportOperateMixin
+        :param request: request object
+        :type request: restful_falcon.core.request.Request
+        :param response: response object
+        :type response: restful_falcon.core.response.Response
+        :param params: extend parameters
+        :type params: dict
+        """
+        if self.has_schema():
+            validator = self.schema.list_validator()
+            validator and validator(request)
+        with Context(self, request, response, params) as context:
+            stream_format = context.stream or STREAM_CSV
+            records = self.export(context, filters=context.filters)
+            response.content_type = STREAM_CONTENT_TYPES[stream_format]
+            response.set_header(
+                "Content-Disposition",
+                'attachment; filename="{}.{}"'.format(self.resource_name, stream_format)
+            )
+            response.stream = encode_stream(records, stream_format)
+
+    def export(self, context, filters=None):
+        """
+        Export resources
+
+        :type self: restful_falcon.core.controller.base.Resource
+        :param context: context object
+        :type context: restful_falcon.core.controller.base.Context
+        :param filters: filter list
+        :type filters: list
+        :rtype: collections.Iterator
+        """
+        if isinstance(self, Resource) and self.has_model():
+            return self.resource_model.perform_export(
+                columns=context.fields, filters=filters, batch_size=self.stream_batch_size
+            )
+        return iter(())
+
+
 class ResourceQueryOperatesMixin(ListOperateMixin, ShowOperateMixin):
     pass
 
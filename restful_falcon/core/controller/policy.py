@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+from sqlalchemy import UniqueConstraint
+
+from restful_falcon.core.config import CONF
+from restful_falcon.core.controller.extractor import LIMIT_FIELD
+from restful_falcon.core.controller.extractor import OFFSET_FIELD
+from restful_falcon.core.controller.extractor import ORDER_FIELD
+from restful_falcon.core.db.filter import ILIKE_FILTER
+from restful_falcon.core.db.filter import IN_FILTER
+from restful_falcon.core.db.filter import LIKE_FILTER
+from restful_falcon.core.db.filter import MATCH_FILTER
+from restful_falcon.core.db.filter import NOT_IN_FILTER
+from restful_falcon.core.db.filter import composite_filter_makers
+from restful_falcon.core.db.filter import simple_filter_makers
+from restful_falcon.core.exception import HTTPInvalidParam
+
+__all__ = ["QueryPolicy", "make_query_policy", "indexed_columns", "INDEXED_FIELDS"]
+
+# Allow-list of fields derived from indexed columns of model
+INDEXED_FIELDS = "indexed"
+
+PATTERN_FILTERS = {LIKE_FILTER, ILIKE_FILTER, MATCH_FILTER}
+
+
+def indexed_columns(model):
+    """
+    Columns which lead an index, primary key or unique constraint of the
+    table of model, filters and orders on which can be served by an index
+
+    :param model: model class
+    :rtype: frozenset
+    """
+    table = model.__table__
+    columns = set()
+    keys = [table.primary_key] + list(table.indexes)
+    keys.extend(constraint for constraint in table.constraints if isinstance(constraint, UniqueConstraint))
+    for key in keys:
+        key_columns = list(key.columns)
+        if key_columns:
+            columns.add(key_columns[0].key)
+    return frozenset(columns)
+
+
+def _filter_field(filter_repr):
+    name, operand = filter_repr
+    if name in simple_filter_makers:
+        return name, operand[0], operand[1]
+    return None, name, operand
+
+
+class QueryPolicy(object):
+    """
+    Budget of list queries of a resource, requests over budget are rejected
+    before the database is touched. None means unlimited.
+    """
+    __slots__ = (
+        "default_limit", "max_limit", "max_offset", "filterable_fields", "sortable_fields",
+        "max_in_items", "max_filter_depth", "allow_pattern_filters"
+    )
+
+    def __init__(self, default_limit=None, max_limit=None, max_offset=None, filterable_fields=None,
+                 sortable_fields=None, max_in_items=None, max_filter_depth=None, allow_pattern_filters=True):
+        """
+        :param default_limit: limit of requests without `__limit`
+        :type default_limit: int
+        :param max_limit: maximum of `__limit`
+        :type max_limit: int
+        :param max_offset: maximum of `__offset`
+        :type max_offset: int
+        :param filterable_fields: fields allowed to be filtered by
+        :type filterable_fields: list
+        :param sortable_fields: fields allowed to be sorted by
+        :type sortable_fields: list
+        :param max_in_items: maximum number of values of `__in` and `__not_in`
+        :type max_in_items: int
+        :param max_filter_depth: maximum nesting depth of filters, a plain filter is 1 deep
+        :type max_filter_depth: int
+        :param allow_pattern_filters: whether `__like`, `__ilike` and `__match` are allowed
+        :type allow_pattern_filters: bool
+        """
+        if default_limit is not None and max_limit is not None and default_limit > max_limit:
+            raise ValueError("Default limit {} exceeds maximum limit {}".format(default_limit, max_limit))
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.max_offset = max_offset
+        self.filterable_fields = frozenset(filterable_fields) if filterable_fields is not None else None
+        self.sortable_fields = frozenset(sortable_fields) if sortable_fields is not None else None
+        self.max_in_items = max_in_items
+        self.max_filter_depth = max_filter_depth
+        self.allow_pattern_filters = allow_pattern_filters
+
+    def check(self, spec):
+        """
+        Check query spec against the policy
+
+        :param spec: query spec
+        :type spec: restful_falcon.core.controller.query.QuerySpec
+        :raise HTTPInvalidParam: if the query is over budget
+        """
+        # Streams are read in batches from replicas, so that they are not paginated
+        if self.max_limit is not None and spec.limit is not None and spec.stream is None:
+            if spec.limit > self.max_limit:
+                raise HTTPInvalidParam("Should not be greater than {}".format(self.max_limit), LIMIT_FIELD)
+        if self.max_offset is not None and spec.offset is not None and spec.offset > self.max_offset:
+            raise HTTPInvalidParam(
+                "Should not be greater than {}, use __after to paginate further".format(self.max_offset),
+                OFFSET_FIELD
+            )
+        if self.sortable_fields is not None and spec.orders:
+            for order in spec.orders:
+                field = order[0] if isinstance(order, (tuple, list)) else order
+                if field not in self.sortable_fields:
+                    raise HTTPInvalidParam("Cannot sort by {}".format(field), ORDER_FIELD)
+        for filter_repr in spec.filters:
+            self._check_filter(filter_repr, 1)
+
+    def _check_filter(self, filter_repr, depth):
+        if not isinstance(filter_repr, (tuple, list)) or len(filter_repr) != 2:
+            return
+        name, operand = filter_repr
+        if name in composite_filter_makers and isinstance(operand, (tuple, list)):
+            if self.max_filter_depth is not None and depth >= self.max_filter_depth:
+                raise HTTPInvalidParam(
+                    "Filters should not be nested deeper than {}".format(self.max_filter_depth), "__{}".format(name)
+                )
+            for _repr in operand:
+                self._check_filter(_repr, depth + 1)
+            return
+        operator, field, value = _filter_field(filter_repr)
+        param = "__{}".format(operator) if operator else field
+        if self.filterable_fields is not None and field not in self.filterable_fields:
+            raise HTTPInvalidParam("Cannot filter by {}".format(field), param)
+        if not self.allow_pattern_filters and operator in PATTERN_FILTERS:
+            raise HTTPInvalidParam("Pattern filters are not allowed", param)
+        if self.max_in_items is not None and operator in (IN_FILTER, NOT_IN_FILTER):
+            if isinstance(value, (tuple, list)) and len(value) > self.max_in_items:
+                raise HTTPInvalidParam("Should not have more than {} values".format(self.max_in_items), param)
+
+    def limit(self, spec):
+        """
+        Limit of query spec, the default limit if not specified
+
+        :param spec: query spec
+        :type spec: restful_falcon.core.controller.query.QuerySpec
+        :rtype: int
+        """
+        if spec.limit is None and spec.stream is None:
+            return self.default_limit
+        return spec.limit
+
+
+def make_query_policy(resource_class):
+    """
+    Make query policy of resource class, options of `query_policy` of
+    resource override the global ones of configuration. Allow-lists of
+    fields can be `"indexed"`, which are derived from indexed columns.
+
+    :param resource_class: resource class
+    :type resource_class: type
+    :rtype: QueryPolicy
+    """
+    policy = getattr(resource_class, "query_policy", None)
+    if isinstance(policy, QueryPolicy):
+        return policy
+    options = dict(CONF.get("query_policy") or {})
+    options.update(policy or {})
+    model = getattr(resource_class, "resource_model", None)
+    for option in ("filterable_fields", "sortable_fields"):
+        if options.get(option) != INDEXED_FIELDS:
+            continue
+        if model is None:
+            raise ValueError("{} of {} cannot be derived without model".format(option, resource_class.__name__))
+        options[option] = indexed_columns(model)
+    return QueryPolicy(**options)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+from collections import namedtuple
+
+from restful_falcon.core.controller.extractor import AFTER_FIELD
+from restful_falcon.core.controller.extractor import BEFORE_FIELD
+from restful_falcon.core.controller.extractor import COMPOSITE_FILTER_FIELDS
+from restful_falcon.core.controller.extractor import COUNT_FIELD
+from restful_falcon.core.controller.extractor import EXPAND_FIELD
+from restful_falcon.core.controller.extractor import EXTRACTORS
+from restful_falcon.core.controller.extractor import ExtractError
+from restful_falcon.core.controller.extractor import FIELDS_FIELD
+from restful_falcon.core.controller.extractor import FILTER_FIELDS
+from restful_falcon.core.controller.extractor import FieldExtractor
+from restful_falcon.core.controller.extractor import LIMIT_FIELD
+from restful_falcon.core.controller.extractor import OFFSET_FIELD
+from restful_falcon.core.controller.extractor import ORDER_FIELD
+from restful_falcon.core.controller.extractor import STREAM_FIELD
+from restful_falcon.core.controller.policy import make_query_policy
+from restful_falcon.core.exception import HTTPInvalidParam
+
+__all__ = ["QuerySpec", "QueryParser", "EMPTY_QUERY_SPEC"]
+
+# Fields of query spec set by reserved query parameters
+SPEC_FIELDS = {
+    LIMIT_FIELD: "limit", OFFSET_FIELD: "offset", AFTER_FIELD: "after", BEFORE_FIELD: "before",
+    COUNT_FIELD: "count_strategy", FIELDS_FIELD: "fields", STREAM_FIELD: "stream", EXPAND_FIELD: "expand"
+}
+
+
+# Slots of tuple make the spec immutable and cheap to build
+class QuerySpec(namedtuple("QuerySpec", (
+    "filters", "orders", "limit", "offset", "after", "before", "count_strategy", "fields", "stream", "expand"
+))):
+    """
+    Immutable query parameters of a list or show request
+    """
+    __slots__ = ()
+
+
+QuerySpec.__new__.__defaults__ = ((), None, None, None, None, None, None, None, None, None)
+
+EMPTY_QUERY_SPEC = QuerySpec()
+
+
+def _extract_equal_filters(field, param):
+    value = param[field]
+    try:
+        values = FieldExtractor.convert_and_revise(value)
+    except ExtractError as e:
+        raise HTTPInvalidParam(e.message, field)
+    if not isinstance(values, list):
+        return [(field, values)]
+    return [(field, _value) for _value in values]
+
+
+def _filter_handler(field, extractor):
+    operator = field[2:]
+    composite = field in COMPOSITE_FILTER_FIELDS
+
+    def handle(param, spec, filters):
+        value = extractor(param)
+        if composite and not isinstance(value, list):
+            raise HTTPInvalidParam("Need multiple items", field)
+        if composite or not isinstance(value, list):
+            filters.append((operator, value))
+        else:
+            filters.extend((operator, _value) for _value in value)
+    return handle
+
+
+def _spec_handler(name, extractor):
+    def handle(param, spec, filters):
+        value = extractor(param)
+        spec[name] = tuple(value) if isinstance(value, list) else value
+    return handle
+
+
+def _order_handler(extractor):
+    def handle(param, spec, filters):
+        orders = extractor(param)
+        spec["orders"] = tuple(orders) if isinstance(orders, list) else (orders,)
+    return handle
+
+
+class QueryParser(object):
+    """
+    Parser of query parameters compiled once per resource class, which maps
+    each reserved field to its handler, so that query parameters are parsed
+    into a query spec in a single pass, and holds the query policy of the
+    resource class
+    """
+    __slots__ = ("_handlers", "_policy")
+
+    def __init__(self, resource_class):
+        handlers = {field: _spec_handler(name, EXTRACTORS[field]) for field, name in SPEC_FIELDS.items()}
+        handlers.update({field: _filter_handler(field, EXTRACTORS[field]) for field in FILTER_FIELDS})
+        handlers[ORDER_FIELD] = _order_handler(EXTRACTORS[ORDER_FIELD])
+        self._handlers = handlers
+        self._policy = make_query_policy(resource_class)
+
+    @property
+    def policy(self):
+        return self._policy
+
+    def parse(self, param):
+        """
+        Parse query parameters, reserved fields are case insensitive, and
+        other fields filter by equality
+
+        :param param: query parameters
+        :type param: dict
+        :rtype: QuerySpec
+        """
+        if not param:
+            return EMPTY_QUERY_SPEC
+        handlers = self._handlers
+        spec = {}
+        filters = []
+        for field in param:
+            handler = handlers.get(field)
+            if handler is not None:
+                handler(param, spec, filters)
+                continue
+            if field.startswith("__"):
+                _field = field.lower()
+                handler = handlers.get(_field)
+                if handler is not None:
+                    handler({_field: param[field]}, spec, filters)
+                    continue
+            filters.extend(_extract_equal_filters(field, param))
+        if filters:
+            spec["filters"] = tuple(filters)
+        return QuerySpec(**spec)
@@ -8,27 +8,32 @@ import jsonschema
 from functools import partial
 from functools import wraps
 
-__all__ = ["validate", "validate_request", "validate_response", "ResourceSchema"]
+__all__ = ["validate", "validate_data", "validate_request", "validate_response", "ResourceSchema"]
 
 
-def validate_request(req, req_field="media", req_schema=None):
-    if req_schema is not None:
+def validate_data(data, data_schema=None):
+    if data_schema is not None:
         try:
             jsonschema.validate(
-                getattr(req, req_field), req_schema,
+                data, data_schema,
                 format_checker=jsonschema.FormatChecker()
             )
         except jsonschema.ValidationError as e:
             if not e.absolute_path:
                 error_message = e.message
             else:
-                error_message = "{}: {}".format(".".join(e.absolute_path), e.message)
+                error_message = "{}: {}".format(".".join(str(path) for path in e.absolute_path), e.message)
             raise falcon.HTTPBadRequest(
                 "Request data failed validation",
                 description=error_message
             )
 
 
+def validate_request(req, req_field="media", req_schema=None):
+    if req_schema is not None:
+        validate_data(getattr(req, req_field), data_schema=req_schema)
+
+
 def validate_response(resp, resp_schema=None):
     if resp_schema is not None:
         try:
@@ -117,6 +122,12 @@ class ResourceSchema(object):
             return partial(validate_request, req_field=req_field, req_schema=req_schema)
         return partial(validate_request, req_field=self.default_validate_field, req_schema=self._default)
 
+    def __data_validator(self, name):
+        data_schema = getattr(self, name) or self._default
+        if not data_schema:
+            return
+        return partial(validate_data, data_schema=data_schema)
+
     def list_validator(self):
         return self.__validator("_list")
 
@@ -125,3 +136,6 @@ class ResourceSchema(object):
 
     def update_validator(self):
         return self.__validator("_update")
+
+    def create_data_validator(self):
+        return self.__data_validator("_create")
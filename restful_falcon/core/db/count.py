@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import json
+import traceback
+from logging import getLogger
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+__all__ = [
+    "COUNT_EXACT", "COUNT_WINDOW", "COUNT_ESTIMATE", "COUNT_NONE", "COUNT_STRATEGIES", "WINDOW_COUNT_LABEL",
+    "estimate_count"
+]
+
+logger = getLogger(__name__)
+
+COUNT_EXACT = "exact"
+COUNT_WINDOW = "window"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_WINDOW, COUNT_ESTIMATE, COUNT_NONE)
+
+WINDOW_COUNT_LABEL = "__count"
+
+
+class Explain(Executable, ClauseElement):
+    def __init__(self, statement):
+        self.statement = statement
+
+
+# noinspection PyUnusedLocal
+@compiles(Explain)
+def _explain(element, compiler, **kwargs):
+    raise NotImplementedError(
+        "Dialect ({}) does not support estimated count".format(compiler.dialect.name)
+    )
+
+
+@compiles(Explain, "postgresql")
+def _postgresql_explain(element, compiler, **kwargs):
+    return "EXPLAIN (FORMAT JSON) {}".format(compiler.process(element.statement, **kwargs))
+
+
+@compiles(Explain, "mysql")
+def _mysql_explain(element, compiler, **kwargs):
+    return "EXPLAIN {}".format(compiler.process(element.statement, **kwargs))
+
+
+def _postgresql_rows(result):
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _mysql_rows(result):
+    row = result.first()
+    filtered = row["filtered"] if "filtered" in row.keys() else 100
+    return int((row["rows"] or 0) * (filtered or 100) / 100)
+
+
+ESTIMATE_READERS = {
+    "postgresql": _postgresql_rows,
+    "mysql": _mysql_rows
+}
+
+
+def estimate_count(session, query, params=None):
+    """
+    Estimate number of records from planner statistics
+
+    :param session: session object
+    :type session: restful_falcon.core.db.engine.Session
+    :param query: query object or select statement without limit and offset
+    :type query: sqlalchemy.orm.Query, sqlalchemy.sql.expression.Select
+    :param params: values of bound parameters in select statement
+    :type params: dict
+    :return: estimated number of records, or None if the dialect has no statistics
+    :rtype: int
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect not in ESTIMATE_READERS:
+        return None
+    try:
+        statement = query.order_by(None)
+        if not isinstance(statement, ClauseElement):
+            statement = statement.statement
+        result = session.execute(Explain(statement), params or {})
+        return ESTIMATE_READERS[dialect](result)
+    except Exception as e:
+        logger.warning(str(e))
+        logger.warning(traceback.format_exc())
+        return None
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import base64
+import binascii
+import json
+from datetime import date
+from datetime import datetime
+from datetime import time
+from decimal import Decimal
+from uuid import UUID
+
+import enum
+
+__all__ = ["START_CURSOR", "CursorEncoder", "encode_cursor", "decode_cursor", "coerce_value"]
+
+DATETIME_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S.%f")
+DATE_FORMAT = "%Y-%m-%d"
+TIME_FORMATS = ("%H:%M:%S.%f%z", "%H:%M:%S.%f")
+
+# Cursor of the start of a walk, the first page after it or the last page before it
+START_CURSOR = "start"
+
+
+class CursorEncoder(json.JSONEncoder):
+    """
+    Cursor values must survive a round trip without losing precision,
+    so datetime values keep their microseconds and time zone.
+    """
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return obj.strftime(DATETIME_FORMATS[0])
+        if isinstance(obj, date):
+            return obj.strftime(DATE_FORMAT)
+        if isinstance(obj, time):
+            return obj.strftime(TIME_FORMATS[0])
+        if isinstance(obj, (Decimal, UUID)):
+            return str(obj)
+        if isinstance(obj, enum.Enum):
+            return obj.name
+        return super(CursorEncoder, self).default(obj)
+
+
+def encode_cursor(values):
+    """
+    Encode keyset values to an opaque cursor string
+
+    :param values: keyset values
+    :type values: list
+    :return: url safe cursor string
+    :rtype: str
+    """
+    string = json.dumps(list(values), cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(string.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode an opaque cursor string to keyset values
+
+    :param cursor: cursor string
+    :type cursor: str
+    :return: keyset values, which are empty for the start cursor
+    :rtype: list
+    """
+    if cursor == START_CURSOR:
+        return []
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding).decode("utf-8"))
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError("{} is not a valid cursor".format(cursor))
+    if not isinstance(values, list) or not values:
+        raise ValueError("{} is not a valid cursor".format(cursor))
+    return values
+
+
+def _strptime(value, formats):
+    for _format in formats:
+        try:
+            return datetime.strptime(value, _format)
+        except ValueError:
+            continue
+    raise ValueError("{} does not match any format in {}".format(value, str(formats)))
+
+
+def coerce_value(column_type, value):
+    """
+    Coerce a decoded cursor value to the python type of column
+
+    :param column_type: column type
+    :type column_type: sqlalchemy.types.TypeEngine
+    :param value: decoded value
+    :return: coerced value
+    """
+    if value is None:
+        return value
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    if not isinstance(value, str):
+        return python_type(value)
+    if issubclass(python_type, datetime):
+        return _strptime(value, DATETIME_FORMATS)
+    if issubclass(python_type, date):
+        return datetime.strptime(value, DATE_FORMAT).date()
+    if issubclass(python_type, time):
+        return _strptime(value, TIME_FORMATS).timetz()
+    if issubclass(python_type, enum.Enum):
+        try:
+            return python_type[value]
+        except KeyError:
+            raise ValueError("{} is not a member of {}".format(value, python_type.__name__))
+    return python_type(value)
@@ -3,15 +3,260 @@
 # __date__ = "2020/8/17"
 from __future__ import absolute_import
 
+import threading
+import time
+from contextlib import contextmanager
+from itertools import cycle
+
 from sqlalchemy import create_engine as _create_engine
+from sqlalchemy import event
+from sqlalchemy.orm import Session as _Session
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+
+from restful_falcon.core.db.pool import METRICS
+from restful_falcon.core.db.pool import attach_metrics
+from restful_falcon.core.db.pool import pool_options
+from restful_falcon.core.db.stats import N_PLUS_ONE_WARN
+from restful_falcon.core.db.stats import attach_query_events
+
+__all__ = [
+    "create_engine", "Session", "RoutingSession", "EngineRouter", "using_replica",
+    "ROUND_ROBIN", "LEAST_CONNECTIONS", "REPLICA_SELECTIONS"
+]
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+REPLICA_SELECTIONS = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+MAX_PINS = 10000
+
+
+class EngineRouter(object):
+    """
+    Router between the primary engine and replica engines. Replicas are
+    selected by round robin or by the least number of checked out
+    connections, and clients wrote recently are pinned to the primary
+    for a window, so that they can read their own writes.
+    """
+    def __init__(self, primary, replicas=None, selection=ROUND_ROBIN, read_your_writes=0):
+        if selection not in REPLICA_SELECTIONS:
+            raise ValueError("Replica selection should be in {}".format(str(REPLICA_SELECTIONS)))
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.selection = selection
+        self.read_your_writes = float(read_your_writes or 0)
+        self._lock = threading.Lock()
+        self._cycle = cycle(self.replicas)
+        self._connections = dict((id(replica), 0) for replica in self.replicas)
+        self._pins = {}
+        for replica in self.replicas:
+            self._listen(replica)
+
+    def _listen(self, replica):
+        key = id(replica)
+
+        # noinspection PyUnusedLocal
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self._connections[key] += 1
+
+        # noinspection PyUnusedLocal
+        def checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self._connections[key] = max(self._connections[key] - 1, 0)
+
+        event.listen(replica.pool, "checkout", checkout)
+        event.listen(replica.pool, "checkin", checkin)
+
+    def connections(self, replica):
+        """
+        Number of connections checked out from replica
+
+        :rtype: int
+        """
+        with self._lock:
+            return self._connections[id(replica)]
+
+    def replica(self):
+        """
+        Select a replica engine
+
+        :return: replica engine, or None if there is no replica
+        :rtype: sqlalchemy.engine.Engine
+        """
+        if not self.replicas:
+            return None
+        with self._lock:
+            if self.selection == LEAST_CONNECTIONS:
+                return min(self.replicas, key=lambda replica: self._connections[id(replica)])
+            return next(self._cycle)
+
+    def pin(self, client):
+        """
+        Pin client to the primary for the read your writes window
+        """
+        if not self.read_your_writes or client is None:
+            return
+        now = time.time()
+        with self._lock:
+            if len(self._pins) >= MAX_PINS:
+                self._pins = dict((key, until) for key, until in self._pins.items() if until > now)
+            self._pins[client] = now + self.read_your_writes
+
+    def pinned(self, client):
+        """
+        Whether client is pinned to the primary
 
-__all__ = ["create_engine", "Session"]
+        :rtype: bool
+        """
+        if not self.read_your_writes or client is None:
+            return False
+        with self._lock:
+            until = self._pins.get(client)
+            if until is not None and until <= time.time():
+                self._pins.pop(client, None)
+                until = None
+        return until is not None
 
-Session = sessionmaker()
+
+class RoutingSession(_Session):
+    """
+    Session routing reads to a replica when `use_replica` is set, or by the
+    latest route of its users sharing it, see `route`. Flushes and DML
+    statements always go to the primary, and once the session has written,
+    or its client is pinned, reads go to the primary too.
+    """
+    def __init__(self, router=None, **kwargs):
+        super(RoutingSession, self).__init__(**kwargs)
+        self.router = router
+        self.use_replica = False
+        self.pinned = False
+        self.has_writes = False
+        self._replica = None
+        self._held = []
+        self._routes = []
+
+    def route(self, use_replica):
+        """
+        Route reads of session for a user of it, e.g. a context of the
+        request sharing the session, until the route is removed by
+        `unroute`. Reads follow the latest route which is not removed, so
+        that users do not override the routing of each other.
+
+        :param use_replica: whether reads are routed to a replica
+        :type use_replica: bool
+        :return: route token
+        """
+        token = [bool(use_replica)]
+        self._routes.append(token)
+        return token
+
+    def unroute(self, token):
+        self._routes = [route for route in self._routes if route is not token]
+
+    @property
+    def reads_replica(self):
+        """
+        Whether reads are routed to a replica if the session has not written
+        and is not pinned
+
+        :rtype: bool
+        """
+        return self._routes[-1][0] if self._routes else self.use_replica
+
+    def hold(self, instance):
+        """
+        Hold a strong reference to instance, so that it stays in the weak
+        identity map until the session is closed
+        """
+        self._held.append(instance)
+
+    def close(self):
+        self._held = []
+        self._routes = []
+        super(RoutingSession, self).close()
+
+    def get_bind(self, mapper=None, clause=None):
+        if self.router is None or not self.router.replicas:
+            return super(RoutingSession, self).get_bind(mapper=mapper, clause=clause)
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.has_writes = True
+            return self.router.primary
+        if self.reads_replica and not self.pinned and not self.has_writes:
+            # A session keeps reading the same replica for a consistent view
+            if self._replica is None:
+                self._replica = self.router.replica()
+            return self._replica
+        return self.router.primary
+
+
+@contextmanager
+def using_replica(session):
+    """
+    Route reads of session to a replica in the context
+    """
+    if not isinstance(session, RoutingSession) or session.reads_replica:
+        yield session
+        return
+    token = session.route(True)
+    try:
+        yield session
+    finally:
+        session.unroute(token)
+
+
+Session = sessionmaker(class_=RoutingSession)
+
+
+def _engine_options(config, defaults=None):
+    options = dict(defaults or {})
+    options.update(pool_options(config.get("pool", None)))
+    options.update(config.get("options", None) or {})
+    return options
 
 
 def create_engine(config):
-    engine = _create_engine(config["url"], **config.get("options", {}))
-    Session.configure(bind=engine, autoflush=True, autocommit=False)
+    """
+    Create the primary engine and replica engines, and bind them to `Session`
+
+    Config:
+        url: url of the primary
+        options: options of engine
+        pool: pool settings, see `restful_falcon.core.db.pool.pool_options`
+        replicas: list of replica urls, or dicts with `url`, `options` and `pool`
+        replica_selection: [round_robin|least_connections]
+        read_your_writes: seconds to pin a client to the primary after it writes
+        slow_query_threshold: seconds, statements slower than it are logged
+        n_plus_one_threshold: executions of a statement shape in a request to report as N+1 queries
+        n_plus_one_action: [warn|raise]
+
+    :param config: db config
+    :type config: dict
+    :return: the primary engine
+    :rtype: sqlalchemy.engine.Engine
+    """
+    options = _engine_options(config)
+    engine = _create_engine(config["url"], **options)
+    METRICS.clear()
+    attach_metrics("primary", engine)
+    query_options = dict(
+        slow_query_threshold=config.get("slow_query_threshold", None),
+        n_plus_one_threshold=config.get("n_plus_one_threshold", None),
+        n_plus_one_action=config.get("n_plus_one_action", N_PLUS_ONE_WARN)
+    )
+    attach_query_events(engine, **query_options)
+    replicas = []
+    for i, replica in enumerate(config.get("replicas", None) or []):
+        if isinstance(replica, str):
+            replica = {"url": replica}
+        replicas.append(_create_engine(replica["url"], **_engine_options(replica, defaults=options)))
+        attach_metrics("replica{}".format(i), replicas[-1])
+        attach_query_events(replicas[-1], **query_options)
+    router = EngineRouter(
+        engine, replicas=replicas,
+        selection=config.get("replica_selection", ROUND_ROBIN),
+        read_your_writes=config.get("read_your_writes", 0)
+    )
+    Session.configure(bind=engine, router=router, autoflush=True, autocommit=False)
     return engine
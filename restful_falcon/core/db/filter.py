@@ -4,13 +4,23 @@
 from __future__ import absolute_import
 
 from collections import Iterable
+from datetime import date
+from datetime import datetime
+from datetime import time
+from decimal import Decimal
+from uuid import UUID
+
+import enum
 
 from sqlalchemy import and_
+from sqlalchemy import bindparam
 from sqlalchemy import or_
 from sqlalchemy.sql.operators import ColumnOperators
 
 __all__ = [
-    "make_filter", "AND_FILTER", "EQ_FILTER", "GE_FILTER", "GT_FILTER", "ILIKE_FILTER", "IN_FILTER", "LE_FILTER",
+    "make_filter", "make_filter_shape", "make_filter_from_shape", "coerce_filter_value", "coerce_filters",
+    "column_converter", "FilterValueError", "AND_FILTER", "EQ_FILTER", "GE_FILTER",
+    "GT_FILTER", "ILIKE_FILTER", "IN_FILTER", "LE_FILTER",
     "LIKE_FILTER", "LT_FILTER", "MATCH_FILTER", "NE_FILTER", "NOT_IN_FILTER", "OR_FILTER", "NOT_FILTER"
 ]
 
@@ -118,6 +128,169 @@ composite_filter_makers = {
 }
 
 
+class FilterValueError(ValueError):
+    def __init__(self, field, value, message=None):
+        self.field = field
+        self.value = value
+        super(FilterValueError, self).__init__(
+            message or "{} is not a valid value of {}".format(str(value), field)
+        )
+
+
+TRUE_STRINGS = frozenset(("true", "t", "yes", "y", "on", "1"))
+FALSE_STRINGS = frozenset(("false", "f", "no", "n", "off", "0"))
+
+
+def _convert_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    _value = str(value).strip().lower()
+    if _value in TRUE_STRINGS:
+        return True
+    if _value in FALSE_STRINGS:
+        return False
+    raise ValueError("{} is not a boolean".format(value))
+
+
+def _convert_int(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value.strip())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise ValueError("{} is not an integer".format(value))
+
+
+def _make_type_converter(python_type):
+    if python_type is bool:
+        return _convert_bool
+    if python_type is int:
+        return _convert_int
+    if issubclass(python_type, datetime):
+        return lambda value: value if isinstance(value, datetime) else datetime.fromisoformat(str(value).strip())
+    if issubclass(python_type, date):
+        return lambda value: value if isinstance(value, date) else date.fromisoformat(str(value).strip())
+    if issubclass(python_type, time):
+        return lambda value: value if isinstance(value, time) else time.fromisoformat(str(value).strip())
+    if issubclass(python_type, enum.Enum):
+        def convert_enum(value):
+            if isinstance(value, python_type):
+                return value
+            try:
+                return python_type[value]
+            except KeyError:
+                return python_type(value)
+        return convert_enum
+    if issubclass(python_type, (float, Decimal, UUID)):
+        return lambda value: value if isinstance(value, python_type) else python_type(str(value).strip())
+    # Strings, binaries and structured values are compared as they are
+    return None
+
+
+# Converters of mapped columns cached by model, a converter is None if values of column are not converted
+_CONVERTERS = {}
+
+
+def _column_converters(model):
+    converters = {}
+    for field, column in model.__mapper__.columns.items():
+        try:
+            converters[field] = _make_type_converter(column.type.python_type)
+        except NotImplementedError:
+            converters[field] = None
+    return converters
+
+
+def column_converter(model, field):
+    """
+    Get converter coercing filter values to the python type of column,
+    converters are built once per model for its mapped columns only, so
+    that the cache is bounded whatever fields are requested
+
+    :param model: model class
+    :param field: field name
+    :type field: str
+    :return: converter, or None if values of field are not converted
+    :rtype: collections.Callable
+    """
+    try:
+        converters = _CONVERTERS[model]
+    except KeyError:
+        if getattr(model, "__mapper__", None) is None:
+            return None
+        converters = _CONVERTERS[model] = _column_converters(model)
+    return converters.get(field)
+
+
+def coerce_filter_value(model, name, field, value):
+    """
+    Coerce filter value to the python type of column, so that the value is
+    compared with the column without casting. Patterns of like, ilike and
+    match are left as they are, and each value of in and not_in is coerced.
+
+    :param model: model class
+    :param name: filter name
+    :type name: str
+    :param field: field name
+    :type field: str
+    :param value: filter value
+    :return: coerced value
+    :raise FilterValueError: if value does not match the type of column
+    """
+    if value is None or model is None or name in (LIKE_FILTER, ILIKE_FILTER, MATCH_FILTER):
+        return value
+    if not isinstance(field, str):
+        return value
+    converter = column_converter(model, field)
+    if converter is None:
+        return value
+    if name in (IN_FILTER, NOT_IN_FILTER) and isinstance(value, Iterable) and not isinstance(value, str):
+        return [_coerce(converter, field, _value) for _value in value]
+    return _coerce(converter, field, value)
+
+
+def _coerce(converter, field, value):
+    if value is None:
+        return value
+    try:
+        return converter(value)
+    except (TypeError, ValueError, ArithmeticError):
+        raise FilterValueError(field, value)
+
+
+def coerce_filters(model, filters):
+    """
+    Coerce values of filters to the python types of columns, filters which
+    are not tuple or list are left as they are
+
+    :param model: model class
+    :param filters: filter list, see `BaseModel.add_filter` for filter definition
+    :type filters: list
+    :return: filter list with coerced values
+    :rtype: list
+    :raise FilterValueError: if any value does not match the type of column
+    """
+    return [_coerce_filter(model, _filter) for _filter in filters]
+
+
+def _coerce_filter(model, filter_repr):
+    if not isinstance(filter_repr, (tuple, list)) or len(filter_repr) != 2:
+        return filter_repr
+    name, operand = filter_repr
+    if name in composite_filter_makers:
+        if not isinstance(operand, (tuple, list)):
+            return filter_repr
+        return name, [_coerce_filter(model, _repr) for _repr in operand]
+    if name in simple_filter_makers:
+        if not isinstance(operand, (tuple, list)) or len(operand) != 2:
+            return filter_repr
+        return name, (operand[0], coerce_filter_value(model, name, operand[0], operand[1]))
+    return name, coerce_filter_value(model, EQ_FILTER, name, operand)
+
+
 def _make_filter_from_expr(model, expr):
     if len(expr) != 2:
         raise ValueError(
@@ -135,7 +308,8 @@ def _make_filter_from_expr(model, expr):
                     "the second item of `expr` can only contain "
                     "two items: {}".format(str(expr))
                 )
-            return simple_filter_makers[expr[0]](model, *tuple(expr[1]))
+            field, value = expr[1]
+            return simple_filter_makers[expr[0]](model, field, coerce_filter_value(model, expr[0], field, value))
         else:
             if len(expr[1]) < 1:
                 raise ValueError(
@@ -145,7 +319,7 @@ def _make_filter_from_expr(model, expr):
             filters = [make_filter(model, _repr) for _repr in expr[1]]
             return composite_filter_makers[expr[0]](filters)
     else:
-        return make_equal_filter(model, expr[0], expr[1])
+        return make_equal_filter(model, expr[0], coerce_filter_value(model, EQ_FILTER, expr[0], expr[1]))
 
 
 def make_filter(model, filter_repr):
@@ -157,3 +331,95 @@ def make_filter(model, filter_repr):
         "`filter_repr` should be an object with type in "
         "[tuple, list, ColumnOperators]: {}".format(str(filter_repr))
     )
+
+
+PARAM_NAME_FORMAT = "_fp{}"
+
+
+def _make_param_value(name, value):
+    if name in (LIKE_FILTER, ILIKE_FILTER):
+        return "%{}%".format(value)
+    if name in (IN_FILTER, NOT_IN_FILTER):
+        return list(value) if isinstance(value, Iterable) else [value]
+    return value
+
+
+def _make_simple_filter_shape(name, field, value, params, model=None):
+    if value is None and name in (EQ_FILTER, NE_FILTER):
+        return name, field, None
+    param_name = PARAM_NAME_FORMAT.format(len(params))
+    params[param_name] = _make_param_value(name, coerce_filter_value(model, name, field, value))
+    return name, field, param_name
+
+
+def make_filter_shape(filter_repr, params, model=None):
+    """
+    Make the shape of filter, which is the filter with values replaced
+    by bound parameter names, so that filters only different in values
+    share the same shape
+
+    :param filter_repr: filter object
+    :type filter_repr: tuple, list
+    :param params: dict to collect values of bound parameters
+    :type params: dict
+    :param model: model class, values are coerced to types of its columns if specified
+    :return: hashable shape of filter
+    :rtype: tuple
+    """
+    if isinstance(filter_repr, ColumnOperators):
+        raise TypeError("Filter expression ({}) has no shape".format(str(filter_repr)))
+    if not isinstance(filter_repr, (tuple, list)):
+        raise ValueError(
+            "`filter_repr` should be an object with type in "
+            "[tuple, list, ColumnOperators]: {}".format(str(filter_repr))
+        )
+    if len(filter_repr) != 2:
+        raise ValueError(
+            "`expr` can only contain two items: {}".format(str(filter_repr))
+        )
+    name, operand = filter_repr
+    if name not in simple_filter_makers and name not in composite_filter_makers:
+        return _make_simple_filter_shape(EQ_FILTER, name, operand, params, model=model)
+    if not isinstance(operand, (tuple, list)):
+        raise ValueError(
+            "the second item of `expr` should be an object "
+            "with type in [tuple, list]: {}".format(str(filter_repr))
+        )
+    if name in simple_filter_makers:
+        if len(operand) != 2:
+            raise ValueError(
+                "the second item of `expr` can only contain "
+                "two items: {}".format(str(filter_repr))
+            )
+        return _make_simple_filter_shape(name, operand[0], operand[1], params, model=model)
+    if len(operand) < 1:
+        raise ValueError(
+            "the second item of `expr` should contain at least "
+            "one item: {}".format(str(filter_repr))
+        )
+    return name, tuple(make_filter_shape(_repr, params, model=model) for _repr in operand)
+
+
+def make_filter_from_shape(model, shape):
+    """
+    Make filter from the shape made by `make_filter_shape`, the values
+    are bound by parameter names when the query executes
+
+    :param model: model class
+    :param shape: shape of filter
+    :type shape: tuple
+    :return: filter object
+    :rtype: sqlalchemy.sql.operators.ColumnOperators
+    """
+    if shape[0] in composite_filter_makers:
+        return composite_filter_makers[shape[0]]([make_filter_from_shape(model, _shape) for _shape in shape[1]])
+    name, field, param_name = shape
+    if param_name is None:
+        return simple_filter_makers[name](model, field, None)
+    if name in (LIKE_FILTER, ILIKE_FILTER):
+        return getattr(getattr(model, field), name)(bindparam(param_name))
+    if name == IN_FILTER:
+        return getattr(model, field).in_(bindparam(param_name, expanding=True))
+    if name == NOT_IN_FILTER:
+        return ~getattr(model, field).in_(bindparam(param_name, expanding=True))
+    return simple_filter_makers[name](model, field, bindparam(param_name))
@@ -7,7 +7,10 @@ import traceback
 from logging import getLogger
 
 import copy
+import json
 from functools import wraps
+from operator import attrgetter
+from operator import itemgetter
 # noinspection PyUnresolvedReferences
 from sqlalchemy import BLANK_SCHEMA
 # noinspection PyUnresolvedReferences
@@ -48,14 +51,50 @@ from sqlalchemy import Table
 from sqlalchemy import ThreadLocalMetaData
 # noinspection PyUnresolvedReferences
 from sqlalchemy import UniqueConstraint
+from sqlalchemy import event
+from sqlalchemy import and_
+from sqlalchemy import case
+from sqlalchemy import false
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import StatementError
+from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.declarative import declared_attr
-from sqlalchemy.orm.attributes import QueryableAttribute
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 
+from restful_falcon.core.db.count import COUNT_ESTIMATE
+from restful_falcon.core.db.count import COUNT_EXACT
+from restful_falcon.core.db.count import COUNT_NONE
+from restful_falcon.core.db.count import COUNT_WINDOW
+from restful_falcon.core.db.count import WINDOW_COUNT_LABEL
+from restful_falcon.core.db.count import estimate_count
+from restful_falcon.core.db.cursor import CursorEncoder
+from restful_falcon.core.db.cursor import coerce_value
+from restful_falcon.core.db.cursor import encode_cursor
+from restful_falcon.core.db.engine import RoutingSession
 from restful_falcon.core.db.engine import Session
+from restful_falcon.core.db.engine import using_replica
+from restful_falcon.core.db.filter import FilterValueError
+from restful_falcon.core.db.filter import make_and_filter
 from restful_falcon.core.db.filter import make_filter
+from restful_falcon.core.db.filter import make_or_filter
+from restful_falcon.core.db.plan import QueryPlanCache
+from restful_falcon.core.db.plan import SelectPlan
+from restful_falcon.core.db.session import SESSION_SCOPE
+from restful_falcon.util.concurrency import run_sync
 from restful_falcon.util.string import to_snake_case
 
+try:
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+except ImportError:
+    # `INSERT ... ON CONFLICT` of SQLite is supported since SQLAlchemy 1.4
+    sqlite_insert = None
+
 __all__ = [
     "BLANK_SCHEMA", "CheckConstraint", "Column", "ColumnDefault", "Computed", "Constraint", "DDL", "DefaultClause",
     "FetchedValue", "ForeignKey", "ForeignKeyConstraint", "IdentityOptions", "Index", "MetaData", "PassiveDefault",
@@ -64,6 +103,46 @@ __all__ = [
 
 logger = getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 500
+
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+RETURNING_DIALECTS = ("postgresql",)
+
+BULK_CREATED = "created"
+BULK_UPSERTED = "upserted"
+BULK_FAILED = "failed"
+
+# Dialects upserting by `INSERT ... ON CONFLICT DO UPDATE`, others select and then insert or update
+UPSERT_INSERTS = {"postgresql": postgresql_insert}
+if sqlite_insert is not None:
+    UPSERT_INSERTS["sqlite"] = sqlite_insert
+
+QUERY_PLAN_CACHE = QueryPlanCache()
+
+RECORD_CACHE_PREFIX = "restful_falcon:record"
+# Key of `Session.info` collecting records to be removed from second level cache once committed
+FORGOTTEN_RECORDS_KEY = "restful_falcon_forgotten_records"
+
+# Dialects ordering NULL after all values ascending, others order it before them
+NULLS_HIGH_DIALECTS = ("postgresql", "oracle")
+
+READ_PATH_ORM = "orm"
+READ_PATH_CORE = "core"
+READ_PATHS = (READ_PATH_ORM, READ_PATH_CORE)
+
+
+class UpsertConflictError(ValueError):
+    """
+    Raised when the record conflicting with an upserted record does not match
+    filters of the upsert, e.g. it is owned by another user
+    """
+    def __init__(self, conflict_columns):
+        self.conflict_columns = conflict_columns
+        super(UpsertConflictError, self).__init__(
+            "Conflicting record on {} is not accessible".format(str(conflict_columns))
+        )
+
 
 def process_if_no_session(autocommit=False):
     def wrapper(func):
@@ -71,18 +150,39 @@ def process_if_no_session(autocommit=False):
         def _wrapper(cls, *args, **kwargs):
             if kwargs.get("session"):
                 return func(cls, *args, **kwargs)
-            kwargs["session"] = Session()
-            result = func(cls, *args, **kwargs)
-            if autocommit:
-                kwargs["session"].commit()
-            return result
+            # The session of request scope is reused, and it is closed when the request ends
+            session = SESSION_SCOPE.get()
+            if session is not None:
+                kwargs["session"] = session
+                result = func(cls, *args, **kwargs)
+                if autocommit:
+                    session.commit()
+                return result
+            kwargs["session"] = session = Session()
+            try:
+                result = func(cls, *args, **kwargs)
+                if autocommit:
+                    session.commit()
+                return result
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
         return _wrapper
     return wrapper
 
 
 class BaseModel(object):
     id_field = "id"
+    plan_cache = QUERY_PLAN_CACHE
+    # Second level cache of records got by id, a `CacheClient` such as `restful_falcon.core.cache.CACHE`,
+    # whose entries must expire in `record_cache_expire` seconds
+    record_cache = None
+    record_cache_expire = None
     show_columns = None
+    # Update time column versioning records for conditional requests
+    version_field = "updated_at"
 
     # noinspection PyMethodParameters
     @declared_attr
@@ -106,45 +206,189 @@ class BaseModel(object):
         )
 
     def to_dict(self):
-        columns = self.columns()
-        return dict([(column, getattr(self, column)) for column in columns])
+        return self.serializer()(self)
+
+    @classmethod
+    def setup_columns(cls):
+        """
+        Build column metadata of mapped class, which is the attribute names
+        of mapped columns, and the serializer turning a record to dict
+        """
+        columns = list(cls.__mapper__.columns.keys())
+        state_getter, getter = itemgetter(*columns), attrgetter(*columns)
+        if len(columns) == 1:
+            columns_of = lambda value: {columns[0]: value}  # noqa: E731
+        else:
+            columns_of = lambda values: dict(zip(columns, values))  # noqa: E731
+
+        def serializer(record):
+            # Loaded values are read from instance dict directly, and the
+            # instrumented attributes are only used to load expired or deferred ones
+            try:
+                return columns_of(state_getter(record.__dict__))
+            except KeyError:
+                return columns_of(getter(record))
+
+        setattr(cls, "_table_columns", columns)
+        setattr(cls, "_serializer", serializer)
 
     @classmethod
     def columns(cls):
-        if hasattr(cls, "_table_columns"):
-            return getattr(cls, "_table_columns")
-        _table_columns = []
-        for attr in dir(cls):
-            if isinstance(getattr(cls, attr), QueryableAttribute):
-                _table_columns.append(attr)
-        setattr(cls, "_table_columns", _table_columns)
-        return _table_columns
+        if "_table_columns" not in cls.__dict__:
+            cls.setup_columns()
+        return getattr(cls, "_table_columns")
+
+    @classmethod
+    def serializer(cls):
+        if "_serializer" not in cls.__dict__:
+            cls.setup_columns()
+        return getattr(cls, "_serializer")
+
+    @classmethod
+    def _check_row(cls, record, columns):
+        if not isinstance(record, (list, tuple)) or not isinstance(columns, (list, tuple)):
+            raise ValueError(
+                "{}.record_to_dict: record or columns type error".format(cls.__name__)
+            )
+        if len(record) != len(columns):
+            raise ValueError(
+                "{}.record_to_dict: the length of record and columns is not equal".format(cls.__name__)
+            )
 
     @classmethod
     def record_to_dict(cls, record, columns=None):
         if record:
             if isinstance(record, cls):
                 return record.to_dict()
-            if not isinstance(record, (list, tuple)) or not isinstance(columns, (list, tuple)):
-                raise ValueError(
-                    "{}.record_to_dict: record or columns type error".format(cls.__name__)
-                )
-            if len(record) != len(columns):
-                raise ValueError(
-                    "{}.record_to_dict: the length of record and columns is not equal".format(cls.__name__)
-                )
-            _record = {}
-            for i in range(0, len(record)):
-                _record[columns[i]] = record[i]
-            return _record
+            cls._check_row(record, columns)
+            return dict(zip(columns, record))
         return {}
 
     @classmethod
     def records_to_list(cls, records, columns=None):
-        _records = []
-        for record in records:
-            _records.append(cls.record_to_dict(record, columns=columns))
-        return _records
+        if not isinstance(records, (list, tuple)):
+            records = list(records)
+        # Falsy records turn to empty dicts like `record_to_dict`
+        first = next((record for record in records if record), None)
+        if first is None:
+            return [{} for _ in records]
+        if isinstance(first, cls):
+            serializer = cls.serializer()
+            return [
+                serializer(record) if type(record) is cls else cls.record_to_dict(record)
+                for record in records
+            ]
+        # Rows of one result share the same shape, so only the first one is checked
+        cls._check_row(first, columns)
+        return [dict(zip(columns, record)) if record else {} for record in records]
+
+    @staticmethod
+    def make_expand_tree(expand):
+        """
+        Make tree of relationship paths, e.g. ["a.b", "c"] to {"a": {"b": {}}, "c": {}}
+
+        :param expand: relationship path list
+        :type expand: list
+        :rtype: dict
+        """
+        tree = {}
+        for path in expand or []:
+            node = tree
+            for name in path.split("."):
+                node = node.setdefault(name, {})
+        return tree
+
+    @classmethod
+    def check_expand(cls, expand):
+        """
+        Check relationship paths to be expanded
+
+        :param expand: relationship path list
+        :type expand: list
+        """
+        for path in expand or []:
+            model = cls
+            for name in path.split("."):
+                relationships = model.__mapper__.relationships
+                if name not in relationships:
+                    raise ValueError("{} is not a relationship of {}".format(name, model.__name__))
+                model = relationships[name].mapper.class_
+
+    @classmethod
+    def make_loader_options(cls, expand):
+        """
+        Make loader options eagerly loading relationships to be expanded, a
+        collection is loaded by `selectinload`, and a scalar by `joinedload`,
+        so the number of statements is fixed however many records are loaded
+
+        :param expand: relationship path list
+        :type expand: list
+        :rtype: list
+        """
+        return cls._loader_options(cls.make_expand_tree(expand))
+
+    @classmethod
+    def _loader_options(cls, tree, parent=None):
+        options = []
+        for name, subtree in tree.items():
+            relationship = cls.__mapper__.relationships[name]
+            loader = "selectinload" if relationship.uselist else "joinedload"
+            if parent is None:
+                option = (selectinload if relationship.uselist else joinedload)(getattr(cls, name))
+            else:
+                option = getattr(parent, loader)(getattr(cls, name))
+            # Each leaf gets a full path from the root, which loads every relationship on it
+            options.extend(relationship.mapper.class_._loader_options(subtree, option) or [option])
+        return options
+
+    @classmethod
+    def expanded_to_dict(cls, record, tree, columns=None):
+        """
+        Turn record to dict with relationships nested in it
+
+        :param record: record object
+        :param tree: tree of relationship paths
+        :type tree: dict
+        :param columns: column list, all columns if not specified
+        :type columns: list
+        :rtype: dict
+        """
+        if record is None:
+            return None
+        data = record.to_dict()
+        if columns:
+            data = dict((column, data[column]) for column in columns if column in data)
+        for name, subtree in tree.items():
+            related = cls.__mapper__.relationships[name].mapper.class_
+            value = getattr(record, name)
+            if cls.__mapper__.relationships[name].uselist:
+                data[name] = [related.expanded_to_dict(item, subtree) for item in value or []]
+            else:
+                data[name] = related.expanded_to_dict(value, subtree)
+        return data
+
+    @classmethod
+    def expanded_to_list(cls, records, expand, columns=None):
+        tree = cls.make_expand_tree(expand)
+        return [cls.expanded_to_dict(record, tree, columns=columns) for record in records]
+
+    @classmethod
+    def make_plan(cls, columns=None, filters=None, orders=None):
+        """
+        Make a cached query plan, see `restful_falcon.core.db.plan.QueryPlanCache`
+
+        :param columns: column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :param orders: order list
+        :type orders: collections.Iterable
+        :return: query plan, or None if the plan cache is disabled or the query cannot be planned
+        :rtype: restful_falcon.core.db.plan.QueryPlan
+        """
+        if cls.plan_cache is None:
+            return None
+        return cls.plan_cache.plan(cls, columns=columns, filters=filters, orders=orders)
 
     @classmethod
     def make_query(cls, session, columns=None):
@@ -182,14 +426,30 @@ class BaseModel(object):
             2) simple_filter: ("like", ("name", "test")), ("ge", ("age", 18));
             3) composite_filter: ("and", (("like", ("name", "test")), ("age", 18))).
         """
+        filter = cls.make_filter_clause(filter)
+        return query.filter(filter) if filter is not None else query
+
+    # noinspection PyShadowingBuiltins
+    @classmethod
+    def make_filter_clause(cls, filter):
+        """
+        Make filter clause, see `add_filter` for filter definition
+
+        :param filter: filter object
+        :type filter: tuple, sqlalchemy.sql.operators.ColumnOperators
+        :return: filter clause, or None if filter is invalid
+        :rtype: sqlalchemy.sql.operators.ColumnOperators
+        :raise FilterValueError: if any value does not match the type of column
+        """
         try:
-            filter = make_filter(cls, filter)
-            query = query.filter(filter)
+            return make_filter(cls, filter)
+        except FilterValueError:
+            # Ignoring the filter would widen the result, so the value is rejected
+            raise
         except Exception as e:
             logger.warning(str(e))
             logger.warning(traceback.format_exc())
-        finally:
-            return query
+            return None
 
     @classmethod
     def add_filters(cls, query, filters):
@@ -213,6 +473,11 @@ class BaseModel(object):
 
     @classmethod
     def add_order(cls, query, order):
+        order = cls.make_order_clause(order)
+        return query.order_by(order) if order is not None else query
+
+    @classmethod
+    def make_order_clause(cls, order):
         def check():
             try:
                 if not isinstance(order, tuple) or len(order) != 2:
@@ -230,8 +495,8 @@ class BaseModel(object):
 
         if check():
             field = getattr(cls, order[0])
-            query = query.order_by(getattr(field, order[1])())
-        return query
+            return getattr(field, order[1])()
+        return None
 
     @classmethod
     def add_orders(cls, query, orders):
@@ -267,22 +532,62 @@ class BaseModel(object):
             return query
 
     @classmethod
-    def perform_list(cls, session=None, columns=None, filters=None, orders=None, limit=None, offset=None):
+    def count_records(cls, session, query, count_strategy=COUNT_EXACT):
+        """
+        Count records of query
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param query: query object without limit and offset
+        :type query: sqlalchemy.orm.Query
+        :param count_strategy: count strategy, `window` is treated as `exact`
+        :type count_strategy: str
+        :return: number of records, or None if count strategy is `none`
+        :rtype: int
+        """
+        if count_strategy == COUNT_NONE:
+            return None
+        if count_strategy == COUNT_ESTIMATE:
+            count = estimate_count(session, query)
+            if count is not None:
+                return count
+        return query.count()
+
+    @classmethod
+    def perform_list(cls, session=None, columns=None, filters=None, orders=None, limit=None, offset=None,
+                     count_strategy=COUNT_EXACT, read_path=READ_PATH_ORM, expand=None):
         return cls._perform_list(
-            session=session, columns=columns, filters=filters, orders=orders, limit=limit, offset=offset
+            session=session, columns=columns, filters=filters, orders=orders, limit=limit, offset=offset,
+            count_strategy=count_strategy, read_path=read_path, expand=expand
         )
 
     @classmethod
     @process_if_no_session()
-    def _perform_list(cls, session=None, columns=None, filters=None, orders=None, limit=None, offset=None):
+    def _perform_list(cls, session=None, columns=None, filters=None, orders=None, limit=None, offset=None,
+                      count_strategy=COUNT_EXACT, read_path=READ_PATH_ORM, expand=None):
+        if expand:
+            # Relationships are only loaded by ORM
+            count, records = cls.list(
+                session, filters=filters, orders=orders, limit=limit, offset=offset,
+                count_strategy=count_strategy, expand=expand
+            )
+            return count, cls.expanded_to_list(records, expand, columns=columns)
+        if read_path == READ_PATH_CORE:
+            return cls.core_list(
+                session, columns=columns, filters=filters,
+                orders=orders, limit=limit, offset=offset,
+                count_strategy=count_strategy
+            )
         count, records = cls.list(
             session, columns=columns, filters=filters,
             orders=orders, limit=limit, offset=offset,
+            count_strategy=count_strategy
         )
         return count, cls.records_to_list(records, columns=columns)
 
     @classmethod
-    def list(cls, session, columns=None, filters=None, orders=None, limit=None, offset=None):
+    def list(cls, session, columns=None, filters=None, orders=None, limit=None, offset=None,
+             count_strategy=COUNT_EXACT, expand=None):
         """
         List operate
 
@@ -298,190 +603,1613 @@ class BaseModel(object):
         :type limit: int
         :param offset: offset number
         :type offset: int
+        :param count_strategy: count strategy in [exact, window, estimate, none]
+        :type count_strategy: str
+        :param expand: relationship paths to be loaded eagerly, records are
+            model instances if specified
+        :type expand: list
         :return: number of records and records
         :rtype: tuple
         """
+        # Estimated count explains the query, which needs a plain query object
+        plan = cls.make_plan(columns=columns, filters=filters, orders=orders) \
+            if count_strategy != COUNT_ESTIMATE and not expand else None
+        if plan is not None:
+            return cls._list_by_plan(session, plan, columns=columns, limit=limit, offset=offset,
+                                     count_strategy=count_strategy)
+        if expand:
+            columns = None
         query = cls.make_query(session, columns=columns)
         query = cls.add_filters(query, filters)
         query = cls.add_orders(query, orders)
-        count = query.count()
+        if expand:
+            query = query.options(*cls.make_loader_options(expand))
+        if count_strategy == COUNT_WINDOW:
+            return cls._list_with_window_count(query, columns=columns, limit=limit, offset=offset)
+        count = cls.count_records(session, query, count_strategy=count_strategy)
         query = cls.add_limit(query, limit)
         query = cls.add_offset(query, offset)
         return count, query.all()
 
     @classmethod
-    def perform_create(cls, data, session=None):
-        return cls._perform_create(data, session=session)
+    def _list_by_plan(cls, session, plan, columns=None, limit=None, offset=None, count_strategy=COUNT_EXACT):
+        if count_strategy == COUNT_WINDOW:
+            rows = plan.with_window_count().with_limit(limit).with_offset(offset).all(session)
+            if not rows:
+                return plan.count(session) if offset else 0, []
+            return cls._split_window_count(rows, columns=columns)
+        count = None if count_strategy == COUNT_NONE else plan.count(session)
+        return count, plan.with_limit(limit).with_offset(offset).all(session)
 
     @classmethod
-    @process_if_no_session(autocommit=True)
-    def _perform_create(cls, data, session=None):
-        record = cls.create(session, data)
-        return cls.record_to_dict(record)
+    def _list_with_window_count(cls, query, columns=None, limit=None, offset=None):
+        """
+        Fetch the page and the total number in a single round trip by
+        appending a `count(*) OVER ()` column to the page query
+        """
+        _query = query.add_columns(func.count().over().label(WINDOW_COUNT_LABEL))
+        _query = cls.add_limit(_query, limit)
+        _query = cls.add_offset(_query, offset)
+        rows = _query.all()
+        if not rows:
+            # The window column is absent on an empty page, which is only
+            # ambiguous when the page starts beyond the first record.
+            return query.count() if offset else 0, []
+        return cls._split_window_count(rows, columns=columns)
 
     @classmethod
-    def create(cls, session, data):
+    def _split_window_count(cls, rows, columns=None):
+        if columns:
+            records = [tuple(row[:-1]) for row in rows]
+        else:
+            records = [row[0] for row in rows]
+        return rows[0][-1], records
+
+    @classmethod
+    def select_columns(cls, columns=None):
         """
-        Create operate
+        Get valid columns to be selected, all columns if not specified
 
-        :param session: session object
-        :type session: restful_falcon.core.db.engine.Session
-        :param data: record data
-        :type data: dict
-        :return: the created record
+        :param columns: column list
+        :type columns: list
+        :rtype: list
         """
-        # noinspection PyArgumentList
-        record = cls(**data)
-        session.add(record)
-        session.flush()
-        return record
+        if not columns:
+            return cls.columns()
+        return [column for column in columns if column in cls.__mapper__.columns]
 
     @classmethod
-    def perform_show_by(cls, filters, session=None):
-        return cls._perform_show_by(filters, session=session)
+    def make_select(cls, columns, filters=None):
+        """
+        Make Core select statement on table of model, filters are the same as
+        `add_filter`, and invalid filters are ignored in the same way
 
-    @classmethod
-    @process_if_no_session()
-    def _perform_show_by(cls, filters, session=None):
-        record = cls.show_by(session, filters)
-        return cls.record_to_dict(record)
+        :param columns: valid column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :return: select statement
+        :rtype: sqlalchemy.sql.expression.Select
+        """
+        statement = select([cls.__mapper__.columns[column] for column in columns]).select_from(cls.__table__)
+        if not filters or not isinstance(filters, list):
+            logger.debug("Add filters ({}) failed, ignore".format(str(filters)))
+            return statement
+        clauses = [cls.make_filter_clause(_filter) for _filter in filters]
+        clauses = [clause for clause in clauses if clause is not None]
+        return statement.where(and_(*clauses)) if clauses else statement
 
     @classmethod
-    def show_by(cls, session, filters):
-        query = cls.make_query(session)
-        query = cls.add_filters(query, filters)
-        return query.first()
+    def make_select_plan(cls, columns, filters=None):
+        """
+        Make a select plan, which is cached by the plan cache if possible
 
-    @classmethod
-    def perform_show(cls, rid, filters=None, session=None):
-        return cls._perform_show(rid, filters=filters, session=session)
+        :param columns: valid column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :rtype: restful_falcon.core.db.plan.SelectPlan
+        """
+        plan = cls.plan_cache.select(cls, columns, filters=filters) if cls.plan_cache is not None else None
+        return plan if plan is not None else SelectPlan.uncached(cls, columns, filters=filters)
 
     @classmethod
-    @process_if_no_session()
-    def _perform_show(cls, rid, filters=None, session=None):
-        record = cls.show(session, rid, filters=filters)
-        return cls.record_to_dict(record)
+    def core_list(cls, session, columns=None, filters=None, orders=None, limit=None, offset=None,
+                  count_strategy=COUNT_EXACT):
+        """
+        List operate by Core select statement, result rows are mapped to dict
+        directly without building ORM instances
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param columns: column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :param orders: order list
+        :type orders: collections.Iterable
+        :param limit: limit number
+        :type limit: int
+        :param offset: offset number
+        :type offset: int
+        :param count_strategy: count strategy in [exact, window, estimate, none]
+        :type count_strategy: str
+        :return: number of records and records
+        :rtype: tuple
+        """
+        columns = cls.select_columns(columns)
+        plan = cls.make_select_plan(columns, filters=filters)
+        count = None
+        if count_strategy == COUNT_ESTIMATE:
+            count = estimate_count(session, plan.statement(), params=plan.params)
+        if count is None and count_strategy in (COUNT_EXACT, COUNT_ESTIMATE):
+            count = plan.with_count().execute(session).scalar()
+        page = plan.with_window_count() if count_strategy == COUNT_WINDOW else plan
+        page = page.with_orders(cls, orders).with_limit(limit).with_offset(offset)
+        rows = page.execute(session).fetchall()
+        if count_strategy == COUNT_WINDOW:
+            if rows:
+                count = rows[0][-1]
+            else:
+                count = plan.with_count().execute(session).scalar() if offset else 0
+        # The window count column is beyond columns, so it is dropped by zip
+        return count, [dict(zip(columns, row)) for row in rows]
 
     @classmethod
-    def show(cls, session, rid, filters=None):
+    def core_show_by(cls, session, filters, columns=None):
         """
-        Show operate
+        Show operate by Core select statement
 
         :param session: session object
         :type session: restful_falcon.core.db.engine.Session
-        :param rid: id value
         :param filters: filter list
         :type filters: list
+        :param columns: column list
+        :type columns: list
         :return: the current record
+        :rtype: dict
         """
-        filters = copy.deepcopy(filters) if filters else []
-        filters.insert(0, (cls.id_field, rid))
-        return cls.show_by(session, filters)
+        columns = cls.select_columns(columns)
+        row = cls.make_select_plan(columns, filters=filters).with_limit(1).execute(session).first()
+        return dict(zip(columns, row)) if row else {}
 
     @classmethod
-    def perform_update_by(cls, filters, data, session=None):
-        return cls._perform_update_by(filters, data, session=session)
-
-    @classmethod
-    @process_if_no_session(autocommit=True)
-    def _perform_update_by(cls, filters, data, session=None):
-        records = cls.update_by(session, filters, data)
-        return cls.records_to_list(records)
-
-    @classmethod
-    def update_by(cls, session, filters, data):
-        if not filters:
-            return []
-        query = cls.make_query(session)
-        query = cls.add_filters(query, filters)
-        query.update(data)
-        session.flush()
-        return query.all()
-
-    @classmethod
-    def perform_update(cls, rid, data, filters=None, session=None):
-        return cls._perform_update(rid, data, filters=filters, session=session)
+    def perform_list_stream(cls, columns=None, filters=None, orders=None, limit=None, offset=None,
+                            batch_size=DEFAULT_STREAM_BATCH_SIZE):
+        """
+        Iterate records of list operate batch by batch. Records are consumed
+        after the request scope ends, so they are read by a session owned by
+        the iterator, which is closed once iteration ends or the iterator is
+        closed.
 
-    @classmethod
-    @process_if_no_session(autocommit=True)
-    def _perform_update(cls, rid, data, filters=None, session=None):
-        record = cls.update(session, rid, data, filters=filters)
-        return cls.record_to_dict(record)
+        :param columns: column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :param orders: order list
+        :type orders: collections.Iterable
+        :param limit: limit number
+        :type limit: int
+        :param offset: offset number
+        :type offset: int
+        :param batch_size: number of rows fetched each time
+        :type batch_size: int
+        :return: iterator of records
+        :rtype: collections.Iterator
+        """
+        session = Session()
+        session.use_replica = True
+        try:
+            for record in cls.stream_list(
+                session, columns=columns, filters=filters,
+                orders=orders, limit=limit, offset=offset, batch_size=batch_size
+            ):
+                yield record
+        finally:
+            session.close()
 
     @classmethod
-    def update(cls, session, rid, data, filters=None):
+    def stream_list(cls, session, columns=None, filters=None, orders=None, limit=None, offset=None,
+                    batch_size=DEFAULT_STREAM_BATCH_SIZE):
         """
-        Update operate
+        List operate by Core select statement with server side cursor where
+        the driver supports it, only a batch of rows is held in memory
 
         :param session: session object
         :type session: restful_falcon.core.db.engine.Session
-        :param rid: id value
-        :param data: update data
-        :type data: dict
+        :param columns: column list
+        :type columns: list
         :param filters: filter list
-        :type filters: list
-        :return: the updated record
+        :type filters: collections.Iterable
+        :param orders: order list
+        :type orders: collections.Iterable
+        :param limit: limit number
+        :type limit: int
+        :param offset: offset number
+        :type offset: int
+        :param batch_size: number of rows fetched each time
+        :type batch_size: int
+        :return: iterator of records
+        :rtype: collections.Iterator
         """
-        filters = copy.deepcopy(filters) if filters else []
-        filters.insert(0, (cls.id_field, rid))
-        records = cls.update_by(session, filters, data)
-        return records[0] if records else {}
+        columns = cls.select_columns(columns)
+        plan = cls.make_select_plan(columns, filters=filters)
+        plan = plan.with_orders(cls, orders).with_limit(limit).with_offset(offset)
+        result = plan.execute(session, stream_results=True)
+        try:
+            while True:
+                rows = result.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            result.close()
 
     @classmethod
-    def perform_delete_by(cls, filters, session=None):
-        return cls._perform_delete_by(filters, session=session)
+    def primary_key_fields(cls):
+        """
+        Get fields of primary key columns of table
 
-    @classmethod
-    @process_if_no_session(autocommit=True)
-    def _perform_delete_by(cls, filters, session=None):
-        records = cls.delete_by(session, filters)
-        return cls.records_to_list(records)
+        :rtype: list
+        :raise ValueError: if the table has no primary key
+        """
+        mapper = cls.__mapper__
+        fields = [mapper.get_property_by_column(column).key for column in cls.__table__.primary_key.columns]
+        if not fields:
+            raise ValueError("Table {} of {} has no primary key".format(cls.__table__.name, cls.__name__))
+        return fields
 
     @classmethod
-    def delete_by(cls, session, filters):
-        if not filters:
-            return []
-        query = cls.make_query(session)
-        query = cls.add_filters(query, filters)
-        records = query.all()
-        query.delete()
-        return records
+    def perform_export(cls, columns=None, filters=None, batch_size=DEFAULT_STREAM_BATCH_SIZE):
+        """
+        Iterate all records matching filters in order of primary key, records
+        are read by a session owned by the iterator like `perform_list_stream`.
+        Models without primary key are rejected before any record is read.
 
-    @classmethod
-    def perform_delete(cls, rid, filters=None, session=None):
-        return cls._perform_delete(rid, filters=filters, session=session)
+        :param columns: column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :param batch_size: number of rows read by each keyset query
+        :type batch_size: int
+        :return: iterator of records
+        :rtype: collections.Iterator
+        :raise ValueError: if the table has no primary key
+        """
+        cls.primary_key_fields()
+        return cls._perform_export(columns=columns, filters=filters, batch_size=batch_size)
 
     @classmethod
-    @process_if_no_session(autocommit=True)
-    def _perform_delete(cls, rid, filters=None, session=None):
-        record = cls.delete(session, rid, filters=filters)
-        return cls.record_to_dict(record)
+    def _perform_export(cls, columns=None, filters=None, batch_size=DEFAULT_STREAM_BATCH_SIZE):
+        session = Session()
+        session.use_replica = True
+        try:
+            for record in cls.export(session, columns=columns, filters=filters, batch_size=batch_size):
+                yield record
+        finally:
+            session.close()
 
     @classmethod
-    def delete(cls, session, rid, filters=None):
+    def export(cls, session, columns=None, filters=None, batch_size=DEFAULT_STREAM_BATCH_SIZE):
         """
-        Delete operate
+        Export operate, records are read in batches located by keyset of
+        primary key, so each row is read exactly once without offset scanning
 
         :param session: session object
         :type session: restful_falcon.core.db.engine.Session
-        :param rid: id value
+        :param columns: column list
+        :type columns: list
         :param filters: filter list
-        :type filters: list
-        :return: the deleted record
+        :type filters: collections.Iterable
+        :param batch_size: number of rows read by each keyset query
+        :type batch_size: int
+        :return: iterator of records
+        :rtype: collections.Iterator
+        :raise ValueError: if the table has no primary key
         """
-        filters = copy.deepcopy(filters) if filters else []
-        filters.insert(0, (cls.id_field, rid))
-        records = cls.delete_by(session, filters)
-        return records[0] if records else {}
+        keys = cls.primary_key_fields()
+        columns = cls.select_columns(columns)
+        # Primary key fields are selected as the last columns if not requested, and dropped by zip
+        _columns = columns + [key for key in keys if key not in columns]
+        indexes = [_columns.index(key) for key in keys]
+        plan = cls.make_select_plan(_columns, filters=filters)
+        plan = plan.with_orders(cls, [(key, "asc") for key in keys]).with_limit(batch_size)
+        last = None
+        while True:
+            page = plan if last is None else plan.with_after(cls, keys, last)
+            rows = page.execute(session).fetchall()
+            for row in rows:
+                yield dict(zip(columns, row))
+            if len(rows) < batch_size:
+                break
+            last = [rows[-1][index] for index in indexes]
 
     @classmethod
-    @process_if_no_session()
-    def exist(cls, filters, session=None):
+    def keyset_orders(cls, orders=None):
+        """
+        Make orders for keyset pagination, the id field is always appended
+        as the last order to make the position of each record unique
+
+        :param orders: order list
+        :type orders: collections.Iterable
+        :return: normalized order list
+        :rtype: list
+        """
+        _orders = []
+        for order in orders or []:
+            if not isinstance(order, tuple) or len(order) != 2 or not hasattr(cls, order[0]):
+                logger.debug("Ignore keyset order ({})".format(str(order)))
+                continue
+            if order[1].lower() not in ("desc", "asc"):
+                logger.debug("Ignore keyset order ({})".format(str(order)))
+                continue
+            _orders.append((order[0], order[1].lower()))
+        if all(order[0] != cls.id_field for order in _orders):
+            _orders.append((cls.id_field, _orders[-1][1] if _orders else "asc"))
+        return _orders
+
+    @classmethod
+    def keyset_values(cls, orders, values):
+        """
+        Check and coerce keyset values decoded from a cursor
+
+        :param orders: keyset order list
+        :type orders: list
+        :param values: keyset values
+        :type values: list
+        :return: coerced keyset values
+        :rtype: list
+        """
+        if not isinstance(values, (list, tuple)) or len(values) != len(orders):
+            raise ValueError("cursor does not match orders {}".format(str(orders)))
+        _values = []
+        for order, value in zip(orders, values):
+            try:
+                _values.append(coerce_value(getattr(cls, order[0]).type, value))
+            except (TypeError, ValueError):
+                raise ValueError("cursor value {} does not match field {}".format(value, order[0]))
+        return _values
+
+    @staticmethod
+    def _keyset_beyond(field, value, greater, nulls_high):
+        # NULL sorts after all values if nulls are high, or before them otherwise
+        if value is None:
+            return field.isnot(None) if greater != nulls_high else None
+        if greater:
+            return or_(field > value, field.is_(None)) if nulls_high else field > value
+        return field < value if nulls_high else or_(field < value, field.is_(None))
+
+    @classmethod
+    def add_keyset(cls, query, orders, values, reverse=False, nulls_high=False):
+        """
+        Add keyset filter to query, which locates the records after (or before
+        if reverse) the given position without scanning the preceding rows.
+        NULL values are placed as the dialect orders them.
+
+        :param query: query object
+        :type query: sqlalchemy.orm.Query
+        :param orders: keyset order list
+        :type orders: list
+        :param values: keyset values
+        :type values: list
+        :param reverse: whether to locate the records before the position
+        :type reverse: bool
+        :param nulls_high: whether the dialect orders NULL after all values ascending
+        :type nulls_high: bool
+        :return: query object
+        :rtype: sqlalchemy.orm.Query
+        """
+        filters = []
+        for i in range(0, len(orders)):
+            field = getattr(cls, orders[i][0])
+            _filter = cls._keyset_beyond(field, values[i], (orders[i][1] == "asc") != reverse, nulls_high)
+            if _filter is None:
+                # Nothing is beyond NULL in this direction
+                continue
+            _filters = [
+                getattr(cls, orders[j][0]).is_(None) if values[j] is None else getattr(cls, orders[j][0]) == values[j]
+                for j in range(0, i)
+            ]
+            _filters.append(_filter)
+            filters.append(make_and_filter(_filters))
+        return query.filter(make_or_filter(filters) if filters else false())
+
+    @classmethod
+    def make_cursor(cls, record, orders):
+        """
+        Make cursor from a record
+
+        :param record: record dict
+        :type record: dict
+        :param orders: keyset order list
+        :type orders: list
+        :return: cursor string, or None if record lacks any order field
+        :rtype: str
+        """
+        if not record or any(order[0] not in record for order in orders):
+            return None
+        return encode_cursor([record[order[0]] for order in orders])
+
+    @classmethod
+    def perform_list_by_cursor(cls, session=None, columns=None, filters=None, orders=None, limit=None,
+                               after=None, before=None, count_strategy=COUNT_NONE, expand=None):
+        return cls._perform_list_by_cursor(
+            session=session, columns=columns, filters=filters, orders=orders,
+            limit=limit, after=after, before=before, count_strategy=count_strategy, expand=expand
+        )
+
+    @classmethod
+    @process_if_no_session()
+    def _perform_list_by_cursor(cls, session=None, columns=None, filters=None, orders=None, limit=None,
+                                after=None, before=None, count_strategy=COUNT_NONE, expand=None):
+        if expand:
+            count, records, cursors = cls.list_by_cursor(
+                session, filters=filters, orders=orders, limit=limit,
+                after=after, before=before, count_strategy=count_strategy, expand=expand
+            )
+            return count, cls.expanded_to_list(records, expand, columns=columns), cursors
+        count, records, cursors = cls.list_by_cursor(
+            session, columns=columns, filters=filters, orders=orders,
+            limit=limit, after=after, before=before, count_strategy=count_strategy
+        )
+        return count, cls.records_to_list(records, columns=columns), cursors
+
+    @classmethod
+    def list_by_cursor(cls, session, columns=None, filters=None, orders=None, limit=None, after=None, before=None,
+                       count_strategy=COUNT_NONE, expand=None):
+        """
+        List operate with keyset pagination
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param columns: column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: collections.Iterable
+        :param orders: order list
+        :type orders: collections.Iterable
+        :param limit: limit number
+        :type limit: int
+        :param after: keyset values of the position to list after, empty to list the first page
+        :type after: list
+        :param before: keyset values of the position to list before, empty to list the last page
+        :type before: list
+        :param count_strategy: count strategy, `window` is treated as `exact`, pages are not counted by default
+        :type count_strategy: str
+        :param expand: relationship paths to be loaded eagerly, records are
+            model instances if specified
+        :type expand: list
+        :return: number of records, records and cursors for next and previous pages
+        :rtype: tuple
+        """
+        if expand:
+            columns = None
+        orders = cls.keyset_orders(orders)
+        reverse = after is None and before is not None
+        values = before if reverse else after
+        query_columns = columns
+        if columns:
+            # Order fields are required to make cursors even if not selected
+            query_columns = list(columns) + [order[0] for order in orders if order[0] not in columns]
+        query = cls.make_query(session, columns=query_columns)
+        query = cls.add_filters(query, filters)
+        count = cls.count_records(session, query, count_strategy=count_strategy)
+        if values:
+            nulls_high = session.get_bind().dialect.name in NULLS_HIGH_DIALECTS
+            query = cls.add_keyset(
+                query, orders, cls.keyset_values(orders, values), reverse=reverse, nulls_high=nulls_high
+            )
+        if reverse:
+            query = cls.add_orders(query, [(order[0], "asc" if order[1] == "desc" else "desc") for order in orders])
+        else:
+            query = cls.add_orders(query, orders)
+        if limit is not None:
+            limit = int(limit)
+            query = cls.add_limit(query, limit + 1)
+        if expand:
+            query = query.options(*cls.make_loader_options(expand))
+        records = query.all()
+        has_more = limit is not None and len(records) > limit
+        if has_more:
+            records = records[:limit]
+        if reverse:
+            records.reverse()
+        cursors = {"next": None, "prev": None}
+        if records:
+            first = cls.record_to_dict(records[0], columns=query_columns)
+            last = cls.record_to_dict(records[-1], columns=query_columns)
+            # Nothing is beyond the start of a walk
+            if reverse:
+                cursors["prev"] = cls.make_cursor(first, orders) if has_more else None
+                cursors["next"] = cls.make_cursor(last, orders) if values else None
+            else:
+                cursors["prev"] = cls.make_cursor(first, orders) if values else None
+                cursors["next"] = cls.make_cursor(last, orders) if has_more else None
+        if columns and len(query_columns) > len(columns):
+            records = [tuple(record[:len(columns)]) for record in records]
+        return count, records, cursors
+
+    @classmethod
+    def perform_create(cls, data, session=None):
+        return cls._perform_create(data, session=session)
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_create(cls, data, session=None):
+        record = cls.create(session, data)
+        return cls.record_to_dict(record)
+
+    @classmethod
+    def create(cls, session, data):
+        """
+        Create operate
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param data: record data
+        :type data: dict
+        :return: the created record
+        """
+        # noinspection PyArgumentList
+        record = cls(**data)
+        session.add(record)
+        session.flush()
+        return record
+
+    @classmethod
+    def fill_defaults(cls, data):
+        """
+        Fill python side column defaults into record data, so that records
+        inserted by executemany get the same values as ORM created ones
+
+        :param data: record data
+        :type data: dict
+        :return: record data with defaults
+        :rtype: dict
+        """
+        _data = dict(data)
+        for column in cls.__table__.columns:
+            if column.key in _data or column.default is None:
+                continue
+            try:
+                if column.default.is_scalar:
+                    _data[column.key] = column.default.arg
+                elif column.default.is_callable:
+                    _data[column.key] = column.default.arg(None)
+            except Exception as e:
+                logger.debug(str(e))
+                logger.debug(traceback.format_exc())
+        return _data
+
+    @classmethod
+    def perform_bulk_create(cls, data, batch_size=DEFAULT_BATCH_SIZE, session=None):
+        return cls._perform_bulk_create(data, batch_size=batch_size, session=session)
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_bulk_create(cls, data, batch_size=DEFAULT_BATCH_SIZE, session=None):
+        return cls.bulk_create(session, data, batch_size=batch_size)
+
+    @classmethod
+    def bulk_create(cls, session, data, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Bulk create operate. Each batch is inserted by executemany inside a
+        savepoint, a failed batch is retried row by row to locate the failed
+        records.
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param data: record data list
+        :type data: list
+        :param batch_size: number of records inserted per statement
+        :type batch_size: int
+        :return: result of each record, in the same order as data
+        :rtype: list
+        """
+        results = []
+        columns = set(column.key for column in cls.__table__.columns)
+        batch_size = max(int(batch_size), 1)
+        for start in range(0, len(data), batch_size):
+            batch = []
+            batch_results = []
+            for record in data[start:start + batch_size]:
+                unknown_fields = [field for field in record if field not in columns]
+                if unknown_fields:
+                    batch_results.append({
+                        "status": BULK_FAILED, "error": "Unknown fields: {}".format(str(unknown_fields))
+                    })
+                    continue
+                record = cls.fill_defaults(record)
+                batch.append(record)
+                batch_results.append({"status": BULK_CREATED, "data": record})
+            try:
+                cls._bulk_insert(session, batch)
+            except StatementError:
+                for result in batch_results:
+                    if result["status"] != BULK_CREATED:
+                        continue
+                    try:
+                        cls._bulk_insert(session, [result["data"]])
+                    except StatementError as e:
+                        result.pop("data")
+                        result.update({"status": BULK_FAILED, "error": str(getattr(e, "orig", None) or e)})
+            results.extend(batch_results)
+        return results
+
+    @classmethod
+    def _bulk_insert(cls, session, records):
+        if not records:
+            return
+        # executemany requires the same keys in each parameter set
+        groups = {}
+        for record in records:
+            groups.setdefault(tuple(sorted(record)), []).append(record)
+        with session.begin_nested():
+            for group in groups.values():
+                session.execute(cls.__table__.insert(), group)
+
+    @classmethod
+    def fill_onupdates(cls, data):
+        """
+        Fill python side column onupdate values into record data, which are
+        not applied to the update part of `INSERT ... ON CONFLICT`
+
+        :param data: record data
+        :type data: dict
+        :return: record data with onupdate values
+        :rtype: dict
+        """
+        _data = dict(data)
+        for column in cls.__table__.columns:
+            if column.key in _data or column.onupdate is None:
+                continue
+            try:
+                if column.onupdate.is_scalar:
+                    _data[column.key] = column.onupdate.arg
+                elif column.onupdate.is_callable:
+                    _data[column.key] = column.onupdate.arg(None)
+            except Exception as e:
+                logger.debug(str(e))
+                logger.debug(traceback.format_exc())
+        return _data
+
+    @classmethod
+    def conflict_columns(cls, columns=None):
+        """
+        Get columns identifying a record to be upserted, which should make up
+        the primary key or a unique constraint
+
+        :param columns: column list, primary key columns by default
+        :type columns: list
+        :rtype: list
+        """
+        if not columns:
+            return [column.key for column in cls.__table__.primary_key.columns]
+        for column in columns:
+            if column not in cls.__table__.columns:
+                raise ValueError("{} is not a column of {}".format(column, cls.__name__))
+        return list(columns)
+
+    @classmethod
+    def check_upsert_data(cls, data, conflict_columns):
+        """
+        Check record data to be upserted
+
+        :param data: record data
+        :type data: dict
+        :param conflict_columns: conflict column list
+        :type conflict_columns: list
+        """
+        unknown_fields = [field for field in data if field not in cls.__table__.columns]
+        if unknown_fields:
+            raise ValueError("Unknown fields: {}".format(str(unknown_fields)))
+        missing_fields = [column for column in conflict_columns if data.get(column) is None]
+        if missing_fields:
+            raise ValueError("Missing fields: {}".format(str(missing_fields)))
+
+    @classmethod
+    def make_filters_clause(cls, filters):
+        """
+        Make clause of filters ANDed, see `add_filter` for filter definition
+
+        :param filters: filter object list
+        :type filters: list
+        :return: filter clause, or None if there is no valid filter
+        :rtype: sqlalchemy.sql.operators.ColumnOperators
+        """
+        clauses = [cls.make_filter_clause(_filter) for _filter in filters or []]
+        clauses = [clause for clause in clauses if clause is not None]
+        return and_(*clauses) if clauses else None
+
+    @classmethod
+    def inaccessible_conflicts(cls, session, data, conflict_columns, filters):
+        """
+        Get values of conflict columns of existing records which conflict
+        with data but are filtered out by filters, e.g. records owned by
+        other users, which upserts should neither update nor insert
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param data: record data list
+        :type data: list
+        :param conflict_columns: conflict column list
+        :type conflict_columns: list
+        :param filters: filter list
+        :type filters: list
+        :rtype: set
+        """
+        clause = cls.make_filters_clause(filters)
+        if clause is None or not data:
+            return set()
+        columns = [cls.__table__.columns[column] for column in conflict_columns]
+        if len(columns) == 1:
+            conflict_clause = columns[0].in_(set(record[conflict_columns[0]] for record in data))
+        else:
+            conflict_clause = or_(*(
+                and_(*(column == record[column.key] for column in columns)) for record in data
+            ))
+        # Records whose filter columns are NULL match no filter, so they are inaccessible too
+        accessible = case([(clause, True)], else_=False)
+        rows = session.execute(select(columns + [accessible]).where(conflict_clause)).fetchall()
+        return set(tuple(row[:len(columns)]) for row in rows if not row[-1])
+
+    @classmethod
+    def split_create_data(cls, data, create_data=None):
+        """
+        Split record data to be upserted into the fields both inserted and
+        updated and the fields only inserted. Fields of create data, e.g. the
+        creator, are never taken from data.
+
+        :param data: record data
+        :type data: dict
+        :param create_data: data only inserted
+        :type create_data: dict
+        :return: fields both inserted and updated, and fields only inserted
+        :rtype: tuple
+        """
+        if not create_data:
+            return data, {}
+        return dict((field, value) for field, value in data.items() if field not in create_data), dict(create_data)
+
+    @classmethod
+    def perform_upsert(cls, data, conflict_columns=None, filters=None, create_data=None, session=None):
+        return cls._perform_upsert(
+            data, conflict_columns=conflict_columns, filters=filters, create_data=create_data, session=session
+        )
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_upsert(cls, data, conflict_columns=None, filters=None, create_data=None, session=None):
+        record = cls.upsert(
+            session, data, conflict_columns=conflict_columns, filters=filters, create_data=create_data
+        )
+        record = cls.record_to_dict(record, columns=cls.returning_columns())
+        cls.forget_cached(session, [record])
+        return record
+
+    @classmethod
+    def upsert(cls, session, data, conflict_columns=None, filters=None, create_data=None):
+        """
+        Upsert operate, which inserts a record, or updates the fields given
+        in data of the record conflicting on conflict columns. It issues
+        `INSERT ... ON CONFLICT DO UPDATE` on dialects supporting it, and
+        selects the record and then inserts or updates it on others.
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param data: record data
+        :type data: dict
+        :param conflict_columns: conflict column list, primary key columns by default
+        :type conflict_columns: list
+        :param filters: filter list, the conflicting record is only updated if it matches them
+        :type filters: list
+        :param create_data: data only inserted, e.g. the creator, which overrides data
+        :type create_data: dict
+        :return: the upserted record
+        :raise UpsertConflictError: if the conflicting record does not match filters
+        """
+        conflict_columns = cls.conflict_columns(conflict_columns)
+        cls.check_upsert_data(data, conflict_columns)
+        data, create_data = cls.split_create_data(data, create_data)
+        data = cls.fill_onupdates(data)
+        insert = UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            return cls._select_upsert(session, data, conflict_columns, filters=filters, create_data=create_data)
+        statement = cls._upsert_statement(insert, data, conflict_columns, filters=filters).values(
+            **cls.fill_defaults(dict(data, **create_data))
+        )
+        if cls.supports_returning(session):
+            row = session.execute(statement.returning(*cls.__table__.columns)).first()
+            record = tuple(row) if row is not None else None
+        else:
+            session.execute(statement)
+            # Records updated by Core statement may be stale in the identity map
+            query = cls.add_filters(cls._conflict_query(session, data, conflict_columns), filters)
+            record = query.populate_existing().first()
+        if record is None:
+            # Neither inserted nor updated, since the conflicting record does not match filters
+            raise UpsertConflictError(conflict_columns)
+        return record
+
+    @classmethod
+    def _upsert_statement(cls, insert, data, conflict_columns, filters=None):
+        statement = insert(cls.__table__)
+        fields = [field for field in data if field not in conflict_columns] or conflict_columns[:1]
+        return statement.on_conflict_do_update(
+            index_elements=[cls.__table__.columns[column] for column in conflict_columns],
+            set_={field: statement.excluded[field] for field in fields},
+            where=cls.make_filters_clause(filters)
+        )
+
+    @classmethod
+    def _conflict_query(cls, session, data, conflict_columns):
+        return cls.make_query(session).filter(
+            and_(*(cls.__table__.columns[column] == data[column] for column in conflict_columns))
+        )
+
+    @classmethod
+    def _select_upsert(cls, session, data, conflict_columns, filters=None, create_data=None):
+        for _ in range(2):
+            query = cls.add_filters(cls._conflict_query(session, data, conflict_columns), filters)
+            record = query.with_for_update().first()
+            if record is not None:
+                for field, value in data.items():
+                    if field not in conflict_columns:
+                        setattr(record, field, value)
+                session.flush()
+                return record
+            if filters and cls.inaccessible_conflicts(session, [data], conflict_columns, filters):
+                raise UpsertConflictError(conflict_columns)
+            try:
+                with session.begin_nested():
+                    # noinspection PyArgumentList
+                    record = cls(**dict(data, **(create_data or {})))
+                    session.add(record)
+                return record
+            except IntegrityError:
+                # The record is inserted concurrently, so it is updated instead
+                continue
+        raise ValueError("Upsert of {} failed on conflict columns {}".format(cls.__name__, str(conflict_columns)))
+
+    @classmethod
+    def perform_bulk_upsert(cls, data, conflict_columns=None, filters=None, create_data=None,
+                            batch_size=DEFAULT_BATCH_SIZE, session=None):
+        return cls._perform_bulk_upsert(
+            data, conflict_columns=conflict_columns, filters=filters, create_data=create_data,
+            batch_size=batch_size, session=session
+        )
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_bulk_upsert(cls, data, conflict_columns=None, filters=None, create_data=None,
+                             batch_size=DEFAULT_BATCH_SIZE, session=None):
+        results = cls.bulk_upsert(
+            session, data, conflict_columns=conflict_columns, filters=filters,
+            create_data=create_data, batch_size=batch_size
+        )
+        # Records without id in data are left to the expiration of second level cache
+        cls.forget_cached(session, [result["data"] for result in results if result["status"] == BULK_UPSERTED])
+        return results
+
+    @classmethod
+    def bulk_upsert(cls, session, data, conflict_columns=None, filters=None, create_data=None,
+                    batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Bulk upsert operate. Like bulk create, each batch is upserted by
+        executemany of `INSERT ... ON CONFLICT DO UPDATE` inside a savepoint,
+        and a failed batch is retried row by row. On dialects without it,
+        records are upserted one by one. Records conflicting with records
+        not matching filters fail.
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param data: record data list
+        :type data: list
+        :param conflict_columns: conflict column list, primary key columns by default
+        :type conflict_columns: list
+        :param filters: filter list, conflicting records are only updated if they match them
+        :type filters: list
+        :param create_data: data only inserted, e.g. the creator, which overrides data
+        :type create_data: dict
+        :param batch_size: number of records upserted per statement
+        :type batch_size: int
+        :return: result of each record, in the same order as data
+        :rtype: list
+        """
+        conflict_columns = cls.conflict_columns(conflict_columns)
+        insert = UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        results = []
+        batch_size = max(int(batch_size), 1)
+        for start in range(0, len(data), batch_size):
+            batch_results = []
+            for record in data[start:start + batch_size]:
+                try:
+                    cls.check_upsert_data(record, conflict_columns)
+                except ValueError as e:
+                    batch_results.append({"status": BULK_FAILED, "error": str(e)})
+                    continue
+                record, _ = cls.split_create_data(record, create_data)
+                batch_results.append({"status": BULK_UPSERTED, "data": cls.fill_onupdates(record)})
+            upserted = [result for result in batch_results if result["status"] == BULK_UPSERTED]
+            if filters:
+                # Conflicts are skipped silently by the guarded update, so that they are reported first
+                inaccessible = cls.inaccessible_conflicts(
+                    session, [result["data"] for result in upserted], conflict_columns, filters
+                )
+                for result in upserted:
+                    if tuple(result["data"][column] for column in conflict_columns) in inaccessible:
+                        result.pop("data")
+                        result.update({"status": BULK_FAILED, "error": str(UpsertConflictError(conflict_columns))})
+                upserted = [result for result in upserted if result["status"] == BULK_UPSERTED]
+            try:
+                cls._bulk_upsert(
+                    session, insert, [result["data"] for result in upserted], conflict_columns,
+                    filters=filters, create_data=create_data
+                )
+            except (StatementError, ValueError):
+                for result in upserted:
+                    try:
+                        cls._bulk_upsert(
+                            session, insert, [result["data"]], conflict_columns,
+                            filters=filters, create_data=create_data
+                        )
+                    except (StatementError, ValueError) as e:
+                        result.pop("data")
+                        result.update({"status": BULK_FAILED, "error": str(getattr(e, "orig", None) or e)})
+            for result in upserted:
+                if "data" in result:
+                    result["data"] = cls.fill_defaults(dict(result["data"], **(create_data or {})))
+            results.extend(batch_results)
+        return results
+
+    @classmethod
+    def _bulk_upsert(cls, session, insert, records, conflict_columns, filters=None, create_data=None):
+        if not records:
+            return
+        with session.begin_nested():
+            if insert is None:
+                for record in records:
+                    cls._select_upsert(session, record, conflict_columns, filters=filters, create_data=create_data)
+                return
+            # Fields updated on conflict are the keys of records, so records are grouped by them
+            groups = {}
+            for record in records:
+                groups.setdefault(tuple(sorted(record)), []).append(record)
+            for group in groups.values():
+                statement = cls._upsert_statement(insert, group[0], conflict_columns, filters=filters)
+                session.execute(
+                    statement, [cls.fill_defaults(dict(record, **(create_data or {}))) for record in group]
+                )
+
+    @classmethod
+    def perform_show_by(cls, filters, columns=None, session=None, read_path=READ_PATH_ORM, expand=None):
+        return cls._perform_show_by(filters, columns=columns, session=session, read_path=read_path, expand=expand)
+
+    @classmethod
+    @process_if_no_session()
+    def _perform_show_by(cls, filters, columns=None, session=None, read_path=READ_PATH_ORM, expand=None):
+        if expand:
+            record = cls.show_by(session, filters, expand=expand)
+            return cls.expanded_to_dict(record, cls.make_expand_tree(expand), columns=columns) or {}
+        if read_path == READ_PATH_CORE:
+            return cls.core_show_by(session, filters, columns=columns)
+        record = cls.show_by(session, filters, columns=columns)
+        return cls.record_to_dict(record, columns=columns)
+
+    @classmethod
+    def show_by(cls, session, filters, columns=None, expand=None):
+        if expand:
+            query = cls.make_query(session)
+            query = cls.add_filters(query, filters)
+            return query.options(*cls.make_loader_options(expand)).first()
+        plan = cls.make_plan(columns=columns, filters=filters)
+        if plan is not None:
+            return plan.first(session)
+        query = cls.make_query(session, columns=columns)
+        query = cls.add_filters(query, filters)
+        return query.first()
+
+    @classmethod
+    def perform_show(cls, rid, filters=None, columns=None, session=None, read_path=READ_PATH_ORM, expand=None):
+        return cls._perform_show(
+            rid, filters=filters, columns=columns, session=session, read_path=read_path, expand=expand
+        )
+
+    @classmethod
+    @process_if_no_session()
+    def _perform_show(cls, rid, filters=None, columns=None, session=None, read_path=READ_PATH_ORM, expand=None):
+        if expand:
+            record = cls.show(session, rid, filters=filters, expand=expand)
+            return cls.expanded_to_dict(record, cls.make_expand_tree(expand), columns=columns) or {}
+        if cls.gettable_by_id(filters):
+            return cls.show_by_id(session, rid, columns=columns)
+        if read_path == READ_PATH_CORE:
+            filters = copy.deepcopy(filters) if filters else []
+            filters.insert(0, (cls.id_field, rid))
+            return cls.core_show_by(session, filters, columns=columns)
+        record = cls.show(session, rid, filters=filters, columns=columns)
+        return cls.record_to_dict(record, columns=columns)
+
+    @classmethod
+    def show(cls, session, rid, filters=None, columns=None, expand=None):
+        """
+        Show operate
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :param filters: filter list
+        :type filters: list
+        :param columns: column list
+        :type columns: list
+        :param expand: relationship paths to be loaded eagerly
+        :type expand: list
+        :return: the current record
+        """
+        filters = copy.deepcopy(filters) if filters else []
+        filters.insert(0, (cls.id_field, rid))
+        return cls.show_by(session, filters, columns=columns, expand=expand)
+
+    @classmethod
+    def has_version(cls):
+        """
+        Check whether model has version column, which is the update time
+        of records, for conditional requests
+        """
+        return bool(cls.version_field) and cls.version_field in cls.__table__.columns
+
+    @classmethod
+    def perform_version(cls, rid, filters=None, session=None):
+        return cls._perform_version(rid, filters=filters, session=session)
+
+    @classmethod
+    @process_if_no_session()
+    def _perform_version(cls, rid, filters=None, session=None):
+        return cls.version(session, rid, filters=filters)
+
+    @classmethod
+    def version(cls, session, rid, filters=None):
+        """
+        Get version of a record, which selects the version column only
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :param filters: filter list
+        :type filters: list
+        :return: {"version": version}, or None if the record is not found
+        :rtype: dict
+        """
+        filters = copy.deepcopy(filters) if filters else []
+        filters.insert(0, (cls.id_field, rid))
+        record = cls.make_select_plan([cls.version_field], filters=filters).execute(session).first()
+        return {"version": record[0]} if record else None
+
+    @classmethod
+    def perform_list_version(cls, filters=None, session=None):
+        return cls._perform_list_version(filters=filters, session=session)
+
+    @classmethod
+    @process_if_no_session()
+    def _perform_list_version(cls, filters=None, session=None):
+        return cls.list_version(session, filters=filters)
+
+    @classmethod
+    def list_version(cls, session, filters=None):
+        """
+        Get version of records filtered, which is the latest version and the
+        number of them, so that deleted records change it too
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param filters: filter list
+        :type filters: list
+        :return: {"version": version, "count": count}
+        :rtype: dict
+        """
+        statement = cls.make_select([cls.version_field], filters=filters)
+        statement = statement.with_only_columns([func.max(cls.__table__.columns[cls.version_field]), func.count()])
+        record = session.execute(statement).first()
+        return {"version": record[0], "count": record[1]}
+
+    @classmethod
+    def gettable_by_id(cls, filters=None):
+        """
+        Check whether records can be got by id through the identity map,
+        which requires id to be the primary key and no extra filters, such
+        as isolation filters, to be applied
+
+        :param filters: filter list
+        :type filters: list
+        :rtype: bool
+        """
+        return not filters and [column.key for column in cls.__table__.primary_key.columns] == [cls.id_field]
+
+    @classmethod
+    def coerce_id(cls, rid):
+        """
+        Coerce id value to the python type of id column, so that it matches
+        the identity key of records
+
+        :param rid: id value
+        :return: coerced id value, or None if it does not match id column
+        """
+        try:
+            return coerce_value(cls.__table__.columns[cls.id_field].type, rid)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def get_by_id(cls, session, rid):
+        """
+        Get record by id, which is looked up in the identity map of session
+        before the database
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :return: the record, or None if not found
+        """
+        rid = cls.coerce_id(rid)
+        if rid is None:
+            return None
+        record = session.query(cls).get(rid)
+        # Records got by id are held by the session, so later reads of the request hit the identity map
+        if record is not None and isinstance(session, RoutingSession):
+            session.hold(record)
+        return record
+
+    @classmethod
+    def identity_record(cls, session, rid):
+        """
+        Get record by id from the identity map of session only
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :return: the record, or None if it is not in the identity map
+        """
+        rid = cls.coerce_id(rid)
+        if rid is None:
+            return None
+        return session.identity_map.get(cls.__mapper__.identity_key_from_primary_key([rid]))
+
+    @classmethod
+    def record_cache_key(cls, rid):
+        return "{}:{}:{}".format(RECORD_CACHE_PREFIX, cls.__table__.name, rid)
+
+    @classmethod
+    def check_record_cache(cls):
+        """
+        Check that entries of second level cache expire, writes not by id are
+        only caught up with by the expiration
+
+        :raise ValueError: if `record_cache` is set without a positive `record_cache_expire`
+        """
+        if cls.record_cache is None:
+            return
+        expire = cls.record_cache_expire
+        if isinstance(expire, bool) or not isinstance(expire, (int, float)) or expire <= 0:
+            raise ValueError("record_cache of {} requires a positive record_cache_expire".format(cls.__name__))
+
+    @classmethod
+    def get_cached(cls, rid):
+        """
+        Get record data from second level cache, values are coerced back to
+        the python types of columns
+
+        :param rid: id value
+        :return: record data, or None if not cached
+        :rtype: dict
+        """
+        if cls.record_cache is None:
+            return None
+        try:
+            value = cls.record_cache.get(cls.record_cache_key(rid))
+            if not value:
+                return None
+            columns = cls.__table__.columns
+            return {
+                column: coerce_value(columns[column].type, _value) if column in columns else _value
+                for column, _value in json.loads(value).items()
+            }
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+            return None
+
+    @classmethod
+    def set_cached(cls, rid, data):
+        if cls.record_cache is None:
+            return
+        cls.check_record_cache()
+        try:
+            value = json.dumps(data, cls=CursorEncoder, separators=(",", ":"))
+            cls.record_cache.set(cls.record_cache_key(rid), value, expire=cls.record_cache_expire)
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+
+    @classmethod
+    def forget_cached(cls, session, records, columns=None):
+        """
+        Remove records from second level cache once the transaction of
+        session is committed, so that readers cannot cache the records again
+        before the writes are visible. This is done by writes by id and
+        writes returning records, others are left to the expiration.
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param records: records, or record data list
+        :type records: list
+        :param columns: column list of records which are rows
+        :type columns: list
+        """
+        if cls.record_cache is None:
+            return
+        forgotten = session.info.setdefault(FORGOTTEN_RECORDS_KEY, set())
+        for record in records:
+            if isinstance(record, dict):
+                rid = record.get(cls.id_field)
+            elif isinstance(record, cls):
+                rid = getattr(record, cls.id_field)
+            elif columns and cls.id_field in columns:
+                rid = record[columns.index(cls.id_field)]
+            else:
+                continue
+            if rid is not None:
+                forgotten.add((cls, rid))
+
+    @classmethod
+    def delete_cached(cls, rid):
+        try:
+            cls.record_cache.delete(cls.record_cache_key(rid))
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+
+    @classmethod
+    def show_by_id(cls, session, rid, columns=None):
+        """
+        Show operate by id, which looks up second level cache, then the
+        identity map of session, before the database
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :param columns: column list
+        :type columns: list
+        :return: record data
+        :rtype: dict
+        """
+        rid = cls.coerce_id(rid)
+        if rid is None:
+            return {}
+        data = cls.get_cached(rid)
+        if data is None:
+            record = cls.get_by_id(session, rid)
+            if record is None:
+                return {}
+            data = record.to_dict()
+            cls.set_cached(rid, data)
+        if columns:
+            return {column: data.get(column) for column in columns}
+        return data
+
+    @classmethod
+    def supports_returning(cls, session):
+        """
+        Check whether the dialect of session supports `UPDATE/DELETE ... RETURNING`
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :rtype: bool
+        """
+        dialect = session.get_bind().dialect
+        return getattr(dialect, "full_returning", False) or dialect.name in RETURNING_DIALECTS
+
+    @classmethod
+    def returning_columns(cls, columns=None):
+        if not columns:
+            return [column.key for column in cls.__table__.columns]
+        return [column for column in columns if column in cls.__table__.columns]
+
+    @classmethod
+    def perform_update_by(cls, filters, data, returning=True, columns=None, session=None):
+        return cls._perform_update_by(filters, data, returning=returning, columns=columns, session=session)
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_update_by(cls, filters, data, returning=True, columns=None, session=None):
+        records = cls.update_by(session, filters, data, returning=returning, columns=columns)
+        if not returning:
+            return records
+        records = cls.records_to_list(records, columns=cls.returning_columns(columns))
+        cls.forget_cached(session, records)
+        return records
+
+    @classmethod
+    def update_by(cls, session, filters, data, returning=True, columns=None):
+        """
+        Update operate by filters, which issues a single UPDATE statement
+        unless records are required on a dialect without RETURNING
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param filters: filter list
+        :type filters: list
+        :param data: update data
+        :type data: dict
+        :param returning: whether to return the updated records
+        :type returning: bool
+        :param columns: column list of the updated records
+        :type columns: list
+        :return: the updated records if returning, otherwise the number of updated records
+        """
         if not filters:
-            return False
+            return [] if returning else 0
         query = cls.make_query(session)
         query = cls.add_filters(query, filters)
-        return query.count() > 0
+        if query.whereclause is None:
+            logger.warning("Update by filters ({}) refused, no valid filter".format(str(filters)))
+            return [] if returning else 0
+        if not returning:
+            return query.update(data, synchronize_session=False)
+        if cls.supports_returning(session):
+            columns = cls.returning_columns(columns)
+            statement = cls.__table__.update().where(query.whereclause).values(**data).returning(
+                *(cls.__table__.columns[column] for column in columns)
+            )
+            return [tuple(record) for record in session.execute(statement)]
+        query.update(data)
+        session.flush()
+        if columns:
+            return cls.add_filters(cls.make_query(session, columns=columns), filters).all()
+        return query.all()
+
+    @classmethod
+    def perform_update(cls, rid, data, filters=None, session=None):
+        return cls._perform_update(rid, data, filters=filters, session=session)
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_update(cls, rid, data, filters=None, session=None):
+        record = cls.update(session, rid, data, filters=filters)
+        return cls.record_to_dict(record, columns=cls.returning_columns())
+
+    @classmethod
+    def update(cls, session, rid, data, filters=None):
+        """
+        Update operate
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :param data: update data
+        :type data: dict
+        :param filters: filter list
+        :type filters: list
+        :return: the updated record
+        """
+        if cls.gettable_by_id(filters):
+            # A single UPDATE ... RETURNING is cheaper unless the record is already loaded
+            record = cls.identity_record(session, rid)
+            if record is None and not cls.supports_returning(session):
+                record = cls.get_by_id(session, rid)
+                if record is None:
+                    return {}
+            if record is not None:
+                unknown_fields = [field for field in data if field not in cls.__mapper__.columns]
+                if unknown_fields:
+                    raise ValueError("Unknown fields: {}".format(str(unknown_fields)))
+                for field, value in data.items():
+                    setattr(record, field, value)
+                session.flush()
+                cls.forget_cached(session, [record])
+                return record
+        filters = copy.deepcopy(filters) if filters else []
+        filters.insert(0, (cls.id_field, rid))
+        records = cls.update_by(session, filters, data)
+        cls.forget_cached(session, records, columns=cls.returning_columns())
+        return records[0] if records else {}
+
+    @classmethod
+    def perform_delete_by(cls, filters, returning=True, columns=None, session=None):
+        return cls._perform_delete_by(filters, returning=returning, columns=columns, session=session)
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_delete_by(cls, filters, returning=True, columns=None, session=None):
+        records = cls.delete_by(session, filters, returning=returning, columns=columns)
+        if not returning:
+            return records
+        records = cls.records_to_list(records, columns=cls.returning_columns(columns))
+        cls.forget_cached(session, records)
+        return records
+
+    @classmethod
+    def delete_by(cls, session, filters, returning=True, columns=None):
+        """
+        Delete operate by filters, which issues a single DELETE statement
+        unless records are required on a dialect without RETURNING
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param filters: filter list
+        :type filters: list
+        :param returning: whether to return the deleted records
+        :type returning: bool
+        :param columns: column list of the deleted records
+        :type columns: list
+        :return: the deleted records if returning, otherwise the number of deleted records
+        """
+        if not filters:
+            return [] if returning else 0
+        query = cls.make_query(session)
+        query = cls.add_filters(query, filters)
+        if query.whereclause is None:
+            logger.warning("Delete by filters ({}) refused, no valid filter".format(str(filters)))
+            return [] if returning else 0
+        if not returning:
+            return query.delete(synchronize_session=False)
+        if cls.supports_returning(session):
+            columns = cls.returning_columns(columns)
+            statement = cls.__table__.delete().where(query.whereclause).returning(
+                *(cls.__table__.columns[column] for column in columns)
+            )
+            return [tuple(record) for record in session.execute(statement)]
+        records = cls.add_filters(cls.make_query(session, columns=columns), filters).all() if columns else query.all()
+        query.delete()
+        return records
+
+    @classmethod
+    def perform_delete(cls, rid, filters=None, session=None):
+        return cls._perform_delete(rid, filters=filters, session=session)
+
+    @classmethod
+    @process_if_no_session(autocommit=True)
+    def _perform_delete(cls, rid, filters=None, session=None):
+        record = cls.delete(session, rid, filters=filters)
+        return cls.record_to_dict(record, columns=cls.returning_columns())
+
+    @classmethod
+    def delete(cls, session, rid, filters=None):
+        """
+        Delete operate
+
+        :param session: session object
+        :type session: restful_falcon.core.db.engine.Session
+        :param rid: id value
+        :param filters: filter list
+        :type filters: list
+        :return: the deleted record
+        """
+        if cls.gettable_by_id(filters):
+            # A single DELETE ... RETURNING is cheaper unless the record is already loaded
+            record = cls.identity_record(session, rid)
+            if record is None and not cls.supports_returning(session):
+                record = cls.get_by_id(session, rid)
+                if record is None:
+                    return {}
+            if record is not None:
+                # Attributes are loaded before the record is deleted, so that it can be returned
+                record.to_dict()
+                session.delete(record)
+                session.flush()
+                cls.forget_cached(session, [record])
+                return record
+        filters = copy.deepcopy(filters) if filters else []
+        filters.insert(0, (cls.id_field, rid))
+        records = cls.delete_by(session, filters)
+        cls.forget_cached(session, records, columns=cls.returning_columns())
+        return records[0] if records else {}
+
+    @classmethod
+    @process_if_no_session()
+    def exist(cls, filters, session=None):
+        if not filters:
+            return False
+        with using_replica(session):
+            plan = cls.make_plan(filters=filters)
+            if plan is not None:
+                return plan.count(session) > 0
+            query = cls.make_query(session)
+            query = cls.add_filters(query, filters)
+            return query.count() > 0
+
+    # Async operates. SQLAlchemy ORM is blocking, so the operates run in the
+    # executor of `restful_falcon.util.concurrency`, sharing the session of
+    # request scope, and the event loop is never blocked by them.
+
+    @classmethod
+    async def perform_list_async(cls, **kwargs):
+        return await run_sync(cls.perform_list, **kwargs)
+
+    @classmethod
+    async def perform_list_by_cursor_async(cls, **kwargs):
+        return await run_sync(cls.perform_list_by_cursor, **kwargs)
+
+    @classmethod
+    async def perform_create_async(cls, data, **kwargs):
+        return await run_sync(cls.perform_create, data, **kwargs)
+
+    @classmethod
+    async def perform_bulk_create_async(cls, data, **kwargs):
+        return await run_sync(cls.perform_bulk_create, data, **kwargs)
+
+    @classmethod
+    async def perform_upsert_async(cls, data, **kwargs):
+        return await run_sync(cls.perform_upsert, data, **kwargs)
+
+    @classmethod
+    async def perform_bulk_upsert_async(cls, data, **kwargs):
+        return await run_sync(cls.perform_bulk_upsert, data, **kwargs)
+
+    @classmethod
+    async def perform_version_async(cls, rid, **kwargs):
+        return await run_sync(cls.perform_version, rid, **kwargs)
+
+    @classmethod
+    async def perform_list_version_async(cls, **kwargs):
+        return await run_sync(cls.perform_list_version, **kwargs)
+
+    @classmethod
+    async def perform_show_by_async(cls, filters, **kwargs):
+        return await run_sync(cls.perform_show_by, filters, **kwargs)
+
+    @classmethod
+    async def perform_show_async(cls, rid, **kwargs):
+        return await run_sync(cls.perform_show, rid, **kwargs)
+
+    @classmethod
+    async def perform_update_by_async(cls, filters, data, **kwargs):
+        return await run_sync(cls.perform_update_by, filters, data, **kwargs)
+
+    @classmethod
+    async def perform_update_async(cls, rid, data, **kwargs):
+        return await run_sync(cls.perform_update, rid, data, **kwargs)
+
+    @classmethod
+    async def perform_delete_by_async(cls, filters, **kwargs):
+        return await run_sync(cls.perform_delete_by, filters, **kwargs)
+
+    @classmethod
+    async def perform_delete_async(cls, rid, **kwargs):
+        return await run_sync(cls.perform_delete, rid, **kwargs)
+
+    @classmethod
+    async def exist_async(cls, filters, **kwargs):
+        return await run_sync(cls.exist, filters, **kwargs)
+
+
+class ModelMeta(DeclarativeMeta):
+    def __init__(cls, classname, bases, dict_):
+        super(ModelMeta, cls).__init__(classname, bases, dict_)
+        if "__mapper__" in cls.__dict__:
+            cls.setup_columns()
+            cls.check_record_cache()
+
+
+def _forget_committed(session):
+    # Writes of a released savepoint are not visible to others until the outermost transaction
+    # commits, readers could cache the records again meanwhile
+    transaction = session.transaction
+    if transaction is not None and transaction.nested:
+        return
+    for model, rid in session.info.pop(FORGOTTEN_RECORDS_KEY, ()):
+        model.delete_cached(rid)
+
+
+# noinspection PyUnusedLocal
+def _after_transaction_end(session, transaction):
+    # Records of rolled back transactions are left in cache
+    if transaction.parent is None:
+        session.info.pop(FORGOTTEN_RECORDS_KEY, None)
+
+
+event.listen(RoutingSession, "after_commit", _forget_committed)
+event.listen(RoutingSession, "after_transaction_end", _after_transaction_end)
 
 
-Model: BaseModel = declarative_base(name="Model", cls=BaseModel)
+Model: BaseModel = declarative_base(name="Model", cls=BaseModel, metaclass=ModelMeta)
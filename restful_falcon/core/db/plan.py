@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import threading
+import traceback
+from logging import getLogger
+
+from sqlalchemy import and_
+from sqlalchemy import bindparam
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy.ext import baked
+from sqlalchemy.util import LRUCache
+
+from restful_falcon.core.db.count import WINDOW_COUNT_LABEL
+from restful_falcon.core.db.filter import FilterValueError
+from restful_falcon.core.db.filter import make_filter_from_shape
+from restful_falcon.core.db.filter import make_filter_shape
+
+__all__ = ["QueryPlan", "SelectPlan", "QueryPlanCache", "DEFAULT_PLAN_CACHE_SIZE"]
+
+logger = getLogger(__name__)
+
+DEFAULT_PLAN_CACHE_SIZE = 500
+
+LIMIT_PARAM = "_limit"
+OFFSET_PARAM = "_offset"
+AFTER_PARAM = "_after"
+
+
+def _to_int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError) as e:
+        logger.warning(str(e))
+        logger.warning(traceback.format_exc())
+        return None
+
+
+class QueryPlan(object):
+    """
+    A prebuilt query, whose SQLAlchemy Query construction and SQL compilation
+    are cached by the shape of it, and only the bound parameters are supplied
+    on each execution.
+    """
+    __slots__ = ("_baked_query", "_params", "_cache")
+
+    def __init__(self, baked_query, params, cache):
+        self._baked_query = baked_query
+        self._params = params
+        self._cache = cache
+
+    def _with_criteria(self, fn, *args, **params):
+        _params = dict(self._params)
+        _params.update(params)
+        return QueryPlan(self._baked_query.with_criteria(fn, *args), _params, self._cache)
+
+    def with_limit(self, limit):
+        limit = _to_int(limit)
+        if limit is None:
+            return self
+        return self._with_criteria(lambda query: query.limit(bindparam(LIMIT_PARAM)), **{LIMIT_PARAM: limit})
+
+    def with_offset(self, offset):
+        offset = _to_int(offset)
+        if offset is None:
+            return self
+        return self._with_criteria(lambda query: query.offset(bindparam(OFFSET_PARAM)), **{OFFSET_PARAM: offset})
+
+    def with_window_count(self):
+        return self._with_criteria(
+            lambda query: query.add_columns(func.count().over().label(WINDOW_COUNT_LABEL))
+        )
+
+    def result(self, session):
+        return self._baked_query(session).params(**self._params)
+
+    def all(self, session):
+        self._cache.lookup()
+        return self.result(session).all()
+
+    def first(self, session):
+        self._cache.lookup()
+        return self.result(session).first()
+
+    def count(self, session):
+        self._cache.lookup()
+        return self.result(session).count()
+
+
+def _select_step(statement, model, columns, shapes):
+    statement = select([model.__mapper__.columns[column] for column in columns]).select_from(model.__table__)
+    clauses = []
+    for shape in shapes:
+        try:
+            clauses.append(make_filter_from_shape(model, shape))
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+    return statement.where(and_(*clauses)) if clauses else statement
+
+
+def _raw_select_step(statement, model, columns, filters):
+    return model.make_select(list(columns), filters=filters)
+
+
+def _count_step(statement):
+    return statement.with_only_columns([func.count()])
+
+
+def _window_count_step(statement):
+    return statement.column(func.count().over().label(WINDOW_COUNT_LABEL))
+
+
+def _orders_step(statement, model, orders):
+    return model.add_orders(statement, list(orders) if orders else None)
+
+
+def _after_param(index):
+    return "{}{}".format(AFTER_PARAM, index)
+
+
+def _after_step(statement, model, columns):
+    # Rows after the position in ascending order of columns, which are not nullable such as primary key columns
+    fields = [model.__mapper__.columns[column] for column in columns]
+    params = [bindparam(_after_param(i)) for i in range(0, len(columns))]
+    return statement.where(or_(*[
+        and_(*([fields[j] == params[j] for j in range(0, i)] + [fields[i] > params[i]]))
+        for i in range(0, len(fields))
+    ]))
+
+
+def _limit_step(statement):
+    return statement.limit(bindparam(LIMIT_PARAM))
+
+
+def _offset_step(statement):
+    return statement.offset(bindparam(OFFSET_PARAM))
+
+
+class SelectPlan(object):
+    """
+    A prebuilt Core select statement, which is cached by the shape of it
+    like QueryPlan, and compiled once through the compiled cache. A plan
+    without cache builds and compiles its statement on each execution.
+    """
+    __slots__ = ("_steps", "_params", "_cache")
+
+    def __init__(self, steps, params, cache=None):
+        self._steps = steps
+        self._params = params
+        self._cache = cache
+
+    @classmethod
+    def uncached(cls, model, columns, filters=None):
+        return cls(((_raw_select_step, (model, tuple(columns), filters)),), {})
+
+    def _with_step(self, fn, *args, **params):
+        _params = dict(self._params)
+        _params.update(params)
+        return SelectPlan(self._steps + ((fn, args),), _params, self._cache)
+
+    def with_count(self):
+        return self._with_step(_count_step)
+
+    def with_window_count(self):
+        return self._with_step(_window_count_step)
+
+    def with_orders(self, model, orders):
+        orders = tuple(orders) if isinstance(orders, list) else None
+        try:
+            hash(orders)
+        except TypeError:
+            # Unhashable orders have no shape, so the plan turns to uncached
+            return SelectPlan(self._steps + ((_orders_step, (model, orders)),), self._params)
+        return self._with_step(_orders_step, model, orders)
+
+    def with_after(self, model, columns, values):
+        params = {_after_param(i): value for i, value in enumerate(values)}
+        return self._with_step(_after_step, model, tuple(columns), **params)
+
+    def with_limit(self, limit):
+        limit = _to_int(limit)
+        if limit is None:
+            return self
+        return self._with_step(_limit_step, **{LIMIT_PARAM: limit})
+
+    def with_offset(self, offset):
+        offset = _to_int(offset)
+        if offset is None:
+            return self
+        return self._with_step(_offset_step, **{OFFSET_PARAM: offset})
+
+    @property
+    def params(self):
+        return self._params
+
+    def statement(self):
+        if self._cache is not None:
+            return self._cache.statement(self._steps)
+        statement = None
+        for fn, args in self._steps:
+            statement = fn(statement, *args)
+        return statement
+
+    def execute(self, session, **options):
+        if self._cache is not None:
+            self._cache.lookup()
+            options["compiled_cache"] = self._cache.compiled_cache
+        if not options:
+            return session.execute(self.statement(), self._params)
+        connection = session.connection().execution_options(**options)
+        return connection.execute(self.statement(), self._params)
+
+
+class QueryPlanCache(object):
+    """
+    A bounded cache of query plans keyed by (model, columns, filter shape,
+    orders), backed by the SQLAlchemy bakery, and of Core select statements
+    keyed in the same way, with their compiled forms.
+    """
+    def __init__(self, size=DEFAULT_PLAN_CACHE_SIZE):
+        self._bakery = baked.bakery(size=size)
+        self._statements = LRUCache(size)
+        self.compiled_cache = LRUCache(size)
+        self._size = size
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._misses = 0
+
+    def lookup(self):
+        with self._lock:
+            self._lookups += 1
+
+    def miss(self):
+        with self._lock:
+            self._misses += 1
+
+    def stats(self):
+        """
+        Statistics of cache, each execution of a plan is a lookup, and it is
+        a miss if the query of plan has to be built
+
+        :rtype: dict
+        """
+        with self._lock:
+            lookups, misses = self._lookups, self._misses
+        return {
+            "hits": max(lookups - misses, 0), "misses": misses,
+            "size": len(self._bakery.cache), "statements": len(self._statements), "max_size": self._size
+        }
+
+    def clear(self):
+        self._bakery.cache.clear()
+        self._statements.clear()
+        self.compiled_cache.clear()
+        with self._lock:
+            self._lookups = 0
+            self._misses = 0
+
+    @staticmethod
+    def _make_shapes(model, filters):
+        params = {}
+        shapes = []
+        for _filter in (filters if isinstance(filters, list) else []):
+            try:
+                shapes.append(make_filter_shape(_filter, params, model=model))
+            except TypeError:
+                return None, None
+            except FilterValueError:
+                raise
+            except ValueError as e:
+                logger.warning(str(e))
+                logger.warning(traceback.format_exc())
+        return tuple(shapes), params
+
+    def statement(self, steps):
+        """
+        Get the cached select statement built by steps
+
+        :param steps: steps of select plan
+        :type steps: tuple
+        :rtype: sqlalchemy.sql.expression.Select
+        """
+        key = tuple((fn.__code__,) + args for fn, args in steps)
+        statement = self._statements.get(key)
+        if statement is None:
+            self.miss()
+            for fn, args in steps:
+                statement = fn(statement, *args)
+            self._statements[key] = statement
+        return statement
+
+    def select(self, model, columns, filters=None):
+        """
+        Make select plan
+
+        :param model: model class
+        :param columns: valid column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: list
+        :return: select plan, or None if any filter cannot be planned
+        :rtype: SelectPlan
+        """
+        shapes, params = self._make_shapes(model, filters)
+        if shapes is None:
+            return None
+        return SelectPlan(((_select_step, (model, tuple(columns), shapes)),), params, self)
+
+    def plan(self, model, columns=None, filters=None, orders=None):
+        """
+        Make query plan
+
+        :param model: model class
+        :param columns: column list
+        :type columns: list
+        :param filters: filter list
+        :type filters: list
+        :param orders: order list
+        :type orders: list
+        :return: query plan, or None if any filter or order cannot be planned
+        :rtype: QueryPlan
+        """
+        shapes, params = self._make_shapes(model, filters)
+        if shapes is None:
+            return None
+        try:
+            columns = tuple(columns) if columns else None
+            orders = tuple(orders) if isinstance(orders, list) else None
+            hash((columns, orders))
+        except TypeError:
+            return None
+
+        def make_query(session):
+            self.miss()
+            return model.make_query(session, columns=list(columns) if columns else None)
+
+        def add_filters(query):
+            for shape in shapes:
+                try:
+                    query = query.filter(make_filter_from_shape(model, shape))
+                except Exception as e:
+                    logger.warning(str(e))
+                    logger.warning(traceback.format_exc())
+            return query
+
+        def add_orders(query):
+            return model.add_orders(query, list(orders) if orders else None)
+
+        baked_query = self._bakery(make_query, model, columns)
+        baked_query.add_criteria(add_filters, shapes)
+        baked_query.add_criteria(add_orders, orders)
+        return QueryPlan(baked_query, params, self)
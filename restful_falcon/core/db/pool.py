@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import threading
+import time
+from functools import wraps
+
+from sqlalchemy import event
+
+__all__ = ["POOL_PROFILES", "pool_options", "PoolMetrics", "attach_metrics", "pool_stats"]
+
+POOL_PROFILES = {
+    # Threaded web workers, connections are reused by the most recent one
+    "web": {
+        "size": 10, "overflow": 20, "timeout": 10, "recycle": 1800, "pre_ping": True, "lifo": True
+    },
+    # Background workers running one task at a time
+    "worker": {
+        "size": 2, "overflow": 2, "timeout": 30, "recycle": 3600, "pre_ping": True, "lifo": False
+    },
+    # Small processes like management commands
+    "small": {
+        "size": 1, "overflow": 1, "timeout": 30, "recycle": -1, "pre_ping": False, "lifo": False
+    }
+}
+
+POOL_OPTIONS = {
+    "size": "pool_size",
+    "overflow": "max_overflow",
+    "timeout": "pool_timeout",
+    "recycle": "pool_recycle",
+    "pre_ping": "pool_pre_ping",
+    "lifo": "pool_use_lifo"
+}
+
+
+def pool_options(config):
+    """
+    Make engine options from pool config, settings of `profile` are
+    overridden by the ones given explicitly
+
+    Config:
+        profile: [web|worker|small]
+        size: number of connections kept in pool
+        overflow: number of connections allowed beyond size
+        timeout: seconds to wait for a connection
+        recycle: seconds after which a connection is recycled
+        pre_ping: test connections before checkout
+        lifo: reuse the most recently returned connection first
+
+    :param config: pool config
+    :type config: dict
+    :return: engine options
+    :rtype: dict
+    """
+    if not config:
+        return {}
+    settings = {}
+    if "profile" in config:
+        if config["profile"] not in POOL_PROFILES:
+            raise ValueError("Pool profile should be in {}".format(str(list(POOL_PROFILES))))
+        settings.update(POOL_PROFILES[config["profile"]])
+    for key in POOL_OPTIONS:
+        if key in config:
+            settings[key] = config[key]
+    return dict((POOL_OPTIONS[key], value) for key, value in settings.items())
+
+
+class PoolMetrics(object):
+    """
+    Metrics of connection pool of an engine, recorded by pool events
+    """
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._checked_out = 0
+        self._connects = 0
+        self._invalidations = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._overflow_max = 0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+
+    # noinspection PyUnusedLocal
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        overflow = self.overflow()
+        with self._lock:
+            self._checkouts += 1
+            self._checked_out += 1
+            self._overflow_max = max(self._overflow_max, overflow)
+
+    # noinspection PyUnusedLocal
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._checked_out = max(self._checked_out - 1, 0)
+
+    # noinspection PyUnusedLocal
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._connects += 1
+
+    # noinspection PyUnusedLocal
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self._invalidations += 1
+
+    def overflow(self):
+        """
+        Number of connections opened beyond pool size
+        """
+        overflow = getattr(self.engine.pool, "overflow", None)
+        return max(overflow(), 0) if callable(overflow) else 0
+
+    def stats(self):
+        """
+        Statistics of pool
+
+        :rtype: dict
+        """
+        pool = self.engine.pool
+        size = getattr(pool, "size", None)
+        with self._lock:
+            return {
+                "name": self.name,
+                "pool": pool.__class__.__name__,
+                "size": size() if callable(size) else None,
+                "checked_out": self._checked_out,
+                "overflow": self.overflow(),
+                "overflow_max": self._overflow_max,
+                "checkouts": self._checkouts,
+                "connects": self._connects,
+                "invalidations": self._invalidations,
+                "wait_total": self._wait_total,
+                "wait_max": self._wait_max,
+                "wait_avg": self._wait_total / self._checkouts if self._checkouts else 0.0
+            }
+
+
+METRICS = {}
+
+
+def _timed(metrics, connect):
+    @wraps(connect)
+    def _connect():
+        start = time.time()
+        try:
+            return connect()
+        finally:
+            metrics.record_wait(time.time() - start)
+    return _connect
+
+
+def _time_connect(metrics, pool):
+    # Engines check out connections by either of them
+    pool.connect = _timed(metrics, pool.connect)
+    pool.unique_connection = _timed(metrics, pool.unique_connection)
+
+
+def attach_metrics(name, engine):
+    """
+    Record metrics of connection pool of engine, the metrics of engine
+    attached with the same name before are replaced
+
+    :param name: name of engine in stats
+    :type name: str
+    :param engine: engine object
+    :type engine: sqlalchemy.engine.Engine
+    :rtype: PoolMetrics
+    """
+    metrics = PoolMetrics(name, engine)
+    # Listeners of pool events are kept when the pool is recreated on dispose
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+    event.listen(engine, "soft_invalidate", metrics.on_invalidate)
+    _time_connect(metrics, engine.pool)
+    event.listen(engine, "engine_disposed", lambda _engine: _time_connect(metrics, _engine.pool))
+    METRICS[name] = metrics
+    return metrics
+
+
+def pool_stats():
+    """
+    Statistics of connection pools of all engines
+
+    :rtype: list
+    """
+    return [metrics.stats() for metrics in list(METRICS.values())]
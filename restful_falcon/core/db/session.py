@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import hashlib
+import traceback
+from contextvars import ContextVar
+from logging import getLogger
+
+from restful_falcon.core.db.engine import Session
+
+__all__ = ["SessionScope", "SESSION_SCOPE", "client_key"]
+
+logger = getLogger(__name__)
+
+
+class SessionScope(object):
+    """
+    Scope of the session shared by everything running in a request. The
+    session is only created on first use, so requests never touching the
+    database hold no connection, and it is always closed when the scope ends.
+    """
+    def __init__(self, session_factory=Session):
+        self._session_factory = session_factory
+        self._scope = ContextVar("session_scope", default=None)
+
+    @property
+    def active(self):
+        return self._scope.get() is not None
+
+    def begin(self, client=None):
+        """
+        Begin a scope, the previous scope in the same context is ended
+
+        :param client: key of client, which is pinned to the primary after it writes
+        :type client: str
+        """
+        if self.active:
+            self.end(commit=False)
+        self._scope.set({"session": None, "client": client})
+
+    def current(self):
+        """
+        Get session of the current scope without creating it
+
+        :rtype: restful_falcon.core.db.engine.Session
+        """
+        scope = self._scope.get()
+        return scope["session"] if scope is not None else None
+
+    def get(self):
+        """
+        Get session of the current scope, which is created on first call
+
+        :return: session object, or None if no scope is active
+        :rtype: restful_falcon.core.db.engine.Session
+        """
+        scope = self._scope.get()
+        if scope is None:
+            return None
+        if scope["session"] is None:
+            session = self._session_factory()
+            router = getattr(session, "router", None)
+            if router is not None:
+                session.pinned = router.pinned(scope["client"])
+            scope["session"] = session
+        return scope["session"]
+
+    def end(self, commit=False):
+        """
+        End the current scope, commit or rollback the session by outcome of
+        request, and close it
+
+        :param commit: commit the session or rollback it
+        :type commit: bool
+        """
+        scope = self._scope.get()
+        self._scope.set(None)
+        if scope is None or scope["session"] is None:
+            return
+        session = scope["session"]
+        try:
+            if commit:
+                session.commit()
+                if getattr(session, "has_writes", False) and session.router is not None:
+                    session.router.pin(scope["client"])
+            else:
+                session.rollback()
+        except Exception as e:
+            logger.warning(str(e))
+            logger.warning(traceback.format_exc())
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def client_key(request):
+    """
+    Key of the client sending request, which is the digest of its credentials,
+    or its address if it has no credentials
+
+    :param request: request object
+    :type request: falcon.Request
+    :rtype: str
+    """
+    credentials = request.auth or request.remote_addr
+    if not credentials:
+        return None
+    return hashlib.sha1(credentials.encode("utf-8")).hexdigest()
+
+
+SESSION_SCOPE = SessionScope()
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import re
+import sys
+import time
+from contextvars import ContextVar
+from logging import getLogger
+
+from sqlalchemy import event
+
+__all__ = [
+    "QueryStats", "QueryStatsScope", "QUERY_STATS_SCOPE", "NPlusOneQueryError", "normalize_statement",
+    "attach_query_events", "N_PLUS_ONE_WARN", "N_PLUS_ONE_RAISE", "N_PLUS_ONE_ACTIONS"
+]
+
+logger = getLogger(__name__)
+
+START_TIMES_KEY = "restful_falcon_query_start"
+
+N_PLUS_ONE_WARN = "warn"
+N_PLUS_ONE_RAISE = "raise"
+N_PLUS_ONE_ACTIONS = (N_PLUS_ONE_WARN, N_PLUS_ONE_RAISE)
+
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_PATTERN = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+PLACEHOLDER_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class NPlusOneQueryError(Exception):
+    pass
+
+
+def normalize_statement(statement):
+    """
+    Normalize statement to its shape, literals and placeholders are replaced
+    by `?`, and lists of them, such as values of IN, are collapsed
+
+    :param statement: SQL statement
+    :type statement: str
+    :rtype: str
+    """
+    statement = STRING_LITERAL_PATTERN.sub("?", statement)
+    statement = PLACEHOLDER_PATTERN.sub("?", statement)
+    statement = NUMBER_LITERAL_PATTERN.sub("?", statement)
+    statement = PLACEHOLDER_LIST_PATTERN.sub("(?)", statement)
+    return WHITESPACE_PATTERN.sub(" ", statement).strip()
+
+
+def _find_origin_method():
+    # Lazy imports, since both modules depend on this module
+    from restful_falcon.core.controller.base import Resource
+    from restful_falcon.core.db.model import BaseModel
+
+    model_method = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        f_locals = frame.f_locals
+        owner = f_locals.get("self")
+        if isinstance(owner, Resource):
+            method = "{}.{}".format(owner.__class__.__name__, frame.f_code.co_name)
+            return method + " -> " + model_method if model_method else method
+        owner = f_locals.get("cls")
+        if model_method is None and isinstance(owner, type) and issubclass(owner, BaseModel):
+            model_method = "{}.{}".format(owner.__name__, frame.f_code.co_name)
+        frame = frame.f_back
+    return model_method or "<unknown>"
+
+
+class QueryStats(object):
+    """
+    Statistics of SQL statements executed in a request, rows are the ones
+    affected by DML statements and the ones fetched of queries
+    """
+    __slots__ = ("origin", "statements", "rows", "duration", "shapes")
+
+    def __init__(self, origin=None):
+        self.origin = origin
+        self.statements = 0
+        self.rows = 0
+        self.duration = 0.0
+        self.shapes = {}
+
+    def record(self, rows, duration):
+        self.statements += 1
+        # Drivers report -1 if the number of rows is unknown, e.g. for DDL
+        self.rows += max(rows, 0)
+        self.duration += duration
+
+    def count_shape(self, statement):
+        """
+        Count executions of the shape of statement
+
+        :param statement: SQL statement
+        :type statement: str
+        :return: number of executions of the shape in the scope
+        :rtype: int
+        """
+        shape = normalize_statement(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        return self.shapes[shape]
+
+    def to_dict(self):
+        return {
+            "origin": self.origin, "statements": self.statements,
+            "rows": self.rows, "duration": self.duration
+        }
+
+    def server_timing(self):
+        """
+        Value of `Server-Timing` header, duration in milliseconds
+
+        :rtype: str
+        """
+        return 'db;dur={:.2f};desc="{} statements, {} rows"'.format(
+            self.duration * 1000, self.statements, self.rows
+        )
+
+
+class QueryStatsScope(object):
+    """
+    Scope of query statistics of a request, statements executed by engines
+    attached by `attach_query_events` are recorded to the current scope
+    """
+    def __init__(self):
+        self._scope = ContextVar("query_stats_scope", default=None)
+
+    def begin(self, origin=None):
+        stats = QueryStats(origin=origin)
+        self._scope.set(stats)
+        return stats
+
+    def current(self):
+        """
+        Statistics of the current scope
+
+        :return: statistics, or None if no scope is active
+        :rtype: QueryStats
+        """
+        return self._scope.get()
+
+    def end(self):
+        stats = self._scope.get()
+        self._scope.set(None)
+        return stats
+
+
+QUERY_STATS_SCOPE = QueryStatsScope()
+
+
+class _RowCountingCursor(object):
+    """
+    DBAPI cursor counting rows fetched to query statistics, since drivers
+    only know the number of rows of a query once they are fetched, e.g.
+    SQLite reports -1. Rows fetched after the scope of the statistics is
+    ended, such as of streamed responses, are still counted to them.
+    """
+    __slots__ = ("_cursor", "_stats")
+
+    def __init__(self, cursor, stats):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_stats", stats)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._stats.rows += 1
+            yield row
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+
+def attach_query_events(engine, slow_query_threshold=None, n_plus_one_threshold=None,
+                        n_plus_one_action=N_PLUS_ONE_WARN):
+    """
+    Record statements executed by engine to the current query statistics
+    scope, and log statements slower than threshold with their parameters
+    and origin. With N+1 detection, which is meant for development and
+    test runs, statements of the same shape executed repeatedly in a
+    request are reported with the resource method issuing them.
+
+    :param engine: engine object
+    :type engine: sqlalchemy.engine.Engine
+    :param slow_query_threshold: seconds, slow statements are not logged if not specified
+    :type slow_query_threshold: float
+    :param n_plus_one_threshold: number of executions of a statement shape in a
+        request to report, N+1 detection is disabled if not specified
+    :type n_plus_one_threshold: int
+    :param n_plus_one_action: warn or raise `NPlusOneQueryError`
+    :type n_plus_one_action: str
+    """
+    if n_plus_one_action not in N_PLUS_ONE_ACTIONS:
+        raise ValueError("N+1 action should be in {}".format(str(N_PLUS_ONE_ACTIONS)))
+    threshold = float(slow_query_threshold) if slow_query_threshold is not None else None
+    n_plus_one_threshold = int(n_plus_one_threshold) if n_plus_one_threshold else None
+
+    # noinspection PyUnusedLocal
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(START_TIMES_KEY, []).append(time.time())
+
+    # noinspection PyUnusedLocal
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get(START_TIMES_KEY)
+        if not start_times:
+            return
+        duration = time.time() - start_times.pop()
+        stats = QUERY_STATS_SCOPE.current()
+        if stats is not None:
+            if cursor.description is None:
+                stats.record(getattr(cursor, "rowcount", -1), duration)
+            else:
+                # Rows of queries, including DML with RETURNING, are counted as fetched
+                stats.record(0, duration)
+                if context is not None and not isinstance(context.cursor, _RowCountingCursor):
+                    context.cursor = _RowCountingCursor(context.cursor, stats)
+        if threshold is not None and duration >= threshold:
+            logger.warning("Slow query ({:.2f} ms) from {}: {} {}".format(
+                duration * 1000, stats.origin if stats is not None and stats.origin else "<unknown>",
+                statement, str(parameters)
+            ))
+        # Each shape is reported once in a request, when it reaches the threshold
+        if stats is not None and n_plus_one_threshold and stats.count_shape(statement) == n_plus_one_threshold:
+            message = "N+1 queries from {} ({}): statement executed {} times: {}".format(
+                _find_origin_method(), stats.origin or "<unknown>",
+                n_plus_one_threshold, normalize_statement(statement)
+            )
+            if n_plus_one_action == N_PLUS_ONE_RAISE:
+                raise NPlusOneQueryError(message)
+            logger.warning(message)
+
+    def handle_error(context):
+        # Statements failed are not followed by `after_cursor_execute`, and executions on a connection
+        # are not nested, so all start times left are of the failed one
+        connection = context.connection
+        if connection is not None:
+            connection.info.pop(START_TIMES_KEY, None)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
@@ -94,7 +94,8 @@ class ManagementUtility(object):
         except CommandError:
             options, args = {}, ()  # Ignore any option errors at this point.
 
-        sys.stdout.write(BANNER + "\n")
+        # Standard output is left to commands, e.g. exported rows
+        sys.stderr.write(BANNER + "\n")
         if os.environ.get("RESTFUL_FALCON_CONFIG"):
             restful_falcon.setup()
         self.load_commands()
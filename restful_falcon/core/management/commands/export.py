@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import sys
+
+from falcon.uri import parse_query_string
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.query import QueryParser
+from restful_falcon.core.controller.query import QuerySpec
+from restful_falcon.core.db.filter import FilterValueError
+from restful_falcon.core.db.filter import coerce_filters
+from restful_falcon.core.db.model import DEFAULT_STREAM_BATCH_SIZE
+from restful_falcon.core.db.model import Model
+from restful_falcon.core.exception import HTTPInvalidParam
+from restful_falcon.core.management.base import BaseCommand
+from restful_falcon.core.management.base import CommandError
+from restful_falcon.util.module import import_cls
+from restful_falcon.util.stream import STREAM_CSV
+from restful_falcon.util.stream import STREAM_NDJSON
+from restful_falcon.util.stream import encode_stream
+
+
+def find_model(name):
+    """
+    Find model by import path, class name or table name
+
+    :param name: import path, class name or table name of model
+    :type name: str
+    :rtype: restful_falcon.core.db.model.Model
+    """
+    if "." in name:
+        try:
+            return import_cls(name, bases=(Model,))
+        except (ImportError, AttributeError, TypeError) as e:
+            raise CommandError("Cannot import model {}: {}".format(name, str(e)))
+    for cls in list(Model._decl_class_registry.values()):
+        if not isinstance(cls, type) or not issubclass(cls, Model):
+            continue
+        if cls.__name__ == name or getattr(cls, "__tablename__", None) == name:
+            return cls
+    raise CommandError("Unknown model: {}".format(name))
+
+
+class ExportCommand(BaseCommand):
+    name = "export"
+    help = "Export rows of a model in primary key order as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "model", action="store",
+            help="Import path, class name or table name of the model"
+        )
+        parser.add_argument(
+            "-f", "--format", action="store", dest="format", default=STREAM_CSV,
+            choices=[STREAM_CSV, STREAM_NDJSON], help="Output format, csv by default"
+        )
+        parser.add_argument(
+            "--fields", action="store", dest="fields",
+            help="Fields to export separated by comma, all fields by default"
+        )
+        parser.add_argument(
+            "--filter", action="append", dest="filters", default=[],
+            help="Filter in query string syntax of list API, e.g. --filter 'name=foo' --filter '__gt=id,100'"
+        )
+        parser.add_argument(
+            "--batch-size", action="store", dest="batch_size", type=int,
+            help="Number of rows read by each query"
+        )
+        parser.add_argument(
+            "-o", "--output", action="store", dest="output",
+            help="Output file, standard output by default"
+        )
+
+    @staticmethod
+    def parse_filters(model, filters):
+        """
+        Parse filters of query string syntax as list API does, with the query
+        policy of configuration and filter values coerced to column types
+
+        :param model: model class
+        :param filters: filters in query string syntax
+        :type filters: list
+        :return: filter list
+        :rtype: list
+        """
+        # Parsed as query parameters of a resource of model without its own query policy
+        parser = QueryParser(type("{}ExportResource".format(model.__name__), (Resource,), {"resource_model": model}))
+        try:
+            spec = parser.parse(parse_query_string("&".join(filters), csv=False))
+            if spec._replace(filters=()) != QuerySpec():
+                raise CommandError("Only filters are allowed: {}".format(" ".join(filters)))
+            parser.policy.check(spec)
+            return coerce_filters(model, list(spec.filters))
+        except HTTPInvalidParam as e:
+            raise CommandError(e.description)
+        except FilterValueError as e:
+            raise CommandError(str(e))
+
+    def handle(self, *args, **options):
+        model = find_model(options["model"])
+        fields = [field.strip() for field in (options.get("fields") or "").split(",") if field.strip()]
+        for field in fields:
+            if field not in model.__table__.columns:
+                raise CommandError("Unknown field of {}: {}".format(model.__name__, field))
+        filters = self.parse_filters(model, options["filters"])
+        try:
+            records = model.perform_export(
+                columns=fields or None, filters=filters,
+                batch_size=options.get("batch_size") or DEFAULT_STREAM_BATCH_SIZE
+            )
+        except ValueError as e:
+            raise CommandError("Cannot export {}: {}".format(model.__name__, str(e)))
+        output = open(options["output"], "wb") if options.get("output") else sys.stdout.buffer
+        try:
+            for chunk in encode_stream(records, options["format"]):
+                output.write(chunk)
+            output.flush()
+        finally:
+            if options.get("output"):
+                output.close()
@@ -36,6 +36,10 @@ class RunServerCommand(BaseCommand):
             "addrport", nargs="?",
             help="Optional port number, or ipaddr:port"
         )
+        parser.add_argument(
+            "--asgi", action="store_true", dest="asgi",
+            help="Serve the ASGI application, which requires uvicorn"
+        )
 
     def handle(self, *args, **options):
         if not options["addrport"]:
@@ -72,8 +76,9 @@ class RunServerCommand(BaseCommand):
         try:
             from restful_falcon.core.config import CONF
             from restful_falcon.core.app import Application
+            from restful_falcon.core.app import AsyncApplication
 
-            application = Application(CONF)
+            application = AsyncApplication(CONF) if options.get("asgi") else Application(CONF)
             application.run(host=self.addr, port=int(self.port))
         except socket.error as e:
             # Use helpful error messages instead of ugly tracebacks.
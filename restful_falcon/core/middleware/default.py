@@ -3,50 +3,318 @@
 # __date__ = "2020/8/28"
 from __future__ import absolute_import
 
+import asyncio
+from functools import partial
+
+from restful_falcon.core.cache import CACHE
+from restful_falcon.core.cache.response import ResponseCache
 from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.db.session import SESSION_SCOPE
+from restful_falcon.core.db.session import client_key
+from restful_falcon.core.db.stats import QUERY_STATS_SCOPE
 from restful_falcon.core.exception import AuthenticationError
 from restful_falcon.core.exception import PermissionError
 from restful_falcon.core.middleware.base import Middleware
+from restful_falcon.util.concurrency import run_sync
 
-__all__ = ["AuthenticationMiddleware", "PermissionMiddleware"]
+__all__ = [
+    "QueryStatsMiddleware", "AsyncQueryStatsMiddleware", "SessionMiddleware", "AsyncSessionMiddleware",
+    "AuthenticationMiddleware", "AsyncAuthenticationMiddleware", "PermissionMiddleware",
+    "AsyncPermissionMiddleware", "ResponseCacheMiddleware", "AsyncResponseCacheMiddleware"
+]
 
 
-class AuthenticationMiddleware(Middleware):
+async def _run_check(check, method, req):
+    if asyncio.iscoroutinefunction(method):
+        return await method(req)
+    if getattr(check, "blocking", True):
+        return await run_sync(method, req)
+    return method(req)
+
+
+class QueryStatsMiddleware(Middleware):
+    """
+    Count SQL statements, rows and database time of each request, the totals
+    are sent in `Server-Timing` header, and slow statements are logged with
+    the resource and route they are from
+    """
+    def process_request(self, req, resp):
+        QUERY_STATS_SCOPE.begin()
+
     def process_resource(self, req, resp, resource, params):
+        stats = QUERY_STATS_SCOPE.current()
+        if stats is not None:
+            stats.origin = "{} {} {}".format(resource.__class__.__name__, req.method, req.uri_template)
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        stats = QUERY_STATS_SCOPE.end()
+        if stats is not None and stats.statements:
+            resp.append_header("Server-Timing", stats.server_timing())
+
+
+class AsyncQueryStatsMiddleware(QueryStatsMiddleware):
+    """
+    Query stats middleware of `restful_falcon.core.app.AsyncApplication`, the
+    scope is begun in the context of the request task
+    """
+    async def process_request(self, req, resp):
+        super(AsyncQueryStatsMiddleware, self).process_request(req, resp)
+
+    async def process_resource(self, req, resp, resource, params):
+        super(AsyncQueryStatsMiddleware, self).process_resource(req, resp, resource, params)
+
+    async def process_response(self, req, resp, resource, req_succeeded):
+        super(AsyncQueryStatsMiddleware, self).process_response(req, resp, resource, req_succeeded)
+
+
+class SessionMiddleware(Middleware):
+    """
+    Open a request scope for database session, the session is created on first
+    use, committed if the request succeeds or rolled back otherwise, and always
+    closed at the end of request. A client whose request wrote is pinned to the
+    primary if `read_your_writes` is configured.
+    """
+    def process_request(self, req, resp):
+        SESSION_SCOPE.begin(client=client_key(req))
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        SESSION_SCOPE.end(commit=req_succeeded and int(resp.status[:3]) < 400)
+
+
+class AsyncSessionMiddleware(SessionMiddleware):
+    """
+    Session middleware of `restful_falcon.core.app.AsyncApplication`. The scope
+    is begun in the context of the request task, so the blocking calls it runs
+    in executor share it, and it is ended in executor.
+    """
+    async def process_request(self, req, resp):
+        SESSION_SCOPE.begin(client=client_key(req))
+
+    async def process_response(self, req, resp, resource, req_succeeded):
+        if SESSION_SCOPE.current() is None:
+            # Requests never touching the database take no thread to end the scope
+            SESSION_SCOPE.end()
+            return
+        await run_sync(SESSION_SCOPE.end, commit=req_succeeded and int(resp.status[:3]) < 400)
+
+
+class ResponseCacheMiddleware(Middleware):
+    """
+    Serve GET requests of resources declaring `response_cache` from cached
+    serialized responses, which are invalidated by writes to models they are
+    read from. With single flight, concurrent identical requests missing the
+    cache wait for the first one and share its response. It should follow
+    authentication and permission middlewares, since cached responses skip
+    the resource.
+    """
+    def __init__(self, cache=None, single_flight=None):
+        """
+        ResponseCacheMiddleware constructor
+
+        :param cache: cache client, `restful_falcon.core.cache.CACHE` by default
+        :type cache: restful_falcon.core.cache.client.CacheClient
+        :param single_flight: single flight coalescing requests missing the cache
+        :type single_flight: restful_falcon.core.cache.flight.SingleFlight
+        """
+        cache = cache if cache is not None else CACHE
+        if cache is None:
+            raise ValueError("Cache is not configured")
+        self.response_cache = ResponseCache(cache)
+        self.response_cache.watch()
+        self.single_flight = single_flight
+
+    @staticmethod
+    def flight_key(key, generations):
+        # Requests after a write do not wait for responses made before it
+        return "{}:{}".format(key, ",".join("{}={}".format(*generation) for generation in generations))
+
+    def process_resource(self, req, resp, resource, params):
+        prepared = self.response_cache.prepare(req, resource)
+        if prepared is None:
+            return
+        key, generations, _ = prepared
+        entry = self.response_cache.load(key, generations)
+        if entry is None and self.single_flight is not None:
+            entry = self._join_flight(req, key, generations)
+        if entry is not None:
+            self.response_cache.respond(req, resp, entry)
+            return
+        req.context.response_cache = prepared
+
+    def _join_flight(self, req, key, generations):
+        flight_key = self.flight_key(key, generations)
+        leader, future = self.single_flight.join(flight_key)
+        if not leader:
+            return self.single_flight.wait(future)
+        if self.single_flight.acquire(flight_key):
+            req.context.flight = (flight_key, True)
+            return None
+        # The leader of another process is making the response
+        entry = self.single_flight.poll(flight_key, partial(self.response_cache.load, key, generations))
+        if entry is None:
+            req.context.flight = (flight_key, False)
+            return None
+        self.single_flight.land(flight_key, result=entry)
+        return entry
+
+    def process_response(self, req, resp, resource, req_succeeded):
+        prepared = getattr(req.context, "response_cache", None)
+        entry = None
+        if prepared is not None and req_succeeded:
+            key, generations, expire = prepared
+            entry = self.response_cache.make_entry(generations, resp)
+            if entry is not None:
+                self.response_cache.store(key, entry, expire=expire)
+        flight = getattr(req.context, "flight", None)
+        if flight is not None:
+            self.single_flight.land(*flight, result=entry)
+
+
+class AsyncResponseCacheMiddleware(ResponseCacheMiddleware):
+    """
+    Response cache middleware of `restful_falcon.core.app.AsyncApplication`,
+    requests waiting for single flight are awaited in the event loop instead
+    of blocking executor threads
+    """
+    async def process_resource(self, req, resp, resource, params):
+        prepared = await run_sync(self.response_cache.prepare, req, resource)
+        if prepared is None:
+            return
+        key, generations, _ = prepared
+        entry = await run_sync(self.response_cache.load, key, generations)
+        if entry is None and self.single_flight is not None:
+            entry = await self._join_flight_async(req, key, generations)
+        if entry is not None:
+            self.response_cache.respond(req, resp, entry)
+            return
+        req.context.response_cache = prepared
+
+    async def _join_flight_async(self, req, key, generations):
+        flight_key = self.flight_key(key, generations)
+        leader, future = self.single_flight.join(flight_key)
+        if not leader:
+            return await self.single_flight.wait_async(future)
+        if await run_sync(self.single_flight.acquire, flight_key):
+            req.context.flight = (flight_key, True)
+            return None
+        entry = await self.single_flight.poll_async(
+            flight_key, partial(run_sync, self.response_cache.load, key, generations)
+        )
+        if entry is None:
+            req.context.flight = (flight_key, False)
+            return None
+        self.single_flight.land(flight_key, result=entry)
+        return entry
+
+    async def process_response(self, req, resp, resource, req_succeeded):
+        await run_sync(super().process_response, req, resp, resource, req_succeeded)
+
+
+class AuthenticationMiddleware(Middleware):
+    @staticmethod
+    def authentications(resource):
+        """
+        Authentications of resource
+
+        :param resource: resource object
+        :return: authentication list, None if resource requires no authentication
+        :rtype: list
+        """
         if isinstance(resource, Resource) or hasattr(resource, "authentications"):
             if callable(resource.authentications):
                 authentications = resource.authentications()
             else:
                 authentications = resource.authentications
             if not authentications:
-                return
+                return None
             if not isinstance(authentications, list):
                 authentications = [authentications]
-            for authentication in authentications:
-                if authentication.match(req):
-                    req.user = authentication.authenticate(req)
-                    if req.user:
-                        break
-            if not req.user:
-                raise AuthenticationError(
-                    description="Incorrect credentials"
-                )
+            return authentications
+        return None
+
+    def process_resource(self, req, resp, resource, params):
+        authentications = self.authentications(resource)
+        if authentications is None:
+            return
+        for authentication in authentications:
+            if authentication.match(req):
+                req.user = authentication.authenticate(req)
+                if req.user:
+                    break
+        if not req.user:
+            raise AuthenticationError(
+                description="Incorrect credentials"
+            )
+
+
+class AsyncAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    Authentication middleware of `restful_falcon.core.app.AsyncApplication`.
+    Coroutine `authenticate` is awaited, authentications run in executor
+    unless `blocking` is unset, which run in the event loop.
+    """
+    async def process_resource(self, req, resp, resource, params):
+        authentications = self.authentications(resource)
+        if authentications is None:
+            return
+        for authentication in authentications:
+            if authentication.match(req):
+                req.user = await _run_check(authentication, authentication.authenticate, req)
+                if req.user:
+                    break
+        if not req.user:
+            raise AuthenticationError(
+                description="Incorrect credentials"
+            )
 
 
 class PermissionMiddleware(Middleware):
-    def process_resource(self, req, resp, resource, params):
+    @staticmethod
+    def permissions(resource):
+        """
+        Permissions of resource
+
+        :param resource: resource object
+        :return: permission list, None if resource requires no permission
+        :rtype: list
+        """
         if isinstance(resource, Resource) or hasattr(resource, "permissions"):
             if callable(resource.permissions):
                 permissions = resource.permissions()
             else:
                 permissions = resource.permissions
             if not permissions:
-                return
+                return None
             if not isinstance(permissions, list):
                 permissions = [permissions]
-            for permission in permissions:
-                if permission.has_permission(req):
-                    return
-            raise PermissionError(
-                description="Not allowed to operate the resource"
-            )
+            return permissions
+        return None
+
+    def process_resource(self, req, resp, resource, params):
+        permissions = self.permissions(resource)
+        if permissions is None:
+            return
+        for permission in permissions:
+            if permission.has_permission(req):
+                return
+        raise PermissionError(
+            description="Not allowed to operate the resource"
+        )
+
+
+class AsyncPermissionMiddleware(PermissionMiddleware):
+    """
+    Permission middleware of `restful_falcon.core.app.AsyncApplication`.
+    Coroutine `has_permission` is awaited, permissions run in executor
+    unless `blocking` is unset, which run in the event loop.
+    """
+    async def process_resource(self, req, resp, resource, params):
+        permissions = self.permissions(resource)
+        if permissions is None:
+            return
+        for permission in permissions:
+            if await _run_check(permission, permission.has_permission, req):
+                return
+        raise PermissionError(
+            description="Not allowed to operate the resource"
+        )
@@ -23,6 +23,10 @@ class AND:
         self.op1 = op1
         self.op2 = op2
 
+    @property
+    def blocking(self):
+        return getattr(self.op1, "blocking", True) or getattr(self.op2, "blocking", True)
+
     def has_permission(self, req):
         return (
             self.op1.has_permission(req) &
@@ -35,6 +39,10 @@ class OR:
         self.op1 = op1
         self.op2 = op2
 
+    @property
+    def blocking(self):
+        return getattr(self.op1, "blocking", True) or getattr(self.op2, "blocking", True)
+
     def has_permission(self, req):
         return (
             self.op1.has_permission(req) |
@@ -60,6 +68,10 @@ class Permission(object, metaclass=PermissionMetaclass):
     """
     A base class from which all permission classes should inherit.
     """
+    # `AsyncApplication` runs permissions in executor, since they may do blocking I/O.
+    # Those doing none may unset it to run in the event loop, or define coroutine
+    # `has_permission`
+    blocking = True
 
     def has_permission(self, req):
         """
@@ -15,6 +15,7 @@ class AllowAny(Permission):
     permission_classes list, but it's useful because it makes the intention
     more explicit.
     """
+    blocking = False
 
     def has_permission(self, req):
         return True
@@ -24,6 +25,7 @@ class IsAuthenticated(Permission):
     """
     Allows access only to authenticated users.
     """
+    blocking = False
 
     def has_permission(self, req):
         return req.user and req.user.is_authenticated
@@ -33,6 +35,7 @@ class IsAdminUser(Permission):
     """
     Allows access only to admin users.
     """
+    blocking = False
 
     def has_permission(self, req):
         return req.user and req.user.is_admin
@@ -43,6 +46,7 @@ class IsAuthenticatedOrReadOnly(Permission):
     The request is authenticated as a user, or is a read-only request.
     """
     SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    blocking = False
 
     def has_permission(self, req):
         return (
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+
+__all__ = ["configure_executor", "run_sync", "call_async", "pinned_thread", "LanePool"]
+
+_lock = threading.Lock()
+_executor = None
+_lanes = None
+
+# Lane of the current request, see `pinned_thread`
+_LANE_SCOPE = contextvars.ContextVar("lane_scope", default=None)
+
+
+def _default_workers():
+    # The default of `ThreadPoolExecutor`
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class LanePool(object):
+    """
+    Pool of single thread executors, called lanes. A lane is held by one
+    request at a time, so all blocking calls of the request run on the same
+    thread, which database connections and sessions may be bound to, e.g.
+    of SQLite. Requests wait for a free lane without blocking the event loop.
+    """
+    def __init__(self, size):
+        """
+        LanePool constructor
+
+        :param size: number of lanes, which bounds the number of requests running blocking calls
+        :type size: int
+        """
+        self.size = max(int(size), 1)
+        self._lanes = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="restful-falcon-lane{}".format(i))
+            for i in range(0, self.size)
+        ]
+        self._free = None
+        self._loop = None
+
+    async def acquire(self):
+        """
+        Acquire a free lane
+
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        loop = asyncio.get_event_loop()
+        if self._free is None or self._loop is not loop:
+            # Queues are bound to the event loop they are first used in
+            self._loop = loop
+            self._free = asyncio.Queue()
+            for lane in self._lanes:
+                self._free.put_nowait(lane)
+        return await self._free.get()
+
+    def release(self, lane):
+        self._free.put_nowait(lane)
+
+    def shutdown(self):
+        for lane in self._lanes:
+            lane.shutdown(wait=False)
+
+
+def configure_executor(max_workers=None):
+    """
+    Configure the executor running blocking calls for coroutines, and the
+    lanes running blocking calls of requests, which bound the number of
+    blocking calls running at the same time
+
+    :param max_workers: maximum number of threads, default of
+        `ThreadPoolExecutor` if not specified
+    :type max_workers: int
+    """
+    global _executor, _lanes
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        if _lanes is not None:
+            _lanes.shutdown()
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="restful-falcon")
+        _lanes = LanePool(max_workers or _default_workers())
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(thread_name_prefix="restful-falcon")
+    return _executor
+
+
+def _get_lanes():
+    global _lanes
+    if _lanes is None:
+        with _lock:
+            if _lanes is None:
+                _lanes = LanePool(_default_workers())
+    return _lanes
+
+
+@asynccontextmanager
+async def pinned_thread():
+    """
+    Pin blocking calls run by `run_sync` in the context to one thread, e.g.
+    all of a request, so that its session and connection are only used from
+    the thread they are created in. The thread is taken on the first call.
+    """
+    if _LANE_SCOPE.get() is not None:
+        yield
+        return
+    scope = {"lane": None, "lanes": _get_lanes()}
+    token = _LANE_SCOPE.set(scope)
+    try:
+        yield
+    finally:
+        _LANE_SCOPE.reset(token)
+        if scope["lane"] is not None:
+            scope["lanes"].release(scope["lane"])
+
+
+async def run_sync(func, *args, **kwargs):
+    """
+    Run a blocking function in executor without blocking the event loop,
+    the context variables of caller are visible to it. Inside
+    `pinned_thread`, it runs on the thread pinned.
+
+    :param func: blocking function
+    :return: result of function
+    """
+    loop = asyncio.get_event_loop()
+    context = contextvars.copy_context()
+    scope = _LANE_SCOPE.get()
+    if scope is None:
+        executor = _get_executor()
+    else:
+        if scope["lane"] is None:
+            lane = await scope["lanes"].acquire()
+            # Calls gathered by the request may have acquired one meanwhile
+            if scope["lane"] is None:
+                scope["lane"] = lane
+            else:
+                scope["lanes"].release(lane)
+        executor = scope["lane"]
+    return await loop.run_in_executor(executor, partial(context.run, func, *args, **kwargs))
+
+
+async def call_async(func, *args, **kwargs):
+    """
+    Await func if it is a coroutine function, otherwise run it in executor
+
+    :param func: coroutine function or blocking function
+    :return: result of function
+    """
+    if asyncio.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await run_sync(func, *args, **kwargs)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import csv
+from io import StringIO
+
+from restful_falcon.util.json import JSONEncoder
+from restful_falcon.util.json import dumps
+
+__all__ = [
+    "STREAM_JSON", "STREAM_NDJSON", "STREAM_CSV", "STREAM_FORMATS", "STREAM_CONTENT_TYPES",
+    "iter_json", "iter_ndjson", "iter_csv", "encode_stream"
+]
+
+STREAM_JSON = "json"
+STREAM_NDJSON = "ndjson"
+STREAM_CSV = "csv"
+STREAM_FORMATS = (STREAM_JSON, STREAM_NDJSON, STREAM_CSV)
+
+STREAM_CONTENT_TYPES = {
+    STREAM_JSON: "application/json",
+    STREAM_NDJSON: "application/x-ndjson",
+    STREAM_CSV: "text/csv"
+}
+
+# Records encoded into one chunk, so that chunks are not too small to write
+DEFAULT_CHUNK_RECORDS = 100
+
+
+def _close(records):
+    # Records are released as soon as the response is closed, even if they are not consumed
+    close = getattr(records, "close", None)
+    close and close()
+
+
+def iter_json(records, chunk_records=DEFAULT_CHUNK_RECORDS):
+    """
+    Encode records incrementally into a JSON object `{"data": [...]}`
+
+    :param records: iterable of records
+    :type records: collections.Iterable
+    :param chunk_records: number of records encoded into one chunk
+    :type chunk_records: int
+    :return: iterator of encoded chunks
+    :rtype: collections.Iterator
+    """
+    yield b'{"data": ['
+    chunk = []
+    separator = ""
+    try:
+        for record in records:
+            chunk.append(separator + dumps(record))
+            separator = ", "
+            if len(chunk) >= chunk_records:
+                yield "".join(chunk).encode("utf-8")
+                chunk = []
+    finally:
+        _close(records)
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+    yield b"]}"
+
+
+def iter_ndjson(records, chunk_records=DEFAULT_CHUNK_RECORDS):
+    """
+    Encode records incrementally into newline delimited JSON
+
+    :param records: iterable of records
+    :type records: collections.Iterable
+    :param chunk_records: number of records encoded into one chunk
+    :type chunk_records: int
+    :return: iterator of encoded chunks
+    :rtype: collections.Iterator
+    """
+    chunk = []
+    try:
+        for record in records:
+            chunk.append(dumps(record) + "\n")
+            if len(chunk) >= chunk_records:
+                yield "".join(chunk).encode("utf-8")
+                chunk = []
+    finally:
+        _close(records)
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+_ENCODER = JSONEncoder()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float)):
+        return value
+    try:
+        # Values are formatted the same as in JSON
+        return _ENCODER.default(value)
+    except TypeError:
+        return str(value)
+
+
+def iter_csv(records, chunk_records=DEFAULT_CHUNK_RECORDS):
+    """
+    Encode records incrementally into CSV, the header is made of keys of
+    the first record
+
+    :param records: iterable of records
+    :type records: collections.Iterable
+    :param chunk_records: number of records encoded into one chunk
+    :type chunk_records: int
+    :return: iterator of encoded chunks
+    :rtype: collections.Iterator
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    header = None
+    count = 0
+    try:
+        for record in records:
+            if header is None:
+                header = list(record.keys())
+                writer.writerow(header)
+            writer.writerow([_csv_value(record.get(key)) for key in header])
+            count += 1
+            if count >= chunk_records:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                count = 0
+    finally:
+        _close(records)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+ENCODERS = {
+    STREAM_JSON: iter_json,
+    STREAM_NDJSON: iter_ndjson,
+    STREAM_CSV: iter_csv
+}
+
+
+def encode_stream(records, stream_format=STREAM_JSON, chunk_records=DEFAULT_CHUNK_RECORDS):
+    """
+    Encode records incrementally in stream format
+
+    :param records: iterable of records
+    :type records: collections.Iterable
+    :param stream_format: stream format in [json, ndjson, csv]
+    :type stream_format: str
+    :param chunk_records: number of records encoded into one chunk
+    :type chunk_records: int
+    :return: iterator of encoded chunks
+    :rtype: collections.Iterator
+    """
+    if stream_format not in ENCODERS:
+        raise ValueError("Stream format should be in {}".format(str(STREAM_FORMATS)))
+    return ENCODERS[stream_format](records, chunk_records=chunk_records)
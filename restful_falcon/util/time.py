@@ -10,13 +10,30 @@ from functools import partial
 
 from restful_falcon.core.config import CONF
 
-__all__ = ["now"]
+__all__ = ["now", "to_utc"]
 
 
+time_zone = None
 if getattr(CONF, "utc", False):
     now = datetime.datetime.utcnow
 else:
-    time_zone = None
     if hasattr(CONF, "time_zone"):
         time_zone = tz.gettz(CONF.time_zone)
     now = partial(datetime.datetime.now, tz=time_zone)
+
+
+def to_utc(value):
+    """
+    Convert datetime made by `now` to naive UTC datetime, naive datetime
+    is in the configured time zone, or the local time zone if not configured
+
+    :param value: datetime
+    :type value: datetime.datetime
+    :rtype: datetime.datetime
+    """
+    if value.tzinfo is None:
+        if getattr(CONF, "utc", False):
+            return value
+        if time_zone is not None:
+            value = value.replace(tzinfo=time_zone)
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
@@ -17,10 +17,11 @@ setup(
     author="wynterwang",
     author_email="wynterwang@foxmail.com",
 
-    packages=find_packages(),
+    packages=find_packages(exclude=("tests", "tests.*")),
     include_package_data=True,
     platforms="any",
     install_requires=[
+        # Pinned exactly since `AsyncApplication` uses private methods of falcon
         "falcon==2.0.0",
         "SQLAlchemy==1.3.18",
         "Mako==1.1.3",
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+
+from restful_falcon.core.db.engine import create_engine
+from restful_falcon.core.db.model import Model
+# Tables of test models are created from metadata
+from tests import models  # noqa: F401
+
+
+def make_engine(path, **config):
+    config.setdefault("options", {})
+    engine = create_engine(dict(config, url="sqlite:///{}".format(path)))
+    Model.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Engine of a file SQLite database bound to `Session`, file databases keep
+    the thread checks of SQLite unlike in-memory ones
+    """
+    engine = make_engine(tmp_path / "test.db")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+from sqlalchemy.orm import relationship
+
+from restful_falcon.core.db.mixin import IdAndTimeColumnsMixin
+from restful_falcon.core.db.mixin import UserColumnsMixin
+from restful_falcon.core.db.model import Column
+from restful_falcon.core.db.model import ForeignKey
+from restful_falcon.core.db.model import Model
+from restful_falcon.core.db.model import Table
+from restful_falcon.core.db.model import UniqueConstraint
+from restful_falcon.core.db.type import Boolean
+from restful_falcon.core.db.type import Integer
+from restful_falcon.core.db.type import String
+
+
+class Item(Model, IdAndTimeColumnsMixin):
+    name = Column(String(64))
+    age = Column(Integer)
+    flag = Column(Boolean, default=False)
+
+
+class Note(Model, IdAndTimeColumnsMixin, UserColumnsMixin):
+    __table_args__ = (UniqueConstraint("code"),)
+    code = Column(String(32), nullable=False)
+    text = Column(String(256))
+
+
+class Pair(Model):
+    k = Column(String(32), primary_key=True)
+    n = Column(Integer, primary_key=True)
+    text = Column(String(256))
+
+
+class Reading(Model):
+    # Mapped by a key of mapper only, the table has no primary key
+    __table__ = Table("readings", Model.metadata, Column("sensor", String(32)), Column("value", Integer))
+    __mapper_args__ = {"primary_key": [__table__.c.sensor]}
+
+
+class Shelf(Model, IdAndTimeColumnsMixin):
+    name = Column(String(64))
+    books = relationship("Book", back_populates="shelf", order_by="Book.id")
+
+
+class Book(Model, IdAndTimeColumnsMixin):
+    shelf_id = Column(Integer, ForeignKey("shelfs.id"))
+    title = Column(String(64))
+    shelf = relationship("Shelf", back_populates="books")
+    pages = relationship("Page", order_by="Page.id")
+
+
+class Page(Model, IdAndTimeColumnsMixin):
+    book_id = Column(Integer, ForeignKey("books.id"))
+    number = Column(Integer)
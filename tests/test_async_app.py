@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import asyncio
+import threading
+
+import pytest
+
+from restful_falcon.core.app import AsyncApplication
+from restful_falcon.core.auth.base import Authentication
+from restful_falcon.core.config import _Configuration
+from restful_falcon.core.controller.async_mixin import AsyncResourceOperatesMixin
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.router import Router
+from restful_falcon.core.router import route
+from tests.models import Item
+from tests.utils import USER_HEADER
+from tests.utils import AsgiClient
+from tests.utils import HeaderAuthentication
+from tests.utils import TestUser
+from tests.utils import seed
+from tests.utils import user_headers
+
+
+class ThreadRecordingAuthentication(HeaderAuthentication):
+    threads = []
+
+    def authenticate(self, req):
+        self.threads.append(threading.current_thread())
+        return super(ThreadRecordingAuthentication, self).authenticate(req)
+
+
+class ItemAuthentication(Authentication):
+    """
+    Authenticate user by id of item in `X-User` header, queried from database
+    """
+    threads = []
+
+    def authenticate(self, req):
+        self.threads.append(threading.current_thread())
+        item = Item.perform_show_by(filters=[("id", int(req.get_header(USER_HEADER) or 0))])
+        return TestUser(item["age"]) if item else None
+
+
+class ItemResource(Resource, AsyncResourceOperatesMixin):
+    resource_model = Item
+
+
+class AuthItemResource(ItemResource):
+    authentication_classes = [ThreadRecordingAuthentication]
+
+    async def list(self, context, filters=None, orders=None, limit=None, offset=None):
+        count, records = await self.resource_model.perform_list_async(
+            columns=["id"], filters=filters, limit=limit, offset=offset, session=context.session
+        )
+        return count, [dict(record, user=context.request.user.user_id) for record in records]
+
+
+class ItemAuthItemResource(AuthItemResource):
+    authentication_classes = [ItemAuthentication]
+
+
+@pytest.fixture
+def client(engine):
+    seed(Item, [{"name": "n{}".format(i), "age": i % 5} for i in range(0, 20)])
+    resource = ItemResource()
+    router = Router(routes=[
+        route("/items", resource), route("/items/{rid:int}", resource, suffix="item"),
+        route("/auth/items", AuthItemResource()), route("/item-auth/items", ItemAuthItemResource())
+    ])
+    # A new application rather than the singleton one, which is built once per process
+    app = AsyncApplication.__wrapped__(_Configuration({"router": router, "async_workers": 4}))
+    return AsgiClient(app)
+
+
+def test_concurrent_reads_on_file_sqlite(client):
+    async def main():
+        return await asyncio.gather(*(client.request("GET", "/items", "age=1") for _ in range(0, 20)))
+
+    results = asyncio.run(main())
+    assert [status for status, _ in results] == [200] * 20
+    assert all(body["count"] == 4 for _, body in results)
+
+
+def test_concurrent_writes_on_file_sqlite(client):
+    async def main():
+        return await asyncio.gather(*(
+            client.request("PUT", "/items/{}".format(i % 10 + 1), body={"age": i}) for i in range(0, 20)
+        ))
+
+    results = asyncio.run(main())
+    assert [status for status, _ in results] == [200] * 20
+    for row in Item.perform_list(columns=["id", "age"], filters=[("le", ("id", 10))])[1]:
+        assert row["age"] in (row["id"] - 1, row["id"] + 9)
+
+
+def test_authentication_runs_in_event_loop(client):
+    async def main():
+        return threading.current_thread(), await client.request(
+            "GET", "/auth/items", "__limit=2", headers=user_headers(7)
+        )
+
+    loop_thread, (status, body) = asyncio.run(main())
+    assert status == 200
+    assert ThreadRecordingAuthentication.threads == [loop_thread]
+    assert body["data"] == [{"id": 1, "user": 7}, {"id": 2, "user": 7}]
+    assert asyncio.run(client.request("GET", "/auth/items"))[0] == 401
+
+
+def test_authentication_querying_database_runs_in_executor(client):
+    async def main():
+        return threading.current_thread(), await asyncio.gather(*(
+            client.request("GET", "/item-auth/items", "__limit=1", headers=user_headers(i + 1)) for i in range(0, 4)
+        ))
+
+    loop_thread, results = asyncio.run(main())
+    # The session of request scope opened by authentication is used by the resource on the same thread
+    assert [status for status, _ in results] == [200] * 4
+    assert [body["data"] for _, body in results] == [[{"id": 1, "user": i % 5}] for i in range(0, 4)]
+    assert len(ItemAuthentication.threads) == 4
+    assert loop_thread not in ItemAuthentication.threads
+    assert asyncio.run(client.request("GET", "/item-auth/items", headers=user_headers(100)))[0] == 401
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.controller.mixin import UpsertOperateMixin
+from tests.models import Item
+from tests.models import Note
+from tests.utils import make_api
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+class NoteResource(Resource, ResourceOperatesMixin, UpsertOperateMixin):
+    resource_model = Note
+    upsert_conflict_columns = ["code"]
+
+
+@pytest.fixture
+def client(engine):
+    return testing.TestClient(make_api([("/items", ItemResource()), ("/notes", NoteResource())]))
+
+
+def test_bulk_create_reports_each_record(client):
+    result = client.simulate_post("/items", json=[{"name": "a"}, 3, {"name": "b", "unknown": 1}, {"name": "c"}])
+    assert result.status_code == 207
+    assert result.json["count"] == 4
+    assert result.json["created"] == 2
+    assert result.json["failed"] == 2
+    assert [(row["index"], row["status"]) for row in result.json["data"]] == [
+        (0, "created"), (1, "failed"), (2, "failed"), (3, "created")
+    ]
+
+
+def test_bulk_upsert_reports_each_record(client):
+    result = client.simulate_put("/notes", json=[{"code": "a"}, {"code": "b"}])
+    assert result.status_code == 200
+    assert result.json["upserted"] == 2
+    result = client.simulate_put("/notes", json=[{"code": "a", "text": "x"}, {"text": "y"}])
+    assert result.status_code == 207
+    assert [row["status"] for row in result.json["data"]] == ["upserted", "failed"]
+    assert Note.perform_show_by([("code", "a")], columns=["text"]) == {"text": "x"}
+
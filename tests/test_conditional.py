@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import asyncio
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.app import AsyncApplication
+from restful_falcon.core.config import _Configuration
+from restful_falcon.core.controller.async_mixin import AsyncResourceOperatesMixin
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.db.stats import QUERY_STATS_SCOPE
+from restful_falcon.core.router import Router
+from restful_falcon.core.router import route
+from tests.models import Item
+from tests.utils import AsgiClient
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+class TaggedItemResource(ItemResource):
+    list_etag = True
+
+
+class AsyncItemResource(Resource, AsyncResourceOperatesMixin):
+    resource_model = Item
+
+
+@pytest.fixture
+def client(engine):
+    seed(Item, [{"name": "n{}".format(i), "age": i} for i in range(0, 3)])
+    resource = ItemResource()
+    return testing.TestClient(make_api([
+        ("/items", resource), ("/items/{rid:int}", resource, "item"), ("/tagged", TaggedItemResource())
+    ]))
+
+
+def get(client, path, **kwargs):
+    stats = QUERY_STATS_SCOPE.begin()
+    try:
+        return client.simulate_get(path, **kwargs), stats.statements
+    finally:
+        QUERY_STATS_SCOPE.end()
+
+
+def test_item_etag_comes_from_loaded_row(client):
+    result, statements = get(client, "/items/1")
+    assert result.status_code == 200 and statements == 1
+    etag = result.headers["etag"]
+    result, statements = get(client, "/items/1", headers={"If-None-Match": etag})
+    assert result.status_code == 304 and statements == 1
+    assert result.headers["etag"] == etag
+    result, _ = get(client, "/items/1", headers={"If-Modified-Since": result.headers["last-modified"]})
+    assert result.status_code == 304
+    result, _ = get(client, "/items/1", headers={"If-None-Match": 'W/"other"'})
+    assert result.status_code == 200 and result.headers["etag"] == etag
+    result, _ = get(client, "/items/1", params={"__fields": "id,name"})
+    assert result.status_code == 200 and "etag" not in result.headers
+
+
+def test_list_version_is_checked_for_conditional_requests(client):
+    result, statements = get(client, "/items")
+    assert result.status_code == 200 and statements == 2
+    assert "etag" not in result.headers
+    result, statements = get(client, "/tagged")
+    assert result.status_code == 200 and statements == 3
+    result, statements = get(client, "/items", headers={"If-None-Match": result.headers["etag"]})
+    assert result.status_code == 304 and statements == 1
+
+
+def test_async_conditional_get(engine):
+    seed(Item, [{"name": "a", "age": 1}])
+    resource = AsyncItemResource()
+    router = Router(routes=[route("/items", resource), route("/items/{rid:int}", resource, suffix="item")])
+    client = AsgiClient(AsyncApplication.__wrapped__(_Configuration({"router": router})))
+
+    async def main():
+        status, _ = await client.request("GET", "/items/1")
+        etag = client.headers["etag"]
+        assert status == 200
+        status, _ = await client.request("GET", "/items/1", headers={"If-None-Match": etag})
+        assert status == 304
+        status, _ = await client.request("GET", "/items")
+        assert status == 200 and "etag" not in client.headers
+
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.db.count import COUNT_EXACT
+from restful_falcon.core.db.count import COUNT_NONE
+from restful_falcon.core.db.count import COUNT_WINDOW
+from restful_falcon.core.db.model import READ_PATH_CORE
+from restful_falcon.core.db.model import READ_PATH_ORM
+from tests.models import Item
+from tests.utils import make_api
+from tests.utils import seed
+
+QUERIES = [
+    {},
+    {"columns": ["id", "name"]},
+    {"filters": [("age", 1)], "orders": [("name", "desc")]},
+    {"filters": [("in", ("age", [0, 2])), ("flag", True)], "columns": ["name", "age"], "limit": 3, "offset": 1},
+    {"filters": [("or", [("lt", ("age", 1)), ("like", ("name", "n1%"))])], "orders": [("age", "asc"), ("id", "desc")]},
+    {"filters": [("gt", ("age", 9))]},
+]
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+class CoreItemResource(ItemResource):
+    read_path = READ_PATH_CORE
+
+
+@pytest.fixture
+def items(engine):
+    seed(Item, [{"name": "n{}".format(i), "age": i % 3, "flag": i % 2 == 0} for i in range(0, 12)])
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("count_strategy", [COUNT_EXACT, COUNT_WINDOW, COUNT_NONE])
+def test_core_list_returns_rows_and_count_of_orm_list(items, query, count_strategy):
+    orm = Item.perform_list(read_path=READ_PATH_ORM, count_strategy=count_strategy, **query)
+    core = Item.perform_list(read_path=READ_PATH_CORE, count_strategy=count_strategy, **query)
+    assert core == orm
+
+
+def test_core_show_returns_record_of_orm_show(items):
+    for filters, columns in (([("id", 3)], None), ([("id", 3)], ["name"]), ([("name", "n5"), ("age", 2)], None)):
+        orm = Item.perform_show_by(filters, columns=columns, read_path=READ_PATH_ORM)
+        assert orm and Item.perform_show_by(filters, columns=columns, read_path=READ_PATH_CORE) == orm
+    assert Item.perform_show_by([("id", 100)], read_path=READ_PATH_CORE) == {}
+
+
+def test_core_resource_responds_as_orm_resource(items):
+    client = testing.TestClient(make_api([
+        ("/orm/items", ItemResource()), ("/orm/items/{rid:int}", ItemResource(), "item"),
+        ("/core/items", CoreItemResource()), ("/core/items/{rid:int}", CoreItemResource(), "item")
+    ]))
+    for path, query_string in (
+        ("items", "age=1&__order=name,desc&__fields=id,name"), ("items", "__gte=age,1&__limit=2&__offset=3"),
+        ("items/4", "__fields=name,flag")
+    ):
+        orm = client.simulate_get("/orm/{}".format(path), query_string=query_string)
+        core = client.simulate_get("/core/{}".format(path), query_string=query_string)
+        assert orm.status_code == core.status_code == 200
+        assert core.json == orm.json
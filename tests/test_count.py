@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.db.count import COUNT_ESTIMATE
+from restful_falcon.core.db.count import COUNT_EXACT
+from restful_falcon.core.db.count import COUNT_NONE
+from restful_falcon.core.db.count import COUNT_STRATEGIES
+from restful_falcon.core.db.count import COUNT_WINDOW
+from restful_falcon.core.db.model import READ_PATH_CORE
+from restful_falcon.core.db.model import READ_PATH_ORM
+from restful_falcon.core.db.stats import QUERY_STATS_SCOPE
+from tests.models import Item
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+class WindowItemResource(ItemResource):
+    count_strategy = COUNT_WINDOW
+
+
+@pytest.fixture
+def items(engine):
+    seed(Item, [{"name": "n{}".format(i), "age": i % 3} for i in range(0, 10)])
+
+
+@pytest.fixture
+def client(items):
+    return testing.TestClient(make_api([("/items", ItemResource()), ("/window/items", WindowItemResource())]))
+
+
+def perform_list(**kwargs):
+    """
+    List items, and the number of statements executed
+    """
+    stats = QUERY_STATS_SCOPE.begin()
+    try:
+        return Item.perform_list(**kwargs), stats.statements
+    finally:
+        QUERY_STATS_SCOPE.end()
+
+
+@pytest.mark.parametrize("read_path", [READ_PATH_ORM, READ_PATH_CORE])
+def test_count_strategies(items, read_path):
+    filters, orders = [("age", 1)], [("id", "asc")]
+    expected = [i + 1 for i in range(0, 10) if i % 3 == 1][1:3]
+    for count_strategy, count, statements in (
+            (COUNT_EXACT, 3, 2),
+            (COUNT_WINDOW, 3, 1),
+            # SQLite has no planner statistics, the estimate falls back to an exact count
+            (COUNT_ESTIMATE, 3, 2),
+            (COUNT_NONE, None, 1)):
+        (_count, records), _statements = perform_list(
+            filters=filters, orders=orders, limit=2, offset=1, count_strategy=count_strategy, read_path=read_path
+        )
+        assert (_count, _statements) == (count, statements), count_strategy
+        assert [record["id"] for record in records] == expected
+        assert all("__count" not in record for record in records)
+
+
+@pytest.mark.parametrize("read_path", [READ_PATH_ORM, READ_PATH_CORE])
+def test_window_count_of_page_past_the_end(items, read_path):
+    (count, records), statements = perform_list(
+        filters=[("age", 1)], limit=2, offset=5, count_strategy=COUNT_WINDOW, read_path=read_path
+    )
+    # No row carries the window count, so it is counted separately
+    assert (count, records, statements) == (3, [], 2)
+    (count, records), statements = perform_list(
+        filters=[("age", 5)], limit=2, count_strategy=COUNT_WINDOW, read_path=read_path
+    )
+    assert (count, records, statements) == (0, [], 1)
+
+
+def test_count_strategy_of_request_and_resource(client):
+    for path, query_string, count in (
+            ("/items", "__limit=2", 10),
+            ("/items", "__limit=2&__count=none", None),
+            ("/window/items", "__limit=2", 10),
+            ("/window/items", "__limit=2&__count=exact&__count=none", None)):
+        result = client.simulate_get(path, query_string=query_string)
+        assert result.status_code == 200, result.text
+        assert result.json["count"] == count and len(result.json["data"]) == 2
+    for count_strategy in COUNT_STRATEGIES:
+        result = client.simulate_get("/items", query_string="age=2&__count={}".format(count_strategy))
+        assert result.json["count"] == (None if count_strategy == COUNT_NONE else 3)
+
+
+def test_invalid_count_strategy_is_rejected(client):
+    result = client.simulate_get("/items", query_string="__count=approximate")
+    assert result.status_code == 400
+    assert "__count" in result.text
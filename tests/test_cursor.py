@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from tests.models import Item
+from tests.utils import make_api
+from tests.utils import seed
+
+AGES = [3, None, 1, None, 2, 1, None, 3]
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+@pytest.fixture
+def client(engine):
+    seed(Item, [{"name": str(i), "age": age} for i, age in enumerate(AGES)])
+    return testing.TestClient(make_api([("/items", ItemResource())]))
+
+
+def order_query(orders):
+    return "&".join("__order={}".format(order) for order in orders)
+
+
+def walk(client, orders, limit):
+    rows = []
+    query = "{}&__limit={}".format(order_query(orders), limit)
+    result = client.simulate_get("/items", query_string="{}&__after=start".format(query))
+    while True:
+        assert result.status_code == 200
+        rows.extend(result.json["data"])
+        if result.json["next"] is None:
+            return rows
+        result = client.simulate_get("/items", query_string="{}&__after={}".format(query, result.json["next"]))
+
+
+@pytest.mark.parametrize("orders", [
+    ("age,asc", "id,asc"), ("age,desc", "id,asc"), ("age,asc", "id,desc"), ("age,desc", "id,desc")
+])
+@pytest.mark.parametrize("limit", [2, 3])
+def test_cursor_walks_through_null_values(client, orders, limit):
+    rows = walk(client, orders, limit=limit)
+    expected = client.simulate_get("/items", query_string=order_query(orders)).json["data"]
+    assert [row["id"] for row in rows] == [row["id"] for row in expected]
+    assert len(rows) == len(AGES)
+
+
+def test_cursor_pages_are_not_counted_by_default(client):
+    result = client.simulate_get("/items", query_string="__order=id,asc&__limit=2")
+    assert result.json["count"] == len(AGES)
+    query = "__order=id,asc&__limit=2&__after=start"
+    assert client.simulate_get("/items", query_string=query).json["count"] is None
+    result = client.simulate_get("/items", query_string="{}&__count=exact".format(query))
+    assert result.json["count"] == len(AGES)
+
+
+def test_only_cursor_pages_carry_cursors(client):
+    result = client.simulate_get("/items", query_string="__order=id,asc&__limit=2")
+    assert result.status_code == 200
+    assert set(result.json) == {"count", "data"}
+    result = client.simulate_get("/items", query_string="__order=id,asc&__limit=3&__after=start")
+    assert [row["id"] for row in result.json["data"]] == [1, 2, 3]
+    assert result.json["prev"] is None and result.json["next"] is not None
+    result = client.simulate_get("/items", query_string="__order=id,asc&__limit=3&__before=start")
+    assert [row["id"] for row in result.json["data"]] == [6, 7, 8]
+    assert result.json["prev"] is not None and result.json["next"] is None
+    query = "__order=id,asc&__limit=3&__before={}".format(result.json["prev"])
+    assert [row["id"] for row in client.simulate_get("/items", query_string=query).json["data"]] == [3, 4, 5]
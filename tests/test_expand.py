@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.middleware.default import QueryStatsMiddleware
+from restful_falcon.core.middleware.default import SessionMiddleware
+from tests.models import Book
+from tests.models import Page
+from tests.models import Shelf
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class ShelfResource(Resource, ResourceOperatesMixin):
+    resource_model = Shelf
+    allowed_expands = ["books", "books.pages"]
+
+
+class BookResource(Resource, ResourceOperatesMixin):
+    resource_model = Book
+    allowed_expands = ["shelf", "pages"]
+
+
+@pytest.fixture
+def client(engine):
+    seed(Shelf, [{"name": "s{}".format(i)} for i in range(0, 4)])
+    seed(Book, [{"shelf_id": i % 4 + 1, "title": "b{}".format(i)} for i in range(0, 12)])
+    seed(Page, [{"book_id": i % 12 + 1, "number": i} for i in range(0, 36)])
+    shelves, books = ShelfResource(), BookResource()
+    return testing.TestClient(make_api([
+        ("/shelves", shelves), ("/shelves/{rid:int}", shelves, "item"),
+        ("/books", books), ("/books/{rid:int}", books, "item")
+    ], middleware=[QueryStatsMiddleware(), SessionMiddleware()]))
+
+
+def get(client, path, query_string):
+    """
+    Get path, and the number of statements executed
+    """
+    result = client.simulate_get(path, query_string=query_string)
+    assert result.status_code == 200, result.text
+    return result.json, int(result.headers["server-timing"].split('desc="')[1].split()[0])
+
+
+@pytest.mark.parametrize("limit", [1, 4])
+def test_expanded_statements_do_not_grow_with_rows(client, limit):
+    body, statements = get(client, "/shelves", "__limit={}&__expand=books.pages".format(limit))
+    # Count, shelves, their books and the pages of the books
+    assert statements == 4
+    assert len(body["data"]) == limit
+    shelf = body["data"][0]
+    assert [book["title"] for book in shelf["books"]] == ["b0", "b4", "b8"]
+    assert [page["number"] for page in shelf["books"][0]["pages"]] == [0, 12, 24]
+    body, statements = get(client, "/books", "__limit={}&__expand=shelf,pages&__fields=id,title".format(limit * 3))
+    # Scalars are joined to books
+    assert statements == 3
+    assert set(body["data"][0]) == {"id", "title", "shelf", "pages"}
+    assert body["data"][1]["shelf"]["name"] == "s1"
+
+
+def test_expanded_show(client):
+    body, statements = get(client, "/books/2", "__expand=shelf,pages")
+    assert statements == 2
+    assert body["shelf"]["id"] == 2 and len(body["pages"]) == 3
+
+
+def test_expand_is_checked(client):
+    for path, query_string in (
+        ("/books", "__expand=shelf.books"), ("/shelves", "__expand=items"), ("/shelves", "__expand=books&__stream=json")
+    ):
+        result = client.simulate_get(path, query_string=query_string)
+        assert result.status_code == 400
+        assert "__expand" in result.text
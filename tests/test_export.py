@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import json
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.constants import BANNER
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ExportOperateMixin
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.management import ManagementUtility
+from restful_falcon.core.management.base import CommandError
+from restful_falcon.core.management.commands.export import ExportCommand
+from tests.models import Pair
+from tests.models import Reading
+from tests.utils import make_api
+from tests.utils import seed
+
+PAIRS = [{"k": k, "n": n, "text": "{}{}".format(k, n)} for k in ("b", "a", "c") for n in (2, 1)]
+
+
+class PairResource(Resource, ResourceOperatesMixin, ExportOperateMixin):
+    resource_model = Pair
+    stream_batch_size = 4
+
+
+@pytest.fixture
+def pairs(engine):
+    seed(Pair, PAIRS)
+
+
+def expected(fields=("k", "n", "text")):
+    return [{field: row[field] for field in fields} for row in sorted(PAIRS, key=lambda row: (row["k"], row["n"]))]
+
+
+def test_export_pages_by_composite_primary_key(pairs):
+    assert Pair.primary_key_fields() == ["k", "n"]
+    for batch_size in (1, 2, 4, 6, 10):
+        assert list(Pair.perform_export(batch_size=batch_size)) == expected()
+    assert list(Pair.perform_export(columns=["text"], batch_size=4)) == expected(("text",))
+
+
+def test_export_route_streams_by_primary_key(pairs):
+    client = testing.TestClient(make_api([("/pairs", PairResource(), "export")]))
+    result = client.simulate_get("/pairs", query_string="__stream=ndjson")
+    assert result.status_code == 200
+    assert [json.loads(line) for line in result.text.splitlines()] == expected()
+
+
+def test_export_route_is_opt_in(pairs):
+    class PlainPairResource(Resource, ResourceOperatesMixin):
+        resource_model = Pair
+
+    assert not hasattr(PlainPairResource(), "on_get_export")
+    with pytest.raises(Exception, match="No responders"):
+        make_api([("/pairs", PlainPairResource(), "export")])
+
+
+def test_export_command_streams_by_primary_key(pairs, tmp_path):
+    output = tmp_path / "pairs.ndjson"
+    ExportCommand().execute(
+        model="tests.models.Pair", format="ndjson", fields="n,text", filters=[], batch_size=4, output=str(output)
+    )
+    assert [json.loads(line) for line in output.read_text().splitlines()] == expected(("n", "text"))
+
+
+def test_export_rejects_model_without_primary_key(engine, tmp_path):
+    with pytest.raises(ValueError, match="no primary key"):
+        Reading.perform_export()
+    with pytest.raises(CommandError, match="no primary key"):
+        ExportCommand().execute(
+            model="Reading", format="csv", fields=None, filters=[], batch_size=None, output=str(tmp_path / "out")
+        )
+
+
+def test_export_command_parses_filters_as_list_api(pairs, tmp_path):
+    output = tmp_path / "pairs.ndjson"
+
+    def export(*filters):
+        ExportCommand().execute(
+            model="Pair", format="ndjson", fields="k,n", filters=list(filters), batch_size=2, output=str(output)
+        )
+        return [json.loads(line) for line in output.read_text().splitlines()]
+
+    # Values are coerced to column types, and reserved fields are case insensitive
+    assert export("n=1") == [{"k": "a", "n": 1}, {"k": "b", "n": 1}, {"k": "c", "n": 1}]
+    assert export("__GT=k,a", "__lt=n,2") == [{"k": "b", "n": 1}, {"k": "c", "n": 1}]
+    with pytest.raises(CommandError, match="Only filters are allowed"):
+        export("__limit=1")
+    with pytest.raises(CommandError, match="__order"):
+        export("__order=n")
+    with pytest.raises(CommandError, match="n"):
+        export("n=one")
+
+
+def test_export_command_writes_only_rows_to_stdout(pairs, capfd):
+    ManagementUtility(["manage.py", "export", "tests.models.Pair", "--format", "ndjson"]).execute()
+    out, err = capfd.readouterr()
+    assert [json.loads(line) for line in out.splitlines()] == expected()
+    assert BANNER in err
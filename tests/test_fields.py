@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+from sqlalchemy import event
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from tests.models import Item
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+class PublicItemResource(ItemResource):
+    allowed_fields = ["id", "name"]
+
+
+@pytest.fixture
+def selects(engine):
+    """
+    SELECT statements executed
+    """
+    seed(Item, [{"name": "n{}".format(i), "age": i % 3} for i in range(0, 6)])
+    selects = []
+
+    # noinspection PyUnusedLocal
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return selects
+
+
+@pytest.fixture
+def client(selects):
+    items, public_items = ItemResource(), PublicItemResource()
+    return testing.TestClient(make_api([
+        ("/items", items), ("/items/{rid:int}", items, "item"),
+        ("/public/items", public_items), ("/public/items/{rid:int}", public_items, "item")
+    ]))
+
+
+def selected_columns(statement):
+    return statement.split("FROM")[0]
+
+
+def test_only_requested_fields_are_listed_and_shown(client, selects):
+    result = client.simulate_get("/items", query_string="age=1&__fields=id,name")
+    assert result.status_code == 200, result.text
+    assert result.json["data"] == [{"id": 2, "name": "n1"}, {"id": 5, "name": "n4"}]
+    assert "age" not in selected_columns(selects[-1]) and "items.name" in selected_columns(selects[-1])
+    result = client.simulate_get("/items/3", query_string="__fields=age")
+    assert result.status_code == 200, result.text
+    assert result.json == {"age": 2}
+    assert set(client.simulate_get("/items/3").json) == set(column.key for column in Item.__table__.columns)
+
+
+def test_cursor_list_strips_keyset_columns_not_requested(client):
+    query = "__order=age,desc&__limit=2&__fields=name"
+    cursor = Item.make_cursor({"age": 2, "id": 6}, Item.keyset_orders([("age", "desc")]))
+    rows = []
+    while cursor is not None:
+        result = client.simulate_get("/items", query_string="{}&__after={}".format(query, cursor))
+        assert result.status_code == 200, result.text
+        rows.extend(result.json["data"])
+        cursor = result.json["next"]
+    assert rows == [{"name": name} for name in ("n2", "n4", "n1", "n3", "n0")]
+
+
+@pytest.mark.parametrize("path, fields", [
+    ("/items", "id,unknown"),
+    ("/items/1", "unknown"),
+    ("/public/items", "id,age"),
+    ("/public/items/1", "created_at"),
+])
+def test_unknown_and_disallowed_fields_are_rejected(client, path, fields):
+    result = client.simulate_get(path, query_string="__fields={}".format(fields))
+    assert result.status_code == 400
+    assert "__fields" in result.text
+
+
+def test_allowed_fields_are_readable(client):
+    result = client.simulate_get("/public/items", query_string="__fields=name&__limit=1")
+    assert result.status_code == 200, result.text
+    assert result.json["data"] == [{"name": "n0"}]
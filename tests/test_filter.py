@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+
+from restful_falcon.core.db import filter as db_filter
+from restful_falcon.core.db.filter import EQ_FILTER
+from restful_falcon.core.db.filter import FilterValueError
+from restful_falcon.core.db.filter import coerce_filter_value
+from tests.models import Item
+
+
+def test_converters_are_cached_for_mapped_columns_only():
+    assert coerce_filter_value(Item, EQ_FILTER, "age", "3") == 3
+    converters = db_filter._CONVERTERS[Item]
+    assert set(converters) == set(Item.__mapper__.columns.keys())
+    for i in range(0, 100):
+        assert coerce_filter_value(Item, EQ_FILTER, "unknown{}".format(i), "3") == "3"
+    assert db_filter._CONVERTERS[Item] is converters
+    assert set(converters) == set(Item.__mapper__.columns.keys())
+    with pytest.raises(FilterValueError):
+        coerce_filter_value(Item, EQ_FILTER, "age", "x")
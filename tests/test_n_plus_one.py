@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import logging
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.db.stats import NPlusOneQueryError
+from restful_falcon.core.db.stats import normalize_statement
+from restful_falcon.core.middleware.default import QueryStatsMiddleware
+from restful_falcon.core.middleware.default import SessionMiddleware
+from tests.conftest import make_engine
+from tests.models import Item
+from tests.models import Note
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+    def list(self, context, filters=None, orders=None, limit=None, offset=None):
+        count, records = super(ItemResource, self).list(
+            context, filters=filters, orders=orders, limit=limit, offset=offset
+        )
+        # A query per record
+        for record in records:
+            record["note"] = Note.perform_show_by([("code", record["name"])], session=context.session)
+        return count, records
+
+
+def make_client(tmp_path, **config):
+    engine = make_engine(tmp_path / "test.db", n_plus_one_threshold=3, **config)
+    seed(Item, [{"name": "n{}".format(i)} for i in range(0, 5)])
+    seed(Note, [{"code": "n{}".format(i)} for i in range(0, 5)])
+    return engine, testing.TestClient(make_api([("/items", ItemResource())], middleware=[
+        QueryStatsMiddleware(), SessionMiddleware()
+    ]))
+
+
+def test_normalized_statements_share_shape():
+    assert normalize_statement("SELECT * FROM t WHERE a = 'x' AND b IN (1, 2,3)") == \
+        normalize_statement("SELECT *  FROM t\nWHERE a = ? AND b IN (?)")
+    assert normalize_statement("SELECT * FROM t WHERE a = :a_1") != normalize_statement("SELECT * FROM t")
+
+
+def test_n_plus_one_queries_raise(tmp_path):
+    engine, client = make_client(tmp_path, n_plus_one_action="raise")
+    try:
+        with pytest.raises(NPlusOneQueryError, match=r"ItemResource\.list -> Note\.\w+ \(ItemResource GET /items\)"):
+            client.simulate_get("/items", query_string="__limit=5")
+        # Requests below the threshold pass
+        assert client.simulate_get("/items", query_string="__limit=2").status_code == 200
+    finally:
+        engine.dispose()
+
+
+def test_n_plus_one_queries_are_reported_once(tmp_path, caplog):
+    engine, client = make_client(tmp_path)
+    try:
+        with caplog.at_level(logging.WARNING, logger="restful_falcon.core.db.stats"):
+            assert client.simulate_get("/items", query_string="__limit=5").status_code == 200
+        messages = [record.getMessage() for record in caplog.records if "N+1" in record.getMessage()]
+        assert len(messages) == 1
+        assert "executed 3 times" in messages[0]
+    finally:
+        engine.dispose()
+
+
+def test_n_plus_one_action_is_checked(tmp_path):
+    with pytest.raises(ValueError, match="N\\+1 action"):
+        make_engine(tmp_path / "test.db", n_plus_one_action="ignore")
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+
+from restful_falcon.core.db.model import READ_PATH_CORE
+from restful_falcon.core.db.model import READ_PATH_ORM
+from restful_falcon.core.db.plan import QueryPlanCache
+from tests.models import Item
+from tests.utils import seed
+
+
+@pytest.fixture
+def plan_cache(engine, monkeypatch):
+    seed(Item, [{"name": "n{}".format(i), "age": i % 4} for i in range(0, 8)])
+    plan_cache = QueryPlanCache(size=4)
+    monkeypatch.setattr(Item, "plan_cache", plan_cache)
+    return plan_cache
+
+
+def names(read_path, age, **kwargs):
+    return [row["name"] for row in Item.perform_list(
+        columns=["name"], filters=[("age", age)], orders=[("id", "asc")], read_path=read_path, **kwargs
+    )[1]]
+
+
+@pytest.mark.parametrize("read_path", [READ_PATH_ORM, READ_PATH_CORE])
+def test_plans_are_shared_by_queries_of_same_shape(plan_cache, read_path):
+    assert names(read_path, 1) == ["n1", "n5"]
+    stats = plan_cache.stats()
+    assert stats["misses"] > 0
+    # Values of filters are bound parameters of the same plan
+    assert names(read_path, 2) == ["n2", "n6"]
+    assert plan_cache.stats()["misses"] == stats["misses"]
+    assert plan_cache.stats()["hits"] > stats["hits"]
+    # So are limits and offsets, once the plan with them is built
+    assert names(read_path, 3, limit=1, offset=1) == ["n7"]
+    misses = plan_cache.stats()["misses"]
+    assert misses > stats["misses"]
+    assert names(read_path, 2, limit=1, offset=0) == ["n2"]
+    assert plan_cache.stats()["misses"] == misses
+    # Another shape of filters is another plan
+    Item.perform_list(columns=["name"], filters=[("gt", ("age", 1))], read_path=read_path)
+    assert plan_cache.stats()["misses"] > misses
+
+
+def test_plan_cache_is_bounded(plan_cache):
+    columns = Item.columns()
+    for i in range(1, len(columns) + 1):
+        for filters in ([("age", 1)], [("gt", ("age", 1))], [("in", ("age", [1, 2]))], [("name", "n1")]):
+            Item.perform_list(columns=columns[:i], filters=filters)
+            Item.perform_list(columns=columns[:i], filters=filters, read_path=READ_PATH_CORE)
+    stats = plan_cache.stats()
+    # LRU caches are pruned to their size once they grow beyond half of it over
+    assert stats["max_size"] == 4
+    assert 0 < stats["size"] <= 6
+    assert 0 < stats["statements"] <= 6
+    assert names(READ_PATH_ORM, 1) == names(READ_PATH_CORE, 1) == ["n1", "n5"]
+
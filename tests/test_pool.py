@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+from restful_falcon.core.db.pool import POOL_PROFILES
+from restful_falcon.core.db.pool import pool_options
+from restful_falcon.core.db.pool import pool_stats
+from tests.conftest import make_engine
+
+
+@pytest.fixture
+def pooled(tmp_path):
+    """
+    Engine of a file SQLite database with a queue pool of 2 connections
+    and 1 overflow, waiting 0.1 seconds for a connection
+    """
+    engine = make_engine(
+        tmp_path / "test.db", pool={"profile": "small", "size": 2, "timeout": 0.1},
+        options={"poolclass": QueuePool}
+    )
+    yield engine
+    engine.dispose()
+
+
+def stats(name="primary"):
+    return next(metrics for metrics in pool_stats() if metrics["name"] == name)
+
+
+def test_pool_options_of_profile_and_explicit_settings():
+    assert pool_options(None) == {} and pool_options({}) == {}
+    assert pool_options({"profile": "web"}) == {
+        "pool_size": 10, "max_overflow": 20, "pool_timeout": 10, "pool_recycle": 1800,
+        "pool_pre_ping": True, "pool_use_lifo": True
+    }
+    options = pool_options({"profile": "worker", "size": 5, "lifo": True})
+    assert options["pool_size"] == 5 and options["pool_use_lifo"] is True
+    assert options["max_overflow"] == POOL_PROFILES["worker"]["overflow"]
+    assert pool_options({"overflow": 0}) == {"max_overflow": 0}
+    with pytest.raises(ValueError):
+        pool_options({"profile": "huge"})
+
+
+def test_engine_pool_is_configured_by_settings(pooled):
+    assert pooled.pool.size() == 2
+    assert pooled.pool._max_overflow == 1
+    assert pooled.pool._timeout == 0.1
+    assert pooled.pool._recycle == -1
+
+
+def test_pool_metrics(pooled):
+    # Creating tables has checked out and returned a connection
+    before = stats()
+    assert before["pool"] == "QueuePool" and before["size"] == 2 and before["checked_out"] == 0
+    connections = [pooled.connect() for _ in range(0, 3)]
+    current = stats()
+    assert current["checked_out"] == 3 and current["overflow"] == 1 and current["overflow_max"] == 1
+    assert current["checkouts"] == before["checkouts"] + 3
+    assert current["connects"] == 3
+    with pytest.raises(TimeoutError):
+        pooled.connect()
+    # Waits include the timeout of the failed checkout
+    assert stats()["wait_max"] >= 0.1
+    connections[0].invalidate()
+    for connection in connections:
+        connection.close()
+    current = stats()
+    assert current["checked_out"] == 0 and current["overflow_max"] == 1 and current["invalidations"] == 1
+    assert current["wait_avg"] == current["wait_total"] / current["checkouts"]
+
+
+def test_pool_metrics_survive_dispose(pooled):
+    pooled.connect().close()
+    checkouts = stats()["checkouts"]
+    pooled.dispose()
+    pooled.connect().close()
+    assert stats()["checkouts"] == checkouts + 1 and stats()["checked_out"] == 0
+
+
+def test_pool_metrics_of_replicas(tmp_path):
+    engine = make_engine(tmp_path / "primary.db", replicas=["sqlite:///{}".format(tmp_path / "replica.db")])
+    try:
+        assert [metrics["name"] for metrics in pool_stats()] == ["primary", "replica0"]
+        assert stats("replica0")["checkouts"] == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Context
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.exception import HTTPInvalidParam
+from restful_falcon.core.request import Request
+from restful_falcon.core.response import Response
+from tests.models import Item
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+    query_policy = {"default_limit": 10, "max_limit": 20}
+
+
+def make_context(query_string):
+    request = Request(testing.create_environ(query_string=query_string))
+    return Context(ItemResource(), request, Response(), {})
+
+
+def test_empty_query_gets_default_limit():
+    context = make_context("")
+    assert context.limit == 10
+    assert context.filters == []
+    assert context.orders is None
+
+
+def test_query_is_checked_against_policy():
+    assert make_context("__limit=20&age=3").limit == 20
+    with pytest.raises(HTTPInvalidParam):
+        make_context("__limit=21")
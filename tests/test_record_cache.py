@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+
+from restful_falcon.core.cache.backend.memory import MemoryBackend
+from restful_falcon.core.cache.client import CacheClient
+from restful_falcon.core.db.engine import Session
+from tests.models import Item
+from tests.utils import seed
+
+
+@pytest.fixture
+def cache(engine, monkeypatch):
+    cache = CacheClient(MemoryBackend())
+    monkeypatch.setattr(Item, "record_cache", cache)
+    monkeypatch.setattr(Item, "record_cache_expire", 60)
+    seed(Item, [{"name": "a", "age": 1}])
+    return cache
+
+
+def test_record_cache_requires_expiration(cache, monkeypatch):
+    Item.check_record_cache()
+    for expire in (None, 0, "60"):
+        monkeypatch.setattr(Item, "record_cache_expire", expire)
+        with pytest.raises(ValueError):
+            Item.check_record_cache()
+        with pytest.raises(ValueError):
+            Item.perform_show(1)
+
+
+def test_record_cache_keeps_types(cache):
+    data = Item.perform_show(1)
+    assert isinstance(cache.get(Item.record_cache_key(1)), str)
+    assert Item.get_cached(1) == data
+    assert Item.perform_show(1) == data
+
+
+def test_record_cache_is_invalidated_after_commit(cache):
+    Item.perform_show(1)
+    session = Session()
+    try:
+        Item.update(session, 1, {"name": "b"})
+        # Readers would cache the record again before the update is visible
+        assert cache.has(Item.record_cache_key(1))
+        session.commit()
+        assert not cache.has(Item.record_cache_key(1))
+    finally:
+        session.close()
+    assert Item.perform_show(1, columns=["name"]) == {"name": "b"}
+
+
+def test_record_cache_is_kept_after_rollback(cache):
+    Item.perform_show(1)
+    session = Session()
+    try:
+        Item.update(session, 1, {"name": "b"})
+        session.rollback()
+    finally:
+        session.close()
+    assert cache.has(Item.record_cache_key(1))
+    Item.perform_update(1, {"name": "c"})
+    assert not cache.has(Item.record_cache_key(1))
+    assert Item.perform_show(1, columns=["name"]) == {"name": "c"}
+
+
+def test_record_cache_is_invalidated_after_outermost_commit(cache):
+    Item.perform_show(1)
+    session = Session()
+    try:
+        session.begin_nested()
+        Item.update(session, 1, {"name": "b"})
+        session.commit()
+        # Readers still see the record before the update once the savepoint is released
+        assert cache.has(Item.record_cache_key(1))
+        assert Item.perform_show(1, columns=["name"]) == {"name": "a"}
+        session.commit()
+        assert not cache.has(Item.record_cache_key(1))
+    finally:
+        session.close()
+    assert Item.perform_show(1, columns=["name"]) == {"name": "b"}
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+import sqlalchemy
+from falcon import testing
+
+from restful_falcon.core.controller.base import Context
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.db.model import Model
+from restful_falcon.core.db.session import SESSION_SCOPE
+from restful_falcon.core.request import Request
+from restful_falcon.core.response import Response
+from tests.conftest import make_engine
+from tests.models import Item
+from tests.utils import make_api
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+
+
+def make_database(path, name):
+    # Each database holds one item named after it, which tells where a read is served
+    engine = sqlalchemy.create_engine("sqlite:///{}".format(path))
+    try:
+        Model.metadata.create_all(engine)
+        engine.execute(Item.__table__.insert(), {"id": 1, "name": name})
+    finally:
+        engine.dispose()
+    return "sqlite:///{}".format(path)
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    urls = [make_database(tmp_path / "replica{}.db".format(i), "replica{}".format(i)) for i in range(0, 2)]
+    make_database(tmp_path / "primary.db", "primary")
+    engine = make_engine(tmp_path / "primary.db", replicas=urls)
+    yield engine
+    engine.dispose()
+
+
+def served_by(session):
+    return session.query(Item.name).filter(Item.id == 1).scalar()
+
+
+def make_context(autocommit):
+    request = Request(testing.create_environ())
+    return Context(ItemResource(), request, Response(), {}, autocommit=autocommit)
+
+
+def test_reads_are_routed_to_replicas_in_turn(replicas):
+    client = testing.TestClient(make_api([("/items/{rid:int}", ItemResource(), "item")]))
+    names = [client.simulate_get("/items/1").json["name"] for _ in range(0, 4)]
+    assert names == ["replica0", "replica1", "replica0", "replica1"]
+    assert client.simulate_put("/items/1", json={"age": 1}).json["name"] == "primary"
+
+
+def test_contexts_sharing_session_route_on_their_own(replicas):
+    SESSION_SCOPE.begin()
+    try:
+        with make_context(False) as reading:
+            assert served_by(reading.session) == "replica0"
+            with make_context(True) as writing:
+                assert served_by(writing.session) == "primary"
+            # The write context has not written, the read context reads replica again
+            assert served_by(reading.session) == "replica0"
+        session = SESSION_SCOPE.get()
+        # Routes end with contexts, reads out of contexts go to the primary
+        assert served_by(session) == "primary"
+        reading, writing = make_context(False), make_context(True)
+        reading.__enter__()
+        writing.__enter__()
+        assert served_by(reading.session) == "replica0"
+        assert served_by(writing.session) == "primary"
+        reading.__exit__(None, None, None)
+        # Interleaved contexts do not restore the routing of each other
+        assert served_by(session) == "primary"
+        writing.__exit__(None, None, None)
+    finally:
+        SESSION_SCOPE.end()
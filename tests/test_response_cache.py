@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import json
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.cache.backend.memory import MemoryBackend
+from restful_falcon.core.cache.client import CacheClient
+from restful_falcon.core.cache.response import GENERATION_PREFIX
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.db.engine import Session
+from restful_falcon.core.middleware.default import AuthenticationMiddleware
+from restful_falcon.core.middleware.default import PermissionMiddleware
+from restful_falcon.core.middleware.default import QueryStatsMiddleware
+from restful_falcon.core.middleware.default import ResponseCacheMiddleware
+from restful_falcon.core.middleware.default import SessionMiddleware
+from tests.models import Item
+from tests.models import Note
+from tests.utils import HeaderAuthentication
+from tests.utils import make_api
+from tests.utils import seed
+from tests.utils import user_headers
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+    response_cache = {"expire": 60}
+
+
+class NoteResource(Resource, ResourceOperatesMixin):
+    authentication_classes = [HeaderAuthentication]
+    resource_model = Note
+    resource_isolation = True
+    response_cache = {"expire": 60}
+
+
+@pytest.fixture
+def cache(engine):
+    seed(Item, [{"name": "n{}".format(i), "age": i % 2} for i in range(0, 4)])
+    return CacheClient(MemoryBackend())
+
+
+def make_client(cache, **options):
+    resource = ItemResource()
+    return testing.TestClient(make_api([
+        ("/items", resource), ("/items/{rid:int}", resource, "item"), ("/notes", NoteResource())
+    ], middleware=[
+        QueryStatsMiddleware(), SessionMiddleware(), AuthenticationMiddleware(), PermissionMiddleware(),
+        ResponseCacheMiddleware(cache, **options)
+    ]))
+
+
+def get(client, path, query_string=None, headers=None):
+    """
+    Get path, and whether the response is cached, responses from cache run no statements
+    """
+    result = client.simulate_get(path, query_string=query_string, headers=headers)
+    assert result.status_code == 200
+    return result.json, "server-timing" not in result.headers
+
+
+def test_responses_are_cached_by_normalized_query(cache):
+    client = make_client(cache)
+    body, cached = get(client, "/items", "age=1&__limit=5")
+    assert not cached and body["count"] == 2
+    assert get(client, "/items", "__limit=5&age=1") == (body, True)
+    assert get(client, "/items", "age=0&__limit=5")[1] is False
+    body = get(client, "/items/1")[0]
+    assert get(client, "/items/1") == (body, True)
+    # Other methods are never cached
+    ids = [client.simulate_post("/items", json={"name": "x"}).json["id"] for _ in range(0, 2)]
+    assert ids == [5, 6]
+
+
+def test_write_invalidates_cached_list(cache):
+    client = make_client(cache)
+    assert get(client, "/items", "age=1")[0]["count"] == 2
+    client.simulate_post("/items", json={"name": "x", "age": 1})
+    body, cached = get(client, "/items", "age=1")
+    assert not cached and body["count"] == 3
+    assert get(client, "/items", "age=1") == (body, True)
+    client.simulate_put("/items/2", json={"name": "y"})
+    body, cached = get(client, "/items", "age=1")
+    assert not cached and [row["name"] for row in body["data"]] == ["y", "n3", "x"]
+
+
+def test_writes_invalidate_only_after_commit(cache):
+    client = make_client(cache)
+    body = get(client, "/items", "age=1")[0]
+    session = Session()
+    try:
+        session.query(Item).filter(Item.id == 2).update({"age": 0}, synchronize_session=False)
+        session.flush()
+        assert get(client, "/items", "age=1") == (body, True)
+        session.rollback()
+        # Rolled back writes invalidate nothing
+        assert get(client, "/items", "age=1") == (body, True)
+        Item.create(session, {"name": "x", "age": 1})
+        session.commit()
+    finally:
+        session.close()
+    body, cached = get(client, "/items", "age=1")
+    assert not cached and body["count"] == 3
+
+
+def test_isolated_responses_are_cached_per_scope(cache):
+    client = make_client(cache)
+    for user in (1, 2):
+        client.simulate_post("/notes", json={"code": "c{}".format(user)}, headers=user_headers(user))
+    codes = {}
+    for user in (1, 2, "admin"):
+        body, cached = get(client, "/notes", headers=user_headers(user))
+        assert not cached
+        codes[user] = [row["code"] for row in body["data"]]
+        assert get(client, "/notes", headers=user_headers(user)) == (body, True)
+    assert codes == {1: ["c1"], 2: ["c2"], "admin": ["c1", "c2"]}
+    # Unauthenticated requests are rejected before the cache is looked up
+    assert client.simulate_get("/notes").status_code == 401
+
+
+def test_evicted_generations_never_match_older_entries(cache):
+    client = make_client(cache)
+    assert client.simulate_get("/items/1").json["name"] == "n0"
+    assert client.simulate_put("/items/1", json={"name": "m0"}).status_code == 200
+    # The generation of the write is expired or evicted, the entry made before it stays stale
+    cache.delete("{}:items".format(GENERATION_PREFIX))
+    assert client.simulate_get("/items/1").json["name"] == "m0"
+
+
+def test_entries_are_stored_as_json(cache):
+    client = make_client(cache)
+    result = client.simulate_get("/items", query_string="age=1")
+    keys = [key for key in cache.keys() if not key.startswith(GENERATION_PREFIX)]
+    assert len(keys) == 1
+    entry = json.loads(cache.get(keys[0]))
+    assert entry["generations"] == [["items", cache.get("{}:items".format(GENERATION_PREFIX))]]
+    cached = client.simulate_get("/items", query_string="age=1")
+    assert cached.content == result.content
+    assert cached.headers["content-type"] == result.headers["content-type"]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from sqlalchemy.dialects.postgresql.base import PGCompiler
+from sqlalchemy.dialects.sqlite.base import SQLiteCompiler
+
+from restful_falcon.core.db.stats import QUERY_STATS_SCOPE
+from tests.models import Item
+from tests.utils import seed
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "fallback"])
+def returning(request, engine, monkeypatch):
+    """
+    Whether the dialect supports `UPDATE/DELETE ... RETURNING`. SQLite runs
+    RETURNING since 3.35, only the compiler of SQLAlchemy 1.3 lacks it.
+    """
+    seed(Item, [{"name": "n{}".format(i), "age": i % 3} for i in range(0, 6)])
+    if request.param:
+        monkeypatch.setattr(engine.dialect, "full_returning", True, raising=False)
+        monkeypatch.setattr(SQLiteCompiler, "returning_clause", PGCompiler.returning_clause, raising=False)
+    return request.param
+
+
+def perform(method, *args, **kwargs):
+    """
+    Call method, and return its result and the statements executed
+    """
+    stats = QUERY_STATS_SCOPE.begin()
+    try:
+        return method(*args, **kwargs), stats.statements
+    finally:
+        QUERY_STATS_SCOPE.end()
+
+
+def stored():
+    return Item.perform_list(columns=["id", "flag"], orders=[("id", "asc")])[1]
+
+
+def test_update_by_returns_updated_records(returning):
+    records, statements = perform(Item.perform_update_by, [("age", 1)], {"flag": True}, columns=["id", "flag"])
+    assert records == [{"id": 2, "flag": True}, {"id": 5, "flag": True}]
+    assert statements == 1 if returning else statements > 1
+    assert stored() == [{"id": i + 1, "flag": i % 3 == 1} for i in range(0, 6)]
+    records = Item.perform_update_by([("id", 1)], {"name": "m0"})
+    assert len(records) == 1 and records[0]["name"] == "m0" and records[0]["age"] == 0
+
+
+def test_delete_by_returns_deleted_records(returning):
+    records, statements = perform(Item.perform_delete_by, [("age", 2)], columns=["id", "name"])
+    assert records == [{"id": 3, "name": "n2"}, {"id": 6, "name": "n5"}]
+    assert statements == 1 if returning else statements > 1
+    assert [record["id"] for record in stored()] == [1, 2, 4, 5]
+
+
+def test_without_returning_number_of_records_is_returned(returning):
+    count, statements = perform(Item.perform_update_by, [("age", 0)], {"flag": True}, returning=False)
+    assert (count, statements) == (2, 1)
+    assert [record["id"] for record in stored() if record["flag"]] == [1, 4]
+    count, statements = perform(Item.perform_delete_by, [("flag", True)], returning=False)
+    assert (count, statements) == (2, 1)
+    assert [record["id"] for record in stored()] == [2, 3, 5, 6]
+
+
+def test_records_are_not_touched_without_valid_filter(returning):
+    for filters in (None, [("unknown", 1)]):
+        assert perform(Item.perform_update_by, filters, {"flag": True}) == ([], 0)
+        assert perform(Item.perform_delete_by, filters, returning=False) == (0, 0)
+    assert stored() == [{"id": i + 1, "flag": False} for i in range(0, 6)]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+
+from restful_falcon.core.db.engine import Session
+from tests.models import Item
+from tests.utils import seed
+
+
+def test_records_to_list_takes_iterators_and_falsy_rows():
+    rows = [(1, "a"), None, (2, "b")]
+    expected = [{"id": 1, "name": "a"}, {}, {"id": 2, "name": "b"}]
+    assert Item.records_to_list(rows, columns=["id", "name"]) == expected
+    assert Item.records_to_list(iter(rows), columns=["id", "name"]) == expected
+    assert Item.records_to_list((row for row in [None, ()])) == [{}, {}]
+    assert Item.records_to_list(iter(())) == []
+    with pytest.raises(ValueError):
+        Item.records_to_list([(1,)], columns=["id", "name"])
+
+
+def test_records_to_list_serializes_instances(engine):
+    seed(Item, [{"name": "a", "age": 1}, {"name": "b", "age": 2}])
+    session = Session()
+    try:
+        records = session.query(Item).order_by(Item.id).all()
+        data = Item.records_to_list(iter(records + [None]))
+    finally:
+        session.close()
+    assert [(row.get("name"), row.get("age")) for row in data] == [("a", 1), ("b", 2), (None, None)]
+    assert data[-1] == {}
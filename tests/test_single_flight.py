@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import threading
+import time
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.cache.backend.memory import MemoryBackend
+from restful_falcon.core.cache.client import CacheClient
+from restful_falcon.core.cache.flight import SingleFlight
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.middleware.default import ResponseCacheMiddleware
+from restful_falcon.core.middleware.default import SessionMiddleware
+from tests.models import Item
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class SlowItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+    response_cache = {"expire": 60}
+    calls = []
+
+    def list(self, context, filters=None, orders=None, limit=None, offset=None):
+        self.calls.append(threading.current_thread())
+        # Identical requests arrive meanwhile
+        time.sleep(0.2)
+        return super(SlowItemResource, self).list(context, filters=filters, orders=orders, limit=limit, offset=offset)
+
+
+@pytest.fixture
+def resource(engine):
+    seed(Item, [{"name": "n{}".format(i)} for i in range(0, 4)])
+    SlowItemResource.calls = []
+    return SlowItemResource()
+
+
+def make_client(resource, cache, single_flight):
+    return testing.TestClient(make_api([("/items", resource)], middleware=[
+        SessionMiddleware(), ResponseCacheMiddleware(cache, single_flight=single_flight)
+    ]))
+
+
+def burst(clients, count=6):
+    results = [None] * count
+
+    def get(i):
+        results[i] = clients[i % len(clients)].simulate_get("/items", query_string="__limit=2")
+
+    threads = [threading.Thread(target=get, args=(i,)) for i in range(0, count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_identical_requests_are_coalesced(resource):
+    results = burst([make_client(resource, CacheClient(MemoryBackend()), SingleFlight())])
+    assert len(resource.calls) == 1
+    assert [result.status_code for result in results] == [200] * 6
+    assert len({result.content for result in results}) == 1
+
+
+def test_requests_are_not_coalesced_without_single_flight(resource):
+    burst([make_client(resource, CacheClient(MemoryBackend()), None)])
+    assert len(resource.calls) == 6
+
+
+def test_leaders_of_processes_are_coalesced_by_lock(resource):
+    # Processes share the cache, each has its own single flight
+    cache = CacheClient(MemoryBackend())
+    clients = [make_client(resource, cache, SingleFlight(cache, poll_interval=0.01)) for _ in range(0, 2)]
+    results = burst(clients)
+    assert len(resource.calls) == 1
+    assert len({result.content for result in results}) == 1
+    assert [key for key in cache.keys() if key.startswith("restful_falcon:flight")] == []
+
+
+def test_lock_across_processes():
+    cache = CacheClient(MemoryBackend())
+    flights = [SingleFlight(cache, timeout=1, poll_interval=0.01) for _ in range(0, 2)]
+    assert flights[0].acquire("k")
+    assert not flights[1].acquire("k")
+    results = []
+
+    def load():
+        results.append(None)
+        return cache.get("result")
+
+    thread = threading.Timer(0.05, lambda: (cache.set("result", "done"), flights[0].land("k", locked=True)))
+    thread.start()
+    assert flights[1].poll("k", load) == "done"
+    thread.join()
+    assert len(results) > 1
+    # The lock is released by its leader, others poll no more
+    assert flights[1].acquire("k")
+    flights[1].land("k", locked=True)
+    assert not cache.has(flights[1].lock_key("k"))
+
+
+def test_waiters_compute_themselves_if_leader_fails():
+    flight = SingleFlight(timeout=0.05)
+    leader, future = flight.join("k")
+    assert leader
+    follower, _future = flight.join("k")
+    assert not follower and _future is future
+    flight.land("k")
+    assert flight.wait(future) is None
+    leader, future = flight.join("k")
+    assert leader and flight.wait(future) is None
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from restful_falcon.core.db.count import COUNT_NONE
+from restful_falcon.core.db.stats import QUERY_STATS_SCOPE
+from restful_falcon.core.db.stats import START_TIMES_KEY
+from tests.models import Item
+from tests.utils import seed
+
+
+def test_failed_statements_leave_no_start_time(engine):
+    # Query events are attached by `create_engine`
+    stats = QUERY_STATS_SCOPE.begin()
+    try:
+        with engine.connect() as connection:
+            for i in range(0, 3):
+                with pytest.raises(OperationalError):
+                    connection.execute("SELECT * FROM missing")
+                assert not connection.info.get(START_TIMES_KEY)
+            connection.execute("SELECT 1").fetchall()
+            assert not connection.info.get(START_TIMES_KEY)
+    finally:
+        QUERY_STATS_SCOPE.end()
+    assert stats.statements == 1 and stats.rows == 1
+    assert stats.server_timing().endswith('desc="1 statements, 1 rows"')
+
+
+def test_rows_affected_and_fetched_are_counted(engine):
+    seed(Item, [{"name": "n{}".format(i), "age": i % 2} for i in range(0, 5)])
+    stats = QUERY_STATS_SCOPE.begin()
+    try:
+        assert len(Item.perform_list(count_strategy=COUNT_NONE)[1]) == 5
+        assert (stats.statements, stats.rows) == (1, 5)
+        assert Item.perform_update_by([("age", 1)], {"flag": True}, returning=False) == 2
+        assert (stats.statements, stats.rows) == (2, 7)
+        assert Item.perform_delete_by([("age", 0)], returning=False) == 3
+        assert (stats.statements, stats.rows) == (3, 10)
+        with engine.connect() as connection:
+            result = connection.execute("SELECT * FROM items")
+            result.fetchone()
+            # Rows not fetched are not counted
+            assert (stats.statements, stats.rows) == (4, 11)
+            result.close()
+    finally:
+        QUERY_STATS_SCOPE.end()
+    assert stats.to_dict()["rows"] == 11
+    assert stats.server_timing().endswith('desc="4 statements, 11 rows"')
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import csv
+import json
+from io import StringIO
+
+import pytest
+from falcon import testing
+from sqlalchemy import event
+from sqlalchemy.engine import ResultProxy
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from tests.models import Item
+from tests.utils import make_api
+from tests.utils import seed
+
+
+class ItemResource(Resource, ResourceOperatesMixin):
+    resource_model = Item
+    query_policy = {"default_limit": 5, "max_limit": 10}
+    stream_batch_size = 4
+
+
+@pytest.fixture
+def fetches(engine, monkeypatch):
+    """
+    Numbers of rows of each fetch of streamed results
+    """
+    seed(Item, [{"name": "n{}".format(i), "age": i % 3} for i in range(0, 30)])
+    fetches = []
+    fetchmany = ResultProxy.fetchmany
+
+    def _fetchmany(self, size=None):
+        rows = fetchmany(self, size)
+        fetches.append(len(rows))
+        return rows
+
+    monkeypatch.setattr(ResultProxy, "fetchmany", _fetchmany)
+    return fetches
+
+
+@pytest.fixture
+def client(fetches):
+    return testing.TestClient(make_api([("/items", ItemResource())]))
+
+
+def test_streams_in_each_format(client):
+    expected = [{"id": i + 1, "name": "n{}".format(i)} for i in range(0, 30) if i % 3 == 1]
+    query_string = "age=1&__fields=id,name&__stream={}"
+    result = client.simulate_get("/items", query_string=query_string.format("json"))
+    assert result.headers["content-type"] == "application/json"
+    assert result.json == {"data": expected}
+    result = client.simulate_get("/items", query_string=query_string.format("ndjson"))
+    assert result.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in result.text.splitlines()] == expected
+    result = client.simulate_get("/items", query_string=query_string.format("csv"))
+    assert result.headers["content-type"] == "text/csv"
+    rows = list(csv.reader(StringIO(result.text)))
+    assert rows == [["id", "name"]] + [[str(row["id"]), row["name"]] for row in expected]
+
+
+def test_streams_are_not_paginated_by_policy(client):
+    # Neither the default limit nor the maximum limit of pages applies
+    result = client.simulate_get("/items", query_string="__stream=ndjson")
+    assert len(result.text.splitlines()) == 30
+    result = client.simulate_get("/items", query_string="__stream=ndjson&__limit=20&__offset=25&__order=id,desc")
+    assert [json.loads(line)["id"] for line in result.text.splitlines()] == [5, 4, 3, 2, 1]
+    assert client.simulate_get("/items", query_string="__stream=xml").status_code == 400
+    assert client.simulate_get("/items", query_string="__stream=json&__after=1").status_code == 400
+
+
+@pytest.fixture
+def connections(engine):
+    """
+    Connections checked out of the pool of engine
+    """
+    connections = []
+    event.listen(engine, "checkout", lambda *args: connections.append(args[1]))
+    event.listen(engine, "checkin", lambda *args: connections.remove(args[1]))
+    return connections
+
+
+def test_streams_read_rows_batch_by_batch(fetches, connections):
+    records = Item.perform_list_stream(columns=["id"], batch_size=4)
+    assert [next(records) for _ in range(0, 5)] == [{"id": i} for i in range(1, 6)]
+    # Only the batches of records consumed are fetched
+    assert fetches == [4, 4]
+    assert len(list(records)) == 25
+    assert fetches == [4] * 7 + [2, 0]
+    assert connections == []
+
+
+def test_closed_streams_release_connection(fetches, connections):
+    records = Item.perform_list_stream(batch_size=4)
+    next(records)
+    assert len(connections) == 1
+    records.close()
+    assert connections == []
+    assert fetches == [4]
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import pytest
+from falcon import testing
+
+from restful_falcon.core.controller.base import Resource
+from restful_falcon.core.controller.mixin import ResourceOperatesMixin
+from restful_falcon.core.controller.mixin import UpsertOperateMixin
+from tests.models import Note
+from tests.utils import HeaderAuthentication
+from tests.utils import make_api
+from tests.utils import user_headers
+
+
+class NoteResource(Resource, ResourceOperatesMixin, UpsertOperateMixin):
+    authentication_classes = [HeaderAuthentication]
+    resource_model = Note
+    resource_isolation = True
+    upsert_conflict_columns = ["code"]
+
+
+@pytest.fixture
+def client(engine):
+    return testing.TestClient(make_api([("/notes", NoteResource())]))
+
+
+def stored(code):
+    return Note.perform_show_by([("code", code)], columns=["code", "text", "created_by", "updated_by"])
+
+
+def test_upsert_does_not_overwrite_row_of_other_user(client):
+    result = client.simulate_put("/notes", json={"code": "a", "text": "mine"}, headers=user_headers(1))
+    assert result.status_code == 200
+    result = client.simulate_put("/notes", json={"code": "a", "text": "stolen"}, headers=user_headers(2))
+    assert result.status_code == 409
+    assert stored("a") == {"code": "a", "text": "mine", "created_by": 1, "updated_by": 1}
+    result = client.simulate_put("/notes", json={"code": "a", "text": "edited"}, headers=user_headers(1))
+    assert result.status_code == 200
+    assert stored("a")["text"] == "edited"
+
+
+def test_upsert_by_admin_updates_any_row(client):
+    client.simulate_put("/notes", json={"code": "a", "text": "mine"}, headers=user_headers(1))
+    result = client.simulate_put("/notes", json={"code": "a", "text": "admin"}, headers=user_headers("admin"))
+    assert result.status_code == 200
+    assert stored("a") == {"code": "a", "text": "admin", "created_by": 1, "updated_by": 0}
+
+
+def test_upsert_fills_creator_and_ignores_forged_one(client):
+    result = client.simulate_put("/notes", json={"code": "a", "created_by": 1}, headers=user_headers(2))
+    assert result.status_code == 200
+    assert result.json["created_by"] == 2
+    client.simulate_put("/notes", json={"code": "a", "text": "x", "created_by": 1}, headers=user_headers(2))
+    assert stored("a") == {"code": "a", "text": "x", "created_by": 2, "updated_by": 2}
+
+
+def test_bulk_upsert_reports_rows_of_other_user(client):
+    client.simulate_put("/notes", json={"code": "a", "text": "mine"}, headers=user_headers(1))
+    result = client.simulate_put("/notes", json=[
+        {"code": "a", "text": "stolen"}, {"code": "b", "text": "new", "created_by": 1}
+    ], headers=user_headers(2))
+    assert result.status_code == 207
+    assert [row["status"] for row in result.json["data"]] == ["failed", "upserted"]
+    assert stored("a")["text"] == "mine"
+    assert stored("b") == {"code": "b", "text": "new", "created_by": 2, "updated_by": 2}
+
+
+def test_model_upsert_guards_update_by_filters(engine):
+    Note.perform_upsert({"code": "a", "text": "mine"}, conflict_columns=["code"], create_data={"created_by": 1})
+    with pytest.raises(ValueError):
+        Note.perform_upsert(
+            {"code": "a", "text": "stolen"}, conflict_columns=["code"], filters=[("created_by", 2)],
+            create_data={"created_by": 2}
+        )
+    assert stored("a")["text"] == "mine"
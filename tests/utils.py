@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# __author__ = "wynterwang"
+# __date__ = "2026/10/18"
+from __future__ import absolute_import
+
+import json
+
+import falcon
+from falcon.media import JSONHandler
+
+from restful_falcon.core.auth.base import Authentication
+from restful_falcon.core.auth.base import User
+from restful_falcon.core.db.engine import Session
+from restful_falcon.core.middleware.default import AuthenticationMiddleware
+from restful_falcon.core.middleware.default import PermissionMiddleware
+from restful_falcon.core.middleware.default import SessionMiddleware
+from restful_falcon.core.request import Request
+from restful_falcon.core.response import Response
+from restful_falcon.util.json import dumps
+from restful_falcon.util.json import loads
+
+__all__ = ["TestUser", "HeaderAuthentication", "make_api", "seed", "user_headers", "AsgiClient", "USER_HEADER"]
+
+USER_HEADER = "X-User"
+
+
+class TestUser(User):
+    def __init__(self, user_id, admin=False):
+        self.id = user_id
+        self.admin = admin
+
+    @property
+    def user_id(self):
+        return self.id
+
+    @property
+    def is_admin(self):
+        return self.admin
+
+
+class HeaderAuthentication(Authentication):
+    """
+    Authenticate user by id in `X-User` header, `admin` is the admin
+    """
+    blocking = False
+
+    def authenticate(self, req):
+        user = req.get_header(USER_HEADER)
+        if user == "admin":
+            return TestUser(0, admin=True)
+        return TestUser(int(user)) if user else None
+
+
+def user_headers(user):
+    return {USER_HEADER: str(user)}
+
+
+def make_api(routes, middleware=None):
+    """
+    Make falcon API of routes
+
+    :param routes: list of uri template, resource and optional suffix
+    :type routes: list
+    :param middleware: middleware list, session, authentication and permission middlewares by default
+    :type middleware: list
+    :rtype: falcon.API
+    """
+    if middleware is None:
+        middleware = [SessionMiddleware(), AuthenticationMiddleware(), PermissionMiddleware()]
+    api = falcon.API(request_type=Request, response_type=Response, middleware=middleware)
+    handlers = {"application/json": JSONHandler(dumps=dumps, loads=loads)}
+    api.req_options.media_handlers.update(handlers)
+    api.resp_options.media_handlers.update(handlers)
+    for _route in routes:
+        api.add_route(_route[0], _route[1], suffix=_route[2] if len(_route) > 2 else None)
+    return api
+
+
+def seed(model, rows):
+    session = Session()
+    try:
+        for row in rows:
+            # noinspection PyArgumentList
+            session.add(model(**row))
+        session.commit()
+    finally:
+        session.close()
+
+
+class AsgiClient(object):
+    """
+    Minimal ASGI client calling an application in the running event loop,
+    headers of the last response are kept in `headers`
+    """
+    def __init__(self, app):
+        self.app = app
+        self.headers = {}
+
+    async def request(self, method, path, query_string="", body=None, headers=None):
+        scope = {
+            "type": "http", "method": method, "path": path, "query_string": query_string.encode("latin-1"),
+            "headers": [(b"content-type", b"application/json")] + [
+                (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (headers or {}).items()
+            ],
+            "client": ("127.0.0.1", 0)
+        }
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        received = []
+
+        async def receive():
+            if received:
+                return {"type": "http.disconnect"}
+            received.append(True)
+            return {"type": "http.request", "body": payload}
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        await self.app(scope, receive, send)
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1") for name, value in messages[0].get("headers", [])
+        }
+        content = b"".join(message.get("body", b"") for message in messages[1:])
+        return messages[0]["status"], json.loads(content.decode("utf-8")) if content else None